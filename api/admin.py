@@ -1,31 +1,22 @@
 # In api/admin.py
 
 from django.contrib import admin
-from .models import Player, Match, BattingPerformance, BowlingPerformance, PlayerEditRequest
+from .approvals import approve_edit_requests
+from .caching import bump_data_version
+from .career import refresh_career_stats
+from .models import Player, Match, BattingPerformance, BowlingPerformance, PlayerEditRequest, Notification
 
 # 🚨 New custom admin action for edit requests
 @admin.action(description='Approve selected player edit requests')
 def approve_requests(modeladmin, request, queryset):
-    for edit_request in queryset:
-        if edit_request.status == 'pending':
-            try:
-                player = edit_request.player
-                # Update the player model with the proposed changes
-                for field, value in edit_request.proposed_changes.items():
-                    setattr(player, field, value)
-                player.save()
-                
-                # Mark the request as approved
-                edit_request.status = 'approved'
-                edit_request.save()
-            except Exception as e:
-                modeladmin.message_user(
-                    request,
-                    f"Failed to approve request for {player.name}: {e}",
-                    level='error'
-                )
-    
-    modeladmin.message_user(request, f"{queryset.count()} requests approved successfully.")
+    # One transaction for the whole selection, see api/approvals.py
+    results = approve_edit_requests(list(queryset.values_list('pk', flat=True)))
+    approved = [result for result in results if result['status'] == 'approved']
+    for result in results:
+        if result['status'] == 'rejected':
+            errors = '; '.join(f"{field}: {' '.join(messages)}" for field, messages in result['errors'].items())
+            modeladmin.message_user(request, f"Rejected request {result['id']}: {errors}", level='error')
+    modeladmin.message_user(request, f"{len(approved)} requests approved successfully.")
 
 
 # 🚨 New admin class for the PlayerEditRequest model
@@ -35,9 +26,33 @@ class PlayerEditRequestAdmin(admin.ModelAdmin):
     actions = [approve_requests]
 
 
+class PlayerAdmin(admin.ModelAdmin):
+    # Same refreshes as the players API: career rows carry the name, and cached responses the rest
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        refresh_career_stats([obj.pk])
+        bump_data_version()
+
+    # A deleted player's career row goes with it (CASCADE); only the cache needs invalidating
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_data_version()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_data_version()
+
+
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'recipient', 'status', 'attempts', 'next_attempt_at', 'sent_on')
+    list_filter = ('status', 'kind')
+    readonly_fields = ('created_on', 'sent_on', 'last_error')
+
+
 # Register your models here.
-admin.site.register(Player)
+admin.site.register(Player, PlayerAdmin)
 admin.site.register(Match)
 admin.site.register(BattingPerformance)
 admin.site.register(BowlingPerformance)
-admin.site.register(PlayerEditRequest, PlayerEditRequestAdmin) # 👈 Register the new model and admin class
\ No newline at end of file
+admin.site.register(PlayerEditRequest, PlayerEditRequestAdmin) # 👈 Register the new model and admin class
+admin.site.register(Notification, NotificationAdmin)
\ No newline at end of file
@@ -0,0 +1,134 @@
+# In api/approvals.py
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from .caching import bump_data_version
+from .career import refresh_career_stats
+from .models import Player, PlayerEditRequest
+
+# Player fields an edit request may change
+EDITABLE_FIELDS = {
+    field.name: field
+    for field in Player._meta.concrete_fields
+    # Files (the photo) are uploaded, not proposed as text
+    if field.editable and not field.primary_key and not field.is_relation
+    and not isinstance(field, models.FileField)
+}
+
+
+def approve_edit_requests(request_ids):
+    """
+    Approves the given PlayerEditRequests in one transaction and returns one
+    result per id, in the order given:
+
+        {'id': 4, 'player': 7, 'status': 'approved'}
+        {'id': 5, 'player': 7, 'status': 'rejected', 'errors': {'name': ['This field cannot be blank.']}}
+        {'id': 6, 'player': 7, 'status': 'skipped', 'reason': 'Request is already approved.'}
+        {'id': 9, 'status': 'not_found'}
+
+    Requests and their players are locked with SELECT ... FOR UPDATE. Pending
+    requests for the same player are applied oldest first, so a later request
+    wins a field both change. A request with unknown or invalid fields, or one
+    that would duplicate another player's unique value, is rejected as a whole
+    and the others still go through. Players and requests are then written
+    with one bulk_update each.
+    """
+    request_ids = list(dict.fromkeys(request_ids))
+    with transaction.atomic():
+        edit_requests = PlayerEditRequest.objects.select_for_update().in_bulk(request_ids)
+        pending = sorted(
+            (edit_request for edit_request in edit_requests.values() if edit_request.status == 'pending'),
+            key=lambda edit_request: (edit_request.requested_on, edit_request.pk)
+        )
+        players = Player.objects.select_for_update().in_bulk({edit_request.player_id for edit_request in pending})
+        owners = _unique_value_owners(pending)
+
+        results = {}
+        changed_fields = set()
+        changed_players = {}
+        for edit_request in pending:
+            player = players[edit_request.player_id]
+            changes, errors = _validate(edit_request.proposed_changes, player, owners)
+            if errors:
+                edit_request.status = 'rejected'
+                results[edit_request.pk] = {
+                    'id': edit_request.pk, 'player': player.pk, 'status': 'rejected', 'errors': errors
+                }
+                continue
+            for name, value in changes.items():
+                field = EDITABLE_FIELDS[name]
+                if field.unique:
+                    owners[name].pop(getattr(player, name), None)
+                    if value is not None:
+                        owners[name][value] = player.pk
+                setattr(player, name, value)
+            changed_fields.update(changes)
+            changed_players[player.pk] = player
+            edit_request.status = 'approved'
+            results[edit_request.pk] = {'id': edit_request.pk, 'player': player.pk, 'status': 'approved'}
+
+        if changed_players and changed_fields:
+            Player.objects.bulk_update(list(changed_players.values()), sorted(changed_fields))
+        if pending:
+            PlayerEditRequest.objects.bulk_update(pending, ['status'])
+        if changed_players:
+            # Career leaderboards show the player's name
+            refresh_career_stats(list(changed_players))
+            bump_data_version()
+
+    for request_id in request_ids:
+        if request_id in results:
+            continue
+        edit_request = edit_requests.get(request_id)
+        if edit_request is None:
+            results[request_id] = {'id': request_id, 'status': 'not_found'}
+        else:
+            results[request_id] = {
+                'id': request_id, 'player': edit_request.player_id, 'status': 'skipped',
+                'reason': f'Request is already {edit_request.status}.'
+            }
+    return [results[request_id] for request_id in request_ids]
+
+def _unique_value_owners(edit_requests):
+    """{field name: {value: player id}} for every unique value the requests propose."""
+    proposed = {name: set() for name, field in EDITABLE_FIELDS.items() if field.unique}
+    for edit_request in edit_requests:
+        changes = edit_request.proposed_changes if isinstance(edit_request.proposed_changes, dict) else {}
+        for name in proposed:
+            value = changes.get(name)
+            # Lists and objects are left to _validate, which rejects just that request
+            if isinstance(value, (str, int, float)) and value != '':
+                proposed[name].add(value)
+    return {
+        name: dict(Player.objects.filter(**{f'{name}__in': values}).values_list(name, 'pk')) if values else {}
+        for name, values in proposed.items()
+    }
+
+def _validate(proposed_changes, player, owners):
+    """Returns (cleaned changes, errors) for one request against the Player model."""
+    if not isinstance(proposed_changes, dict):
+        return {}, {'non_field_errors': ['Proposed changes must be an object of field: value.']}
+
+    changes, errors = {}, {}
+    for name, value in proposed_changes.items():
+        field = EDITABLE_FIELDS.get(name)
+        if field is None:
+            errors[name] = ['Unknown or read-only field.']
+            continue
+        if isinstance(value, (list, dict)):
+            # A JSONField holds anything; CharField.clean would store the list's repr
+            errors[name] = ['Expected a single value, not a list or object.']
+            continue
+        if value == '' and field.null and field.blank:
+            # Blank optional fields are stored as NULL, as the model form would
+            value = None
+        try:
+            value = field.clean(value, player)
+        except ValidationError as e:
+            errors[name] = list(e.messages)
+            continue
+        if field.unique and value is not None and owners[name].get(value, player.pk) != player.pk:
+            errors[name] = [f'Another player already has this {field.verbose_name}.']
+            continue
+        changes[name] = value
+    return changes, errors
@@ -0,0 +1,170 @@
+# In api/async_views.py
+
+"""
+Async versions of the hot read endpoints, for serving under ASGI
+(cricket_stats/asgi.py) where a request waiting on the database does not
+hold a worker:
+
+    /api/async/players/                 players with their stats
+    /api/async/players/<id>/            one player with their stats
+    /api/async/stats/                   tournament stats, same filters as /api/stats/
+    /api/async/career-stats/rank/       career leaderboard, same as /api/career-stats/rank/
+
+Rows are read with the async ORM (`aget`, `aiterator`, `acount`) and shaped
+with the api.fastpath row mappers, so each item has the same JSON shape as
+the sync API. Lists are keyset-paginated on the primary key with an opaque
+?cursor= and ?page_size=.
+"""
+
+import base64
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.urls import path
+from .career import RANKING_METRICS, decode_rank_cursor, encode_rank_cursor, ranking_queryset, ranks_above
+from .fastpath import STAT_ROW_MAPPER, RowMapper, render_json, stream_json_list
+from .filters import PlayerTournamentStatFilter
+from .models import Player, PlayerTournamentStat
+from .pagination import StatsCursorPagination
+from .photos import photo_sources
+from .serializers import PlayerSerializer, RankedCareerStatsSerializer
+
+PLAYER_ROW_MAPPER = RowMapper([
+    (name, name) for name in PlayerSerializer.Meta.fields if name not in ('photo', 'stats')
+])
+# Read along with the mapped columns; become the 'photo' key
+PLAYER_COLUMNS = PLAYER_ROW_MAPPER.columns + ['photo', 'photo_thumbnails']
+RANKED_CAREER_ROW_MAPPER = RowMapper([
+    (name, 'player_name' if name == 'name' else name) for name in RankedCareerStatsSerializer.Meta.fields
+])
+
+DEFAULT_RANK_LIMIT = 10
+MAX_RANK_LIMIT = 100
+
+
+class BadRequest(Exception):
+    pass
+
+
+def json_response(content, status=200):
+    return HttpResponse(content, content_type='application/json', status=status)
+
+def bad_request(detail):
+    return JsonResponse({'detail': detail}, status=400)
+
+def page_params(request):
+    """(page size, id to start after) from ?page_size= and ?cursor=."""
+    try:
+        page_size = int(request.GET.get('page_size', StatsCursorPagination.page_size))
+        cursor = request.GET.get('cursor')
+        after = int(base64.urlsafe_b64decode(cursor.encode())) if cursor else None
+    except ValueError:
+        raise BadRequest('Invalid page_size or cursor.')
+    if page_size < 1:
+        raise BadRequest('Invalid page_size or cursor.')
+    return min(page_size, StatsCursorPagination.max_page_size), after
+
+def next_link(request, last_id):
+    params = request.GET.copy()
+    params['cursor'] = base64.urlsafe_b64encode(str(last_id).encode()).decode()
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+async def keyset_page(request, queryset, columns):
+    """One page of `queryset.values(*columns)` after the cursor, plus the next link."""
+    page_size, after = page_params(request)
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    rows = [row async for row in queryset.order_by('pk').values('pk', *columns)[:page_size + 1]]
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_url = next_link(request, rows[-1]['pk'])
+    return rows, next_url
+
+async def stats_by_player(player_ids):
+    """{player id: [stat rows]} in the same order and shape as the sync PlayerSerializer."""
+    stats = {player_id: [] for player_id in player_ids}
+    rows = (
+        PlayerTournamentStat.objects.filter(player__in=player_ids).order_by('pk')
+        .values('player_id', *STAT_ROW_MAPPER.columns)
+    )
+    async for row in rows.aiterator(chunk_size=2000):
+        stats[row['player_id']].append(STAT_ROW_MAPPER(row))
+    return stats
+
+def player_data(request, row, stats):
+    data = PLAYER_ROW_MAPPER(row)
+    data['photo'] = photo_sources(row['photo'], row['photo_thumbnails'], request.build_absolute_uri)
+    data['stats'] = stats
+    return data
+
+
+async def player_list(request):
+    try:
+        rows, next_url = await keyset_page(request, Player.objects.all(), PLAYER_COLUMNS)
+    except BadRequest as e:
+        return bad_request(str(e))
+    stats = await stats_by_player([row['pk'] for row in rows])
+    results = [player_data(request, row, stats[row['pk']]) for row in rows]
+    return json_response(render_json({'next': next_url, 'previous': None, 'results': results}))
+
+async def player_detail(request, pk):
+    try:
+        row = await Player.objects.values(*PLAYER_COLUMNS).aget(pk=pk)
+    except Player.DoesNotExist:
+        return JsonResponse({'detail': 'No Player matches the given query.'}, status=404)
+    stats = await stats_by_player([pk])
+    return json_response(render_json(player_data(request, row, stats[pk])))
+
+async def stat_list(request):
+    # Model choice filters validate against the database, which is sync-only
+    filterset = await sync_to_async(
+        lambda: PlayerTournamentStatFilter(request.GET, queryset=PlayerTournamentStat.objects.all())
+    )()
+    if not await sync_to_async(filterset.is_valid)():
+        return JsonResponse(filterset.errors, status=400)
+    try:
+        rows, next_url = await keyset_page(request, filterset.qs, STAT_ROW_MAPPER.columns)
+    except BadRequest as e:
+        return bad_request(str(e))
+    envelope = {'next': next_url, 'previous': None}
+    return json_response(b''.join(stream_json_list(rows, STAT_ROW_MAPPER, envelope)))
+
+async def career_rank(request):
+    metric = request.GET.get('by', 'total_runs')
+    if metric not in RANKING_METRICS:
+        return JsonResponse(
+            {'by': [f"Unknown metric. Choose one of: {', '.join(RANKING_METRICS)}."]}, status=400
+        )
+    try:
+        limit = min(int(request.GET.get('limit', DEFAULT_RANK_LIMIT)), MAX_RANK_LIMIT)
+        after = decode_rank_cursor(request.GET.get('cursor'))
+    except (TypeError, ValueError):
+        return bad_request('Invalid limit or cursor.')
+    if limit < 1:
+        return bad_request('Invalid limit or cursor.')
+
+    queryset = ranking_queryset(metric, after).values(*RANKED_CAREER_ROW_MAPPER.columns)
+    page = [row async for row in queryset[:limit + 1]]
+    if after is not None and page:
+        # Same offset as the sync ranking: distinct values ranked above the cursor
+        base_rank = await ranks_above(metric, page[0][metric]).acount()
+        for row in page:
+            row['rank'] += base_rank
+
+    next_url = None
+    if len(page) > limit:
+        page = page[:limit]
+        cursor = encode_rank_cursor(page[-1][metric], page[-1]['player_id'])
+        next_url = request.build_absolute_uri(f"{request.path}?by={metric}&limit={limit}&cursor={cursor}")
+
+    envelope = {'by': metric, 'next': next_url}
+    return json_response(b''.join(stream_json_list(page, RANKED_CAREER_ROW_MAPPER, envelope)))
+
+
+urlpatterns = [
+    path('players/', player_list, name='async-player-list'),
+    path('players/<int:pk>/', player_detail, name='async-player-detail'),
+    path('stats/', stat_list, name='async-stat-list'),
+    path('career-stats/rank/', career_rank, name='async-career-stats-rank'),
+]
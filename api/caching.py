@@ -0,0 +1,101 @@
+# In api/caching.py
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+from .models import DataVersion
+from .instrumentation import timed_render
+
+DATA_VERSION_PK = 1
+
+
+def current_data_version():
+    """Returns (version, updated_on); (0, None) before the first change."""
+    row = DataVersion.objects.filter(pk=DATA_VERSION_PK).values_list('version', 'updated_on').first()
+    return row or (0, None)
+
+def bump_data_version():
+    """
+    Invalidates every cached API response. Call it after any write to players,
+    stats or career tables; inside a transaction the bump commits with the data.
+    """
+    now = timezone.now()
+    updated = DataVersion.objects.filter(pk=DATA_VERSION_PK).update(version=F('version') + 1, updated_on=now)
+    if not updated:
+        DataVersion.objects.get_or_create(pk=DATA_VERSION_PK, defaults={'version': 1, 'updated_on': now})
+
+
+class CachedReadMixin:
+    """
+    Caches the rendered JSON of `list` and `retrieve` keyed on the data version,
+    and answers conditional GETs with 304 Not Modified.
+
+    Entries never expire by time: a new data version makes every old key
+    unreachable. Responses carry a strong ETag (hash of the body) and a
+    Last-Modified of the last data change. Only the JSON renderer is cached;
+    the browsable API always renders fresh. Set `cached_actions` to narrow
+    which actions are cached.
+    """
+    cached_actions = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.cached_actions or request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        version, updated_on = current_data_version()
+        key = f"api-response:{version}:{request.accepted_media_type}:{request.get_full_path()}"
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            if response.streaming:
+                content = b''.join(response.streaming_content)
+            else:
+                if hasattr(response, 'render'):
+                    # A DRF Response; plain HttpResponses (api.fastpath) arrive rendered
+                    response.accepted_renderer = request.accepted_renderer
+                    response.accepted_media_type = request.accepted_media_type
+                    response.renderer_context = self.get_renderer_context()
+                    timed_render(request, response)
+                content = response.content
+            entry = {
+                'content': content,
+                'content_type': response['Content-Type'],
+                'etag': f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"',
+            }
+            cache.set(key, entry, timeout=None)
+
+        last_modified = int(updated_on.timestamp()) if updated_on else None
+        if self.not_modified(request, entry['etag'], last_modified):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = entry['etag']
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Clients may keep the body but must revalidate it, which is a cheap 304
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    @staticmethod
+    def not_modified(request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+            # Weak comparison: W/"x" matches "x"
+            etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+            return '*' in etags or etag in etags
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+        return bool(last_modified and if_modified_since and if_modified_since >= last_modified)
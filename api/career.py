@@ -0,0 +1,140 @@
+# In api/career.py
+
+import base64
+import json
+
+from django.db.models import F, Max, Q, Sum, Window
+from django.db.models.functions import Coalesce, DenseRank
+from .metrics import as_array, balls_to_overs, compute_rates
+from .models import Player, PlayerCareerStat
+from .parsing import python_values
+
+# How each PlayerCareerStat column is aggregated from a player's tournament stats
+CAREER_AGGREGATES = {
+    'total_matches': Sum('playertournamentstat__matches_played'),
+    'total_runs': Sum('playertournamentstat__runs_scored'),
+    'total_wickets': Sum('playertournamentstat__wickets_taken'),
+    'career_highest_score': Max('playertournamentstat__highest_score'),
+    'total_not_outs': Sum('playertournamentstat__not_outs'),
+    'total_fours': Sum('playertournamentstat__fours'),
+    'total_sixes': Sum('playertournamentstat__sixes'),
+    'total_maidens': Sum('playertournamentstat__maidens'),
+    'total_balls_faced': Sum('playertournamentstat__balls_faced'),
+    'total_runs_conceded': Sum('playertournamentstat__runs_conceded'),
+    # Sheets without an Inns column count one innings per match
+    'total_innings': Sum(Coalesce('playertournamentstat__innings', 'playertournamentstat__matches_played')),
+    'total_balls_bowled': Sum('playertournamentstat__balls_bowled'),
+}
+
+# Columns derived from the totals above, see `derived_metrics`
+DERIVED_FIELDS = [
+    'batting_average', 'batting_strike_rate', 'total_overs',
+    'economy_rate', 'bowling_average', 'bowling_strike_rate',
+]
+
+# Metrics the ranking endpoint can sort by, and which direction is "better".
+# Each one has a matching index on PlayerCareerStat.
+RANKING_METRICS = {
+    'total_runs': 'desc',
+    'total_matches': 'desc',
+    'total_wickets': 'desc',
+    'career_highest_score': 'desc',
+    'total_not_outs': 'desc',
+    'total_fours': 'desc',
+    'total_sixes': 'desc',
+    'total_maidens': 'desc',
+    'batting_average': 'desc',
+    'batting_strike_rate': 'desc',
+    'bowling_average': 'asc',
+    'economy_rate': 'asc',
+    'bowling_strike_rate': 'asc',
+}
+
+# Keeps the IN (...) lists well below SQLite's variable limit
+REFRESH_BATCH_SIZE = 500
+
+
+def refresh_career_stats(player_ids=None):
+    """
+    Recomputes the PlayerCareerStat rows of `player_ids`, or of every player
+    when `player_ids` is None. Returns the number of rows written.
+
+    Call it after anything that changes a player's name or tournament stats.
+    """
+    if player_ids is None:
+        return _refresh(Player.objects.all())
+
+    player_ids = sorted(set(player_ids))
+    written = 0
+    for start in range(0, len(player_ids), REFRESH_BATCH_SIZE):
+        written += _refresh(Player.objects.filter(pk__in=player_ids[start:start + REFRESH_BATCH_SIZE]))
+    return written
+
+def derived_metrics(rows):
+    """
+    {DERIVED_FIELDS name: list of values} for `rows` of CAREER_AGGREGATES
+    totals, computed from the summed counts with api.metrics.compute_rates;
+    averaging per-tournament rates would be wrong.
+    """
+    totals = {field: as_array([row[field] for row in rows]) for field in CAREER_AGGREGATES}
+    balls_bowled = totals['total_balls_bowled']
+    rates = compute_rates(
+        totals['total_runs'], totals['total_innings'], totals['total_not_outs'], totals['total_balls_faced'],
+        totals['total_runs_conceded'], totals['total_wickets'], balls_bowled,
+    )
+    derived = {name: python_values(values, integer=False) for name, values in rates.items()}
+    derived['total_overs'] = python_values(balls_to_overs(balls_bowled), integer=False)
+    return derived
+
+def ranking_queryset(metric, after=None):
+    """
+    Career rows ranked by `metric` (a RANKING_METRICS key), best first, each
+    annotated with `rank`: the dense rank among the rows after the keyset
+    cursor `after` = (metric value, player id). Add `ranks_above` to it for
+    the overall rank. Players without a value for the metric are left out.
+    """
+    descending = RANKING_METRICS[metric] == 'desc'
+    # NULLs lowest, as the NullsLowIndex of each metric is built
+    order = F(metric).desc(nulls_last=True) if descending else F(metric).asc(nulls_first=True)
+    queryset = PlayerCareerStat.objects.filter(**{f'{metric}__isnull': False})
+    if after is not None:
+        value, player_id = after
+        worse = f'{metric}__lt' if descending else f'{metric}__gt'
+        queryset = queryset.filter(Q(**{worse: value}) | Q(**{metric: value, 'player__gt': player_id}))
+    return queryset.annotate(rank=Window(DenseRank(), order_by=[order])).order_by(order, 'player')
+
+def ranks_above(metric, value):
+    """Queryset whose count is the number of distinct `metric` values better than `value`."""
+    better = f'{metric}__gt' if RANKING_METRICS[metric] == 'desc' else f'{metric}__lt'
+    return PlayerCareerStat.objects.filter(**{better: value}).values(metric).distinct()
+
+def encode_rank_cursor(value, player_id):
+    return base64.urlsafe_b64encode(json.dumps([value, player_id]).encode()).decode()
+
+def decode_rank_cursor(cursor):
+    """(value, player id) from a cursor, None for no cursor; ValueError when malformed."""
+    if not cursor:
+        return None
+    value, player_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if not isinstance(value, (int, float)) or not isinstance(player_id, int):
+        raise ValueError(cursor)
+    return value, player_id
+
+def _refresh(players):
+    rows = list(players.annotate(**CAREER_AGGREGATES).values('id', 'name', *CAREER_AGGREGATES))
+    derived = derived_metrics(rows)
+    career_stats = []
+    for index, row in enumerate(rows):
+        career_stats.append(PlayerCareerStat(
+            player_id=row['id'], player_name=row['name'],
+            **{field: row[field] for field in CAREER_AGGREGATES},
+            **{field: derived[field][index] for field in DERIVED_FIELDS},
+        ))
+    PlayerCareerStat.objects.bulk_create(
+        career_stats,
+        batch_size=REFRESH_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['player'],
+        update_fields=['player_name', *CAREER_AGGREGATES, *DERIVED_FIELDS],
+    )
+    return len(career_stats)
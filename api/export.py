@@ -0,0 +1,211 @@
+# In api/export.py
+
+"""
+Columnar snapshots of the tournament stats for analytics.
+
+Every PlayerTournamentStat is exported with its player and tournament as one
+typed row (STAT_EXPORT_COLUMNS), read from the database in chunks with
+`.iterator()` (a server-side cursor on PostgreSQL) and converted to Arrow
+record batches, so memory stays bounded by the batch size:
+
+    write_parquet_dataset('exports/stats')      # exports/stats/tournament_id=4/part-0.parquet, ...
+    read_parquet_dataset('exports/stats', filters=[('tournament_id', '=', 4)])
+
+The same batches are streamed as Arrow IPC by GET /api/stats/arrow/.
+Needs `pip install pyarrow`; without it `arrow_available()` is False and the
+endpoint answers 501.
+
+`stream_csv` writes the same stat columns, or the career table, as CSV for
+GET /api/stats/csv/ and /api/career-stats/csv/ and needs nothing extra.
+"""
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from .models import PlayerCareerStat, PlayerTournamentStat
+from .parsing import NOT_OUT_FIELD, STAT_FLOAT_FIELDS, STAT_INT_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # optional; only the export features need it
+    pa = ds = pq = None
+
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+# Rows fetched from the database and converted per record batch
+EXPORT_BATCH_SIZE = 10_000
+PARTITION_COLUMN = 'tournament_id'
+
+# (column, queryset lookup, Arrow type alias); every column is nullable
+STAT_EXPORT_COLUMNS = [
+    ('id', 'id', 'int64'),
+    ('player_id', 'player_id', 'int64'),
+    ('player_name', 'player__name', 'string'),
+    ('tournament_id', 'tournament_id', 'int64'),
+    ('tournament_name', 'tournament__name', 'string'),
+    ('tournament_year', 'tournament__year', 'int32'),
+    ('team_name', 'team_name', 'string'),
+] + [(name, name, 'int32') for name in STAT_INT_FIELDS] + [
+    (NOT_OUT_FIELD, NOT_OUT_FIELD, 'bool'),
+] + [(name, name, 'float64') for name in STAT_FLOAT_FIELDS]
+
+# (CSV header, queryset lookup)
+STAT_CSV_COLUMNS = [(name, lookup) for name, lookup, _ in STAT_EXPORT_COLUMNS]
+CAREER_CSV_COLUMNS = [('player_id', 'player_id'), ('name', 'player_name')] + [
+    (field.name, field.name) for field in PlayerCareerStat._meta.concrete_fields
+    if field.name not in ('player', 'player_name')
+]
+# Rows fetched per database round trip and written per streamed CSV chunk
+CSV_ROWS_PER_CHUNK = 2000
+
+
+def arrow_available():
+    return pa is not None
+
+def arrow_schema(exclude=()):
+    return pa.schema([
+        (name, pa.type_for_alias(type_name)) for name, _, type_name in STAT_EXPORT_COLUMNS if name not in exclude
+    ])
+
+def record_batches(queryset=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yields `queryset` (default: every stat, by id) as Arrow record batches of
+    at most `batch_size` rows with the arrow_schema() columns.
+    """
+    if queryset is None:
+        queryset = PlayerTournamentStat.objects.order_by('id')
+    schema = arrow_schema()
+    lookups = [lookup for _, lookup, _ in STAT_EXPORT_COLUMNS]
+    rows = []
+    for row in queryset.values_list(*lookups).iterator(chunk_size=batch_size):
+        rows.append(row)
+        if len(rows) == batch_size:
+            yield _to_batch(rows, schema)
+            rows = []
+    if rows:
+        yield _to_batch(rows, schema)
+
+def _to_batch(rows, schema):
+    columns = zip(*rows)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+    )
+
+
+def write_parquet_dataset(directory, batch_size=EXPORT_BATCH_SIZE, compression='zstd'):
+    """
+    Writes every stat as a Hive-partitioned Parquet dataset, one file per
+    tournament: `directory/tournament_id=<id>/part-0.parquet`. The partition
+    column lives in the path, not in the files.
+
+    The dataset is built next to `directory` and swapped in when complete, so
+    readers never see a half-written export. Returns the number of rows.
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{directory.name}-", dir=directory.parent))
+    schema = arrow_schema(exclude=[PARTITION_COLUMN])
+    queryset = PlayerTournamentStat.objects.order_by(PARTITION_COLUMN, 'id')
+    partition = writer = None
+    rows = 0
+    try:
+        for batch in record_batches(queryset, batch_size):
+            table = pa.Table.from_batches([batch])
+            tournament_ids = table.column(PARTITION_COLUMN).to_pylist()
+            # Rows come sorted by tournament, so a batch is a few contiguous runs
+            start = 0
+            while start < len(tournament_ids):
+                tournament_id = tournament_ids[start]
+                end = start
+                while end < len(tournament_ids) and tournament_ids[end] == tournament_id:
+                    end += 1
+                if tournament_id != partition:
+                    if writer is not None:
+                        writer.close()
+                    partition = tournament_id
+                    path = staging / f"{PARTITION_COLUMN}={tournament_id}" / 'part-0.parquet'
+                    path.parent.mkdir()
+                    writer = pq.ParquetWriter(path, schema, compression=compression)
+                writer.write_table(table.slice(start, end - start).drop_columns([PARTITION_COLUMN]))
+                start = end
+            rows += len(batch)
+        if writer is not None:
+            writer.close()
+            writer = None
+        _replace_directory(staging, directory)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return rows
+
+def _replace_directory(source, target):
+    previous = None
+    if target.exists():
+        previous = target.with_name(f".{target.name}-previous-{os.getpid()}")
+        os.replace(target, previous)
+    os.replace(source, target)
+    if previous is not None:
+        shutil.rmtree(previous)
+
+def read_parquet_dataset(directory, columns=None, filters=None):
+    """
+    Reads a dataset written by write_parquet_dataset as a pyarrow.Table,
+    memory-mapping the files. `filters` on tournament_id prune whole files,
+    e.g. [('tournament_id', 'in', [3, 4])].
+    """
+    partitioning = ds.partitioning(
+        pa.schema([(PARTITION_COLUMN, pa.int64())]), flavor='hive'
+    )
+    return pq.read_table(
+        directory, columns=columns, filters=filters, partitioning=partitioning, memory_map=True
+    )
+
+
+def stream_arrow_ipc(queryset=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yields the Arrow IPC stream of `queryset` (see record_batches) a batch at a time."""
+    buffer = io.BytesIO()
+
+    def drain():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    with pa.ipc.new_stream(pa.PythonFile(buffer, mode='w'), arrow_schema()) as writer:
+        yield drain()
+        for batch in record_batches(queryset, batch_size):
+            writer.write_batch(batch)
+            yield drain()
+    # Closing the writer adds the end-of-stream marker
+    yield drain()
+
+
+def stream_csv(queryset, columns, chunk_size=CSV_ROWS_PER_CHUNK):
+    """
+    Yields `queryset` as CSV text, `columns` being (header, lookup) pairs: the
+    header line first, then `chunk_size` rows at a time as they are fetched.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow([header for header, _ in columns])
+    yield drain()
+    rows = queryset.values_list(*(lookup for _, lookup in columns)).iterator(chunk_size=chunk_size)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % chunk_size == 0:
+            yield drain()
+    yield drain()
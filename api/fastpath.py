@@ -0,0 +1,160 @@
+# In api/fastpath.py
+
+"""
+Serializer-free read path for the large list endpoints.
+
+Rows are fetched with `.values()` and shaped into the exact structure the
+DRF serializers produce by row mappers generated once at import time, then
+encoded in batches. The bytes are identical to
+what ModelSerializer + JSONRenderer produce for the same page; the tests in
+api.tests.FastJSONPathTests compare the two.
+"""
+
+import json
+from operator import itemgetter
+
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .serializers import BattingStatsSerializer, BowlingStatsSerializer, CareerStatsSerializer
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib C encoder is used otherwise
+    orjson = None
+
+# Rows encoded per chunk of the streamed body
+ROWS_PER_CHUNK = 200
+
+
+class RowMapper:
+    """
+    Turns a `.values()` dict into the serializer's output dict.
+
+    `shape` mirrors the serializer fields in order: each item is
+    (output key, column) or (output key, nested shape). The (key, getter)
+    pairs are built once, so mapping a row is a single dict comprehension.
+
+        mapper = RowMapper([('name', 'player__name'), ('batting', [('runs_scored', 'runs_scored')])])
+        mapper.columns      # ['player__name', 'runs_scored']
+        mapper(row)         # {'name': ..., 'batting': {'runs_scored': ...}}
+    """
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.columns = []
+        self.map_row = self._compile(shape)
+
+    def _compile(self, shape):
+        getters = []
+        for key, source in shape:
+            if isinstance(source, list):
+                getters.append((key, self._compile(source)))
+            else:
+                if source not in self.columns:
+                    self.columns.append(source)
+                getters.append((key, itemgetter(source)))
+        return lambda row: {key: get(row) for key, get in getters}
+
+    def __call__(self, row):
+        return self.map_row(row)
+
+
+# Same keys, in the same order, as PlayerTournamentStatSerializer
+STAT_ROW_MAPPER = RowMapper([
+    ('player_name', 'player__name'),
+    ('tournament_name', 'tournament__name'),
+    ('team_name', 'team_name'),
+    ('batting', [(name, name) for name in BattingStatsSerializer.Meta.fields]),
+    ('bowling', [(name, name) for name in BowlingStatsSerializer.Meta.fields]),
+])
+
+# Same keys, in the same order, as CareerStatsSerializer
+CAREER_ROW_MAPPER = RowMapper([
+    (name, 'player_name' if name == 'name' else name) for name in CareerStatsSerializer.Meta.fields
+])
+
+
+def _dumps_stdlib():
+    # Same settings as DRF's JSONRenderer with COMPACT_JSON, UNICODE_JSON and STRICT_JSON
+    encode = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode
+    return lambda value: encode(value).encode()
+
+def _dumps_orjson(value):
+    # orjson already writes compact, UTF-8, non-ASCII-escaped JSON. Its float
+    # formatting only differs from json's for |x| >= 1e16 or < 1e-4, which no
+    # cricket stat reaches.
+    return orjson.dumps(value)
+
+dumps = _dumps_orjson if orjson is not None else _dumps_stdlib()
+
+def _escape_line_separators(chunk):
+    # DRF escapes these so the output is a strict JavaScript subset
+    return chunk.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+def render_json(value):
+    """`value` encoded exactly as DRF's JSONRenderer would."""
+    return _escape_line_separators(dumps(value))
+
+def stream_json_list(rows, mapper, envelope=None):
+    """
+    Yields the JSON encoding of `[mapper(row) for row in rows]`, wrapped in
+    `envelope` ({"next": ..., "previous": ..., "results": <list>}) when given.
+    """
+    if envelope is not None:
+        prefix = dumps(envelope)[:-1]
+        yield _escape_line_separators(prefix) + b',"results":['
+    else:
+        yield b'['
+
+    batch = []
+    first = True
+    for row in rows:
+        batch.append(mapper(row))
+        if len(batch) == ROWS_PER_CHUNK:
+            body = dumps(batch)[1:-1]
+            yield _escape_line_separators(body if first else b',' + body)
+            batch, first = [], False
+    if batch:
+        body = dumps(batch)[1:-1]
+        yield _escape_line_separators(body if first else b',' + body)
+
+    yield b']}' if envelope is not None else b']'
+
+
+class FastListMixin:
+    """
+    Serves `list` through `row_mapper` instead of the serializer.
+
+    Falls back to the regular serializer path for anything the mapper does not
+    reproduce: non-JSON renderers, pretty-printing (`; indent=`) and ?fields=.
+    Unpaginated lists are streamed straight from a server-side cursor.
+    """
+    row_mapper = None
+    fast_path_enabled = True
+
+    def use_fast_path(self, request):
+        return (
+            self.fast_path_enabled
+            and request.accepted_renderer.format == 'json'
+            and request.accepted_media_type.split(';')[0].strip() == 'application/json'
+            and 'indent' not in request.accepted_media_type
+            and 'fields' not in request.query_params
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_path(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is None:
+            rows = queryset.values(*self.row_mapper.columns).iterator(chunk_size=ROWS_PER_CHUNK * 10)
+            return StreamingHttpResponse(stream_json_list(rows, self.row_mapper), content_type='application/json')
+
+        # The cursor position is read from the first ordering column, so the rows must carry it
+        ordering = self.paginator.get_ordering(request, queryset, self)
+        columns = dict.fromkeys(self.row_mapper.columns + [ordering[0].lstrip('-')])
+        page = self.paginate_queryset(queryset.values(*columns))
+        envelope = {'next': self.paginator.get_next_link(), 'previous': self.paginator.get_previous_link()}
+        # A page is at most max_page_size rows, so it is joined rather than streamed
+        content = b''.join(stream_json_list(page, self.row_mapper, envelope))
+        return HttpResponse(content, content_type='application/json')
@@ -0,0 +1,24 @@
+# In api/filters.py
+
+from django_filters import rest_framework as filters
+from .models import PlayerTournamentStat
+from .parsing import STAT_INT_FIELDS, STAT_FLOAT_FIELDS
+
+# Numeric stat columns that can be filtered by range and used for ordering
+NUMERIC_STAT_FIELDS = STAT_INT_FIELDS + STAT_FLOAT_FIELDS
+
+
+class PlayerTournamentStatFilter(filters.FilterSet):
+    """
+    Filters for /api/stats/, e.g.
+    ?tournament=4&team_name=Gajapade&runs_scored__gte=50&wickets_taken__gt=0
+    """
+
+    class Meta:
+        model = PlayerTournamentStat
+        fields = {
+            'tournament': ['exact'],
+            'player': ['exact'],
+            'team_name': ['exact', 'iexact'],
+            **{field: ['exact', 'gt', 'gte', 'lt', 'lte'] for field in NUMERIC_STAT_FIELDS},
+        }
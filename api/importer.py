@@ -0,0 +1,320 @@
+# In api/importer.py
+
+import csv
+import io
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from .caching import bump_data_version
+from .career import refresh_career_stats
+from .metrics import recompute_stat_metrics
+from .models import Player, Tournament, PlayerTournamentStat
+from .parsing import STAT_VALUE_FIELDS, record_from_row
+from .search import TrigramIndex
+from .teams import link_teams
+
+# Columns an import writes; the pairs it covers become imported rows, even if rolled up from matches before
+IMPORT_FIELDS = STAT_VALUE_FIELDS + ['row_hash', 'from_matches']
+
+
+class BulkStatsImporter:
+    """
+    Replaces every imported PlayerTournamentStat with the rows of a CSV in one
+    transaction. Rows rolled up from matches (api.matches) stay, unless the
+    CSV has a row for their pair.
+
+    Players and tournaments are loaded into in-memory maps up front, missing
+    ones are created with `bulk_create`, and stat rows are inserted in batches
+    of `batch_size`. Readers never see a half-empty stats table because the
+    delete and the inserts commit together.
+
+    `run` takes raw CSV rows; `run_chunks` takes an iterable of already parsed
+    record lists (see `api.parsing.parse_chunk`) and writes them chunk by chunk.
+
+    With a `match_threshold`, a name that is not an exact match goes to the
+    existing player whose name is at least that similar (see api.search),
+    e.g. "Rahul  Sharmaa" to "Rahul Sharma", instead of creating a new one.
+    `name_matches` records each such name -> player name.
+    """
+
+    def __init__(self, batch_size=1000, match_threshold=None):
+        self.batch_size = batch_size
+        self.match_threshold = match_threshold
+        self.name_index = None
+        self.name_matches = {}
+        self.rows_read = 0
+        self.stats_created = 0
+        self.players_created = 0
+        self.players_updated = 0
+        self.tournaments_created = 0
+        self.players = {}
+        self.tournaments = {}
+        self.seen_keys = set()
+        self.updated_player_ids = set()
+        self.created_player_ids = set()
+
+    def run(self, rows):
+        return self.run_chunks([[record_from_row(row) for row in rows]])
+
+    def run_chunks(self, chunks):
+        with transaction.atomic():
+            self.begin()
+            for records in chunks:
+                self.rows_read += len(records)
+                self.resolve_players(records)
+                self.resolve_tournaments(records)
+
+                # A (player, tournament) pair is unique; a later row replaces an earlier one
+                stats = {}
+                for record in records:
+                    player = self.players.get(record['player_name'])
+                    tournament = self.tournaments.get(record['tournament_id'])
+                    if player is None or tournament is None:
+                        continue
+                    stats[(player.pk, tournament.pk)] = PlayerTournamentStat(
+                        player=player, tournament=tournament, **record['stats']
+                    )
+                self.write_stats(stats)
+                self.seen_keys.update(stats)
+            self.finish()
+        return self
+
+    def begin(self):
+        self.load_players()
+        PlayerTournamentStat.objects.filter(from_matches=False).delete()
+
+    def load_players(self):
+        self.players = {player.name: player for player in Player.objects.all()}
+        if self.match_threshold is not None:
+            self.name_index = TrigramIndex((name, name) for name in self.players)
+
+    def write_stats(self, stats):
+        """Writes one chunk of `stats`, a (player_id, tournament_id) -> stat map."""
+        self.stats_created += len(stats.keys() - self.seen_keys)
+        # Upsert so that a pair repeated in a later chunk replaces the earlier row
+        PlayerTournamentStat.objects.bulk_create(
+            list(stats.values()),
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['player', 'tournament'],
+            update_fields=IMPORT_FIELDS,
+        )
+
+    def finish(self):
+        # Every stat row was replaced, so every rate and career total may have changed
+        recompute_stat_metrics()
+        link_teams()
+        refresh_career_stats()
+        bump_data_version()
+
+    def resolve_players(self, records):
+        """Makes sure `self.players` (name -> Player) covers every player named in `records`."""
+        missing = []
+        for record in records:
+            name = record['player_name']
+            if not name or name in self.players:
+                continue
+            match = self.name_index.best_match(name, self.match_threshold) if self.name_index is not None else None
+            if match is not None:
+                self.players[name] = self.players[match[1]]
+                self.name_matches[name] = match[1]
+                continue
+            self.players[name] = Player(name=name)
+            missing.append(self.players[name])
+            if self.name_index is not None:
+                self.name_index.add(name, name)
+        if missing:
+            Player.objects.bulk_create(missing, batch_size=self.batch_size)
+            # Not every backend returns primary keys from a bulk insert
+            if any(player.pk is None for player in missing):
+                self.players.update(
+                    (player.name, player)
+                    for player in Player.objects.filter(name__in=[p.name for p in missing])
+                )
+                self.players.update((name, self.players[target]) for name, target in self.name_matches.items())
+            self.players_created += len(missing)
+            self.created_player_ids.update(self.players[player.name].pk for player in missing)
+
+        # Fill in profile info only where the player does not have it yet
+        changed = {}
+        for record in records:
+            player = self.players.get(record['player_name'])
+            if player is None:
+                continue
+            for field in ('batting_style', 'bowling_style'):
+                if record[field] and not getattr(player, field):
+                    setattr(player, field, record[field])
+                    changed[player.pk] = player
+        if changed:
+            Player.objects.bulk_update(
+                list(changed.values()), ['batting_style', 'bowling_style'], batch_size=self.batch_size
+            )
+            self.players_updated += len(changed.keys() - self.updated_player_ids)
+            self.updated_player_ids.update(changed)
+
+    def resolve_tournaments(self, records):
+        """Makes sure `self.tournaments` (id -> Tournament) covers `records`, creating placeholders as needed."""
+        ids = {record['tournament_id'] for record in records} - {None} - self.tournaments.keys()
+        if not ids:
+            return
+        self.tournaments.update(Tournament.objects.in_bulk(ids))
+
+        missing = [
+            # Use a consistent year for now
+            Tournament(id=tournament_id, name=f"Tournament {tournament_id}", year=2024)
+            for tournament_id in sorted(ids - self.tournaments.keys())
+        ]
+        if missing:
+            Tournament.objects.bulk_create(missing, batch_size=self.batch_size)
+            self.tournaments.update((tournament.id, tournament) for tournament in missing)
+            self.tournaments_created += len(missing)
+            # Explicit ids leave the id sequence behind on Postgres
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [Tournament]):
+                    cursor.execute(sql)
+
+
+class CopyStatsImporter(BulkStatsImporter):
+    """
+    BulkStatsImporter that writes stat rows with PostgreSQL `COPY ... FROM STDIN`
+    instead of multi-row INSERTs, through psycopg 3 (`cursor.copy`) or psycopg2
+    (`cursor.copy_expert`). On other backends, or for a pair already written
+    by an earlier chunk, it falls back to the batched upsert. CopyStatsImporterTests
+    cover this path and only run against PostgreSQL.
+    """
+
+    COPY_FIELDS = ['player', 'tournament'] + IMPORT_FIELDS
+
+    def __init__(self, batch_size=1000, match_threshold=None):
+        super().__init__(batch_size=batch_size, match_threshold=match_threshold)
+        self.rows_copied = 0
+
+    @staticmethod
+    def copy_supported():
+        if connection.vendor != 'postgresql':
+            return False
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            return hasattr(raw, 'copy') or hasattr(raw, 'copy_expert')
+
+    def begin(self):
+        super().begin()
+        self.use_copy = self.copy_supported()
+        self.match_pairs = set(
+            PlayerTournamentStat.objects.filter(from_matches=True).values_list('player_id', 'tournament_id')
+        )
+
+    def write_stats(self, stats):
+        if not self.use_copy:
+            return super().write_stats(stats)
+        # begin() left only rolled up rows, so only their pairs and repeated ones can conflict
+        taken = self.seen_keys | self.match_pairs
+        repeated = {key: stat for key, stat in stats.items() if key in taken}
+        fresh = [stat for key, stat in stats.items() if key not in taken]
+        if repeated:
+            super().write_stats(repeated)
+        if fresh:
+            self.copy_rows(fresh)
+            self.stats_created += len(fresh)
+            self.rows_copied += len(fresh)
+
+    def copy_rows(self, stats):
+        fields = [PlayerTournamentStat._meta.get_field(name) for name in self.COPY_FIELDS]
+        rows = ([field.get_db_prep_save(getattr(stat, field.attname), connection) for field in fields] for stat in stats)
+        sql = 'COPY {} ({}) FROM STDIN'.format(
+            connection.ops.quote_name(PlayerTournamentStat._meta.db_table),
+            ', '.join(connection.ops.quote_name(field.column) for field in fields),
+        )
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy'):
+                # psycopg 3 adapts each value itself
+                with raw.copy(sql) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+            else:
+                raw.copy_expert(f"{sql} WITH (FORMAT csv, NULL '\\N')", copy_csv(rows))
+
+
+def copy_csv(rows):
+    """`rows` as a CSV file for COPY ... WITH (FORMAT csv, NULL '\\N'); None becomes \\N, so '' stays empty text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow(['\\N' if value is None else value for value in row])
+    buffer.seek(0)
+    return buffer
+
+
+class IncrementalStatsImporter(BulkStatsImporter):
+    """
+    Upserts only the stat rows whose content hash changed since the last import.
+
+    Rows are keyed on (player, tournament). Re-importing an unchanged file
+    writes nothing to the stats table. With `prune=True`, stat rows that no
+    longer appear in the file are deleted as well.
+    """
+
+    def __init__(self, batch_size=1000, prune=False, match_threshold=None):
+        super().__init__(batch_size=batch_size, match_threshold=match_threshold)
+        self.prune = prune
+        self.stats_updated = 0
+        self.stats_unchanged = 0
+        self.stats_pruned = 0
+        self.existing = {}
+        self.affected_player_ids = set()
+
+    def begin(self):
+        self.load_players()
+        # Rolled up rows are not from the file: never unchanged, never pruned
+        self.existing = {
+            (player_id, tournament_id): (stat_id, row_hash, from_matches)
+            for stat_id, player_id, tournament_id, row_hash, from_matches in PlayerTournamentStat.objects.values_list(
+                'id', 'player_id', 'tournament_id', 'row_hash', 'from_matches'
+            )
+        }
+
+    def write_stats(self, stats):
+        changed = []
+        for key, stat in stats.items():
+            current = self.existing.get(key)
+            if current is None:
+                self.stats_created += 1
+            elif current[1] == stat.row_hash and not current[2]:
+                self.stats_unchanged += 1
+                continue
+            else:
+                self.stats_updated += 1
+            self.existing[key] = (current[0] if current else None, stat.row_hash, False)
+            self.affected_player_ids.add(key[0])
+            changed.append(stat)
+
+        if changed:
+            PlayerTournamentStat.objects.bulk_create(
+                changed,
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=['player', 'tournament'],
+                update_fields=IMPORT_FIELDS,
+            )
+
+    def finish(self):
+        if self.prune:
+            stale = [
+                (key[0], stat_id) for key, (stat_id, _, from_matches) in self.existing.items()
+                if key not in self.seen_keys and stat_id is not None and not from_matches
+            ]
+            stale_ids = [stat_id for _, stat_id in stale]
+            for start in range(0, len(stale_ids), self.batch_size):
+                PlayerTournamentStat.objects.filter(id__in=stale_ids[start:start + self.batch_size]).delete()
+            self.stats_pruned = len(stale_ids)
+            self.affected_player_ids.update(player_id for player_id, _ in stale)
+
+        # New players need a career row even before they have stats
+        self.affected_player_ids.update(self.created_player_ids)
+        recompute_stat_metrics(self.affected_player_ids)
+        link_teams(self.affected_player_ids)
+        refresh_career_stats(self.affected_player_ids)
+        # An unchanged file leaves every cached response valid
+        if self.affected_player_ids or self.updated_player_ids or self.tournaments_created:
+            bump_data_version()
@@ -0,0 +1,85 @@
+# In api/instrumentation.py
+
+import time
+from collections import Counter
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements executed on a database connection.
+
+    Works without DEBUG=True because it hooks into the connection's
+    execute wrappers instead of reading `connection.queries`.
+
+        with QueryCounter() as counter:
+            ...
+        print(counter.count)
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+        self.count = 0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+        self._wrapper = None
+
+
+class QueryRecorder(QueryCounter):
+    """
+    A QueryCounter that also times the statements and tells repeats apart:
+
+    - `duplicates`: executions of a statement with the very same parameters
+      as an earlier one, i.e. wasted round trips;
+    - `repeated(threshold)`: SQL texts run at least `threshold` times with any
+      parameters, the shape of an N+1 query in a loop.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        super().__init__(using)
+        self.duration = 0.0
+        self.statements = Counter()
+        self.executions = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.statements[sql] += 1
+        self.executions[sql, repr(params)] += 1
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.executions.values() if count > 1)
+
+    def repeated(self, threshold):
+        """[(sql, times run)] of the statements run at least `threshold` times, most first."""
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+def timed_render(request, response):
+    """
+    response.render(), adding its time to `request.render_duration` when the
+    request is being timed (api.profiling sets it); a plain render otherwise.
+    """
+    started = time.perf_counter()
+    response.render()
+    http_request = getattr(request, '_request', request)
+    if hasattr(http_request, 'render_duration'):
+        http_request.render_duration += time.perf_counter() - started
+    return response
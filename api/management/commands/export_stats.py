@@ -0,0 +1,32 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from api.export import EXPORT_BATCH_SIZE, arrow_available, write_parquet_dataset
+
+class Command(BaseCommand):
+    help = 'Exports player tournament stats as a Parquet dataset partitioned by tournament'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='exports/stats', help='Dataset directory (replaced on success).')
+        parser.add_argument(
+            '--batch-size', type=int, default=EXPORT_BATCH_SIZE,
+            help=f'Rows read from the database per batch (default: {EXPORT_BATCH_SIZE}).'
+        )
+        parser.add_argument(
+            '--compression', default='zstd',
+            help='Parquet compression codec: zstd (default), snappy, gzip or none.'
+        )
+
+    def handle(self, *args, **kwargs):
+        if not arrow_available():
+            raise CommandError("Parquet export needs pyarrow: pip install pyarrow")
+        if kwargs.get('batch_size', EXPORT_BATCH_SIZE) < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        output = kwargs.get('output', 'exports/stats')
+        started = time.perf_counter()
+        rows = write_parquet_dataset(
+            output, batch_size=kwargs.get('batch_size', EXPORT_BATCH_SIZE),
+            compression=kwargs.get('compression', 'zstd'),
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Exported {rows} stat rows to '{output}' in {elapsed:.2f}s."))
@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from api.photos import generate_pending_thumbnails
+
+class Command(BaseCommand):
+    help = 'Renders WebP/JPEG thumbnails of new or changed player photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Photos to process per pass (default: all pending).'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep checking for new photos instead of exiting once none are pending.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=30,
+            help='Seconds between checks with --loop (default: 30).'
+        )
+
+    def handle(self, *args, **kwargs):
+        limit = kwargs.get('limit')
+        if limit is not None and limit < 1:
+            raise CommandError("--limit must be at least 1.")
+
+        generated = failed = 0
+        try:
+            while True:
+                done, errors = generate_pending_thumbnails(limit)
+                generated += done
+                failed += errors
+                if done or errors:
+                    continue
+                if not kwargs.get('loop'):
+                    break
+                time.sleep(kwargs.get('interval', 30))
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Generated thumbnails for {generated} photos."))
+        if failed:
+            self.stdout.write(self.style.WARNING(f"  - {failed} photos could not be read; see Player.photo_thumbnails."))
@@ -0,0 +1,63 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from api.instrumentation import QueryCounter
+from api.matches import SCORECARDS_PER_CHUNK, MatchImporter, read_scorecards
+from api.search import NAME_MATCH_THRESHOLD
+
+class Command(BaseCommand):
+    help = 'Loads match scorecards (JSON Lines) and rolls them up into the tournament stats of the players in them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default='scorecards.jsonl', help='JSON Lines file with one scorecard per line.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows per INSERT statement (default: 1000).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=SCORECARDS_PER_CHUNK,
+            help=f'Scorecards parsed and written at a time (default: {SCORECARDS_PER_CHUNK}).'
+        )
+        parser.add_argument(
+            '--match-names', type=float, nargs='?', const=NAME_MATCH_THRESHOLD, default=None, metavar='THRESHOLD',
+            help='Give a new name to the existing player with at least this trigram similarity '
+                 f'(default: {NAME_MATCH_THRESHOLD}) instead of creating a player.'
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs.get('chunk_size', SCORECARDS_PER_CHUNK) < 1 or kwargs.get('batch_size', 1000) < 1:
+            raise CommandError("--chunk-size and --batch-size must be at least 1.")
+        match_threshold = kwargs.get('match_names')
+        if match_threshold is not None and not 0 < match_threshold <= 1:
+            raise CommandError("--match-names must be between 0 and 1.")
+        path = kwargs.get('file', 'scorecards.jsonl')
+        if not os.path.exists(path):
+            raise CommandError(f"The file '{path}' was not found.")
+
+        importer = MatchImporter(batch_size=kwargs.get('batch_size', 1000), match_threshold=match_threshold)
+        started = time.perf_counter()
+        try:
+            with QueryCounter() as queries:
+                importer.run_chunks(read_scorecards(path, kwargs.get('chunk_size', SCORECARDS_PER_CHUNK)))
+        except ValueError as e:
+            # Nothing was written: the whole load is one transaction
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f"\nMatch import complete! All scorecards processed in one transaction."))
+        self.stdout.write(self.style.SUCCESS(f"  - Matches Created: {importer.matches_created}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Matches Replaced: {importer.matches_replaced}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Performances Written: {importer.performances_written}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Stats Records Rolled Up: {importer.stats_rolled_up}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Stats Records Deleted: {importer.stats_deleted}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Imported Stats Records Kept: {importer.stats_kept}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Players Created: {importer.players_created}"))
+        if importer.match_threshold is not None:
+            self.stdout.write(self.style.SUCCESS(f"  - Names Matched To Existing Players: {len(importer.name_matches)}"))
+            for name, target in sorted(importer.name_matches.items()):
+                self.stdout.write(f"      {name!r} -> {target!r}")
+        self.stdout.write(self.style.SUCCESS(f"  - Tournaments Created: {importer.tournaments_created}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"  - {importer.rows_read} scorecards in {elapsed:.2f}s "
+            f"({importer.rows_read / elapsed if elapsed else 0:.0f} scorecards/sec), {queries.count} queries"
+        ))
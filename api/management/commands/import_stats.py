@@ -1,47 +1,100 @@
 import csv
-from django.core.management.base import BaseCommand
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from api.models import Player, Tournament, PlayerTournamentStat
-import pandas as pd
-
-def to_int(value):
-    """Helper function to safely convert a value to an integer, returning None on failure."""
-    try:
-        # Handle cases where value might be None or empty string
-        if value is None or value == '':
-            return None
-        return int(float(value))
-    except (ValueError, TypeError):
-        return None
-
-def to_float(value):
-    """Helper function to safely convert a value to a float, returning None on failure."""
-    try:
-        if value is None or value == '':
-            return None
-        return float(value)
-    except (ValueError, TypeError):
-        return None
+from api.caching import bump_data_version
+from api.career import refresh_career_stats
+from api.metrics import recompute_stat_metrics
+from api.importer import BulkStatsImporter, IncrementalStatsImporter
+from api.instrumentation import QueryCounter
+from api.parsing import stat_fields_from_row, to_int
+from api.search import NAME_MATCH_THRESHOLD
+from api.streaming import ChunkPipeline
+from api.teams import link_teams
 
 class Command(BaseCommand):
     help = 'Imports player tournament stats from master_stats.csv'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default='master_stats.csv', help='CSV file to import.')
+        parser.add_argument(
+            '--bulk', action='store_true',
+            help='Use the bulk importer: preloaded lookups, batched inserts, one transaction.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows per INSERT statement in bulk mode (default: 1000).'
+        )
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Upsert only new or changed (player, tournament) rows instead of reloading everything.'
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='With --incremental, delete stat rows that are no longer in the CSV.'
+        )
+        parser.add_argument(
+            '--stream', action='store_true',
+            help='Read and parse the CSV in chunks with bounded memory (implies --bulk).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=5000,
+            help='Rows per parsed chunk in streaming mode (default: 5000).'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Parser processes in streaming mode (default: 1, parse in a background thread).'
+        )
+        parser.add_argument(
+            '--match-names', type=float, nargs='?', const=NAME_MATCH_THRESHOLD, default=None, metavar='THRESHOLD',
+            help='Give a new name to the existing player with at least this trigram similarity '
+                 f'(default: {NAME_MATCH_THRESHOLD}) instead of creating a player (implies --bulk).'
+        )
+
     def handle(self, *args, **kwargs):
-        csv_file_path = 'master_stats.csv'
+        csv_file_path = kwargs.get('file', 'master_stats.csv')
         self.stdout.write(f"Starting import from {csv_file_path}...")
 
-        # Clear only the stats, not the players or tournaments, to preserve IDs
-        PlayerTournamentStat.objects.all().delete()
-        self.stdout.write(self.style.WARNING("Cleared all existing tournament stats."))
+        if kwargs.get('prune') and not kwargs.get('incremental'):
+            raise CommandError("--prune can only be used together with --incremental.")
+        if kwargs.get('chunk_size', 5000) < 1 or kwargs.get('workers', 1) < 1:
+            raise CommandError("--chunk-size and --workers must be at least 1.")
+        match_threshold = kwargs.get('match_names')
+        if match_threshold is not None and not 0 < match_threshold <= 1:
+            raise CommandError("--match-names must be between 0 and 1.")
+
+        batch_size = kwargs.get('batch_size', 1000)
+        if kwargs.get('incremental'):
+            importer = IncrementalStatsImporter(
+                batch_size=batch_size, prune=kwargs.get('prune'), match_threshold=match_threshold
+            )
+        elif kwargs.get('bulk') or kwargs.get('stream') or match_threshold is not None:
+            importer = BulkStatsImporter(batch_size=batch_size, match_threshold=match_threshold)
+        else:
+            importer = None
+
+        if importer is not None and kwargs.get('stream'):
+            pipeline = ChunkPipeline(
+                csv_file_path, chunk_size=kwargs.get('chunk_size', 5000), workers=kwargs.get('workers', 1)
+            )
+            return self.handle_bulk(csv_file_path, importer, pipeline)
+        if importer is not None:
+            return self.handle_bulk(csv_file_path, importer)
 
         try:
-            with open(csv_file_path, mode='r', encoding='utf-8') as file:
+            # One transaction, as in the bulk importers: a failure partway leaves the old stats in place
+            with transaction.atomic(), open(csv_file_path, mode='r', encoding='utf-8') as file:
+                # Clear only the imported stats, not the players, tournaments or match rollups, to preserve IDs
+                PlayerTournamentStat.objects.filter(from_matches=False).delete()
                 reader = csv.DictReader(file)
                 stats_created = 0
+                stats_updated = 0
                 players_updated = 0
 
                 for row in reader:
                     player_name = row.get('player_name')
-                    if not player_name or pd.isna(player_name):
+                    if not player_name:
                         continue
 
                     # Get or create the player
@@ -71,37 +124,63 @@ class Command(BaseCommand):
                         defaults={'name': f"Tournament {tournament_id}", 'year': 2024}
                     )
                     
-                    # Create the detailed stat record
-                    PlayerTournamentStat.objects.create(
+                    # Create the detailed stat record; a repeated (player, tournament) row replaces the earlier one
+                    _, created = PlayerTournamentStat.objects.update_or_create(
                         player=player,
                         tournament=tournament,
-                        team_name=row.get('team_name'),
-                        matches_played=to_int(row.get('matches_played')),
-                        runs_scored=to_int(row.get('runs_scored')),
-                        balls_faced=to_int(row.get('balls_faced')),
-                        highest_score=to_int(row.get('highest_score')),
-                        not_outs=to_int(row.get('not_outs')),
-                        fours=to_int(row.get('fours')),
-                        sixes=to_int(row.get('sixes')),
-                        fifties=to_int(row.get('fifties')),
-                        hundreds=to_int(row.get('hundreds')),
-                        batting_average=to_float(row.get('batting_average')),
-                        batting_strike_rate=to_float(row.get('batting_strike_rate')),
-                        overs_bowled=to_float(row.get('overs_bowled')),
-                        runs_conceded=to_int(row.get('runs_conceded')),
-                        wickets_taken=to_int(row.get('wickets_taken')),
-                        maidens=to_int(row.get('maidens')),
-                        bowling_average=to_float(row.get('bowling_average')),
-                        economy_rate=to_float(row.get('economy_rate')),
-                        bowling_strike_rate=to_float(row.get('bowling_strike_rate')),
+                        defaults={**stat_fields_from_row(row), 'from_matches': False},
                     )
-                    stats_created += 1
+                    if created:
+                        stats_created += 1
+                    else:
+                        stats_updated += 1
 
+                recompute_stat_metrics()
+                link_teams()
+                refresh_career_stats()
+                bump_data_version()
+            self.stdout.write(self.style.WARNING("Cleared all existing imported tournament stats."))
             self.stdout.write(self.style.SUCCESS(f"\nImport complete! All rows processed."))
             self.stdout.write(self.style.SUCCESS(f"  - Stats Records Created: {stats_created}"))
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Updated: {stats_updated}"))
             self.stdout.write(self.style.SUCCESS(f"  - Player Profiles Updated: {players_updated}"))
 
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f"Error: The file '{csv_file_path}' was not found."))
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f"An unexpected error occurred: {e}"))
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f"An unexpected error occurred: {e}"))
+
+    def handle_bulk(self, csv_file_path, importer, pipeline=None):
+        started = time.perf_counter()
+        try:
+            with QueryCounter() as queries:
+                if pipeline is not None:
+                    importer.run_chunks(pipeline)
+                else:
+                    with open(csv_file_path, mode='r', encoding='utf-8') as file:
+                        importer.run(csv.DictReader(file))
+        except FileNotFoundError:
+            self.stdout.write(self.style.ERROR(f"Error: The file '{csv_file_path}' was not found."))
+            return
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"An unexpected error occurred: {e}"))
+            return
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f"\nBulk import complete! All rows processed in one transaction."))
+        self.stdout.write(self.style.SUCCESS(f"  - Stats Records Created: {importer.stats_created}"))
+        if isinstance(importer, IncrementalStatsImporter):
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Updated: {importer.stats_updated}"))
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Unchanged: {importer.stats_unchanged}"))
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Pruned: {importer.stats_pruned}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Players Created: {importer.players_created}"))
+        if importer.match_threshold is not None:
+            self.stdout.write(self.style.SUCCESS(f"  - Names Matched To Existing Players: {len(importer.name_matches)}"))
+            for name, target in sorted(importer.name_matches.items()):
+                self.stdout.write(f"      {name!r} -> {target!r}")
+        self.stdout.write(self.style.SUCCESS(f"  - Player Profiles Updated: {importer.players_updated}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Tournaments Created: {importer.tournaments_created}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"  - {importer.rows_read} rows in {elapsed:.2f}s "
+            f"({importer.rows_read / elapsed if elapsed else 0:.0f} rows/sec), {queries.count} queries"
+        ))
@@ -0,0 +1,108 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+import process_excel
+from api.importer import CopyStatsImporter, IncrementalStatsImporter
+from api.instrumentation import QueryCounter
+from api.search import NAME_MATCH_THRESHOLD
+from api.streaming import frame_chunks
+
+class Command(BaseCommand):
+    help = 'Loads player tournament stats straight from the batting and bowling workbooks, without master_stats.csv'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--folder', default=process_excel.EXCEL_FOLDER_PATH,
+            help='Folder holding both workbooks.'
+        )
+        parser.add_argument('--batting', default=process_excel.BATTING_FILENAME, help='Batting workbook file name.')
+        parser.add_argument('--bowling', default=process_excel.BOWLING_FILENAME, help='Bowling workbook file name.')
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Sheet parser processes (default: one per CPU).'
+        )
+        parser.add_argument(
+            '--cache-dir', default=process_excel.CACHE_DIR,
+            help=f'Parsed sheet cache (default: {process_excel.CACHE_DIR}).'
+        )
+        parser.add_argument('--no-cache', action='store_true', help='Reparse every sheet and leave the cache alone.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows per INSERT statement when COPY is not available (default: 1000).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=5000,
+            help='Rows converted and written at a time (default: 5000).'
+        )
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Upsert only new or changed (player, tournament) rows instead of reloading everything.'
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='With --incremental, delete stat rows that are no longer in the workbooks.'
+        )
+        parser.add_argument(
+            '--match-names', type=float, nargs='?', const=NAME_MATCH_THRESHOLD, default=None, metavar='THRESHOLD',
+            help='Give a new name to the existing player with at least this trigram similarity '
+                 f'(default: {NAME_MATCH_THRESHOLD}) instead of creating a player.'
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs.get('prune') and not kwargs.get('incremental'):
+            raise CommandError("--prune can only be used together with --incremental.")
+        if kwargs.get('chunk_size', 5000) < 1 or kwargs.get('batch_size', 1000) < 1:
+            raise CommandError("--chunk-size and --batch-size must be at least 1.")
+        if kwargs.get('workers') is not None and kwargs['workers'] < 1:
+            raise CommandError("--workers must be at least 1.")
+        match_threshold = kwargs.get('match_names')
+        if match_threshold is not None and not 0 < match_threshold <= 1:
+            raise CommandError("--match-names must be between 0 and 1.")
+
+        folder = kwargs.get('folder', process_excel.EXCEL_FOLDER_PATH)
+        batting_filepath = os.path.join(folder, kwargs.get('batting', process_excel.BATTING_FILENAME))
+        bowling_filepath = os.path.join(folder, kwargs.get('bowling', process_excel.BOWLING_FILENAME))
+        for filepath in (batting_filepath, bowling_filepath):
+            if not os.path.exists(filepath):
+                raise CommandError(f"The file '{filepath}' was not found.")
+
+        self.stdout.write(f"Reading {batting_filepath} and {bowling_filepath}...")
+        started = time.perf_counter()
+        frame = process_excel.build_master_frame(
+            batting_filepath, bowling_filepath, workers=kwargs.get('workers'),
+            cache_dir=None if kwargs.get('no_cache') else kwargs.get('cache_dir', process_excel.CACHE_DIR),
+        )
+        read_elapsed = time.perf_counter() - started
+
+        batch_size = kwargs.get('batch_size', 1000)
+        if kwargs.get('incremental'):
+            importer = IncrementalStatsImporter(
+                batch_size=batch_size, prune=kwargs.get('prune'), match_threshold=match_threshold
+            )
+        else:
+            importer = CopyStatsImporter(batch_size=batch_size, match_threshold=match_threshold)
+
+        started = time.perf_counter()
+        with QueryCounter() as queries:
+            importer.run_chunks(frame_chunks(frame, kwargs.get('chunk_size', 5000)))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f"\nExcel load complete! All rows processed in one transaction."))
+        self.stdout.write(self.style.SUCCESS(f"  - Stats Records Created: {importer.stats_created}"))
+        if isinstance(importer, IncrementalStatsImporter):
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Updated: {importer.stats_updated}"))
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Unchanged: {importer.stats_unchanged}"))
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Pruned: {importer.stats_pruned}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"  - Stats Records Copied: {importer.rows_copied}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Players Created: {importer.players_created}"))
+        if importer.match_threshold is not None:
+            self.stdout.write(self.style.SUCCESS(f"  - Names Matched To Existing Players: {len(importer.name_matches)}"))
+            for name, target in sorted(importer.name_matches.items()):
+                self.stdout.write(f"      {name!r} -> {target!r}")
+        self.stdout.write(self.style.SUCCESS(f"  - Player Profiles Updated: {importer.players_updated}"))
+        self.stdout.write(self.style.SUCCESS(f"  - Tournaments Created: {importer.tournaments_created}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"  - {importer.rows_read} rows read in {read_elapsed:.2f}s, written in {elapsed:.2f}s "
+            f"({importer.rows_read / elapsed if elapsed else 0:.0f} rows/sec), {queries.count} queries"
+        ))
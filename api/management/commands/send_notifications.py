@@ -0,0 +1,49 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from api.notifications import MAX_ATTEMPTS, OutboxWorker
+
+class Command(BaseCommand):
+    help = 'Sends queued notification emails (edit request digests) from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Notifications claimed per batch (default: 100).'
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help=f'Give up on a notification after this many failed sends (default: {MAX_ATTEMPTS}).'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling the outbox instead of exiting once it is drained.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=10,
+            help='Seconds between polls with --loop (default: 10).'
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs.get('batch_size', 100) < 1 or kwargs.get('max_attempts', MAX_ATTEMPTS) < 1:
+            raise CommandError("--batch-size and --max-attempts must be at least 1.")
+
+        worker = OutboxWorker(
+            batch_size=kwargs.get('batch_size', 100), max_attempts=kwargs.get('max_attempts', MAX_ATTEMPTS)
+        )
+        try:
+            while True:
+                while worker.run_batch():
+                    pass
+                if not kwargs.get('loop'):
+                    break
+                time.sleep(kwargs.get('interval', 10))
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {worker.emails_sent} emails covering {worker.notifications_sent} notifications."
+        ))
+        if worker.notifications_retried or worker.notifications_failed:
+            self.stdout.write(self.style.WARNING(
+                f"  - {worker.notifications_retried} will be retried, {worker.notifications_failed} gave up."
+            ))
@@ -0,0 +1,348 @@
+# In api/matches.py
+
+"""
+Match-level ingestion: scorecards into Match, BattingPerformance and
+BowlingPerformance, rolled up into PlayerTournamentStat.
+
+Scorecards come as JSON Lines, one match per line:
+
+    {"match_key": "2024-T4-M1", "tournament_id": 4, "date": "2024-03-01",
+     "venue": "Nehru Stadium", "team1": "Gajapade", "team2": "Hampi", "winner": "Gajapade",
+     "batting": [{"player": "Aditya", "team": "Gajapade", "runs": 34, "balls": 20,
+                  "fours": 3, "sixes": 1, "not_out": false},
+                 {"player": "Vinay", "team": "Gajapade", "batted": false}],
+     "bowling": [{"player": "Karan", "team": "Hampi", "overs": 3.4, "runs": 30,
+                  "wickets": 2, "maidens": 0}]}
+
+`match_key` identifies the match, so loading a scorecard again replaces it.
+Every player of a match gets a BattingPerformance, batted or not, which is
+what matches played are counted from.
+
+MatchImporter writes a chunk of scorecards with a few bulk statements and
+remembers the (player, tournament) pairs it touched. At the end,
+`rollup_matches` re-aggregates just those pairs with grouped SQL, computes
+their rates (api.metrics) and upserts their PlayerTournamentStat rows. Then
+their players' career rows are refreshed. A new match never costs a full
+re-import.
+
+Rolled up rows are marked `from_matches`. An imported (spreadsheet) row is
+the authoritative total for its pair: a rollup never overwrites or deletes
+one, and an import replaces a rolled up row of a pair it covers.
+"""
+
+import json
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from .caching import bump_data_version
+from .career import refresh_career_stats
+from .importer import BulkStatsImporter
+from .metrics import COUNT_FIELDS, RATE_FIELDS, as_array, balls_to_overs, overs_to_balls, stat_metrics
+from .models import BattingPerformance, BowlingPerformance, Match, PlayerTournamentStat
+from .teams import link_teams
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib parser is used otherwise
+    orjson = None
+
+# Scorecards parsed and written per transaction step
+SCORECARDS_PER_CHUNK = 500
+# Keeps the IN (...) lists well below SQLite's variable limit
+ROLLUP_BATCH_SIZE = 500
+
+# PlayerTournamentStat columns aggregated from a pair's batting performances
+BATTING_ROLLUP = {
+    'team_name': Max('team_name'),
+    'matches_played': Count('id'),
+    'innings': Count('id', filter=Q(batted=True)),
+    'not_outs': Count('id', filter=Q(batted=True, not_out=True)),
+    'runs_scored': Sum('runs_scored'),
+    'balls_faced': Sum('balls_faced'),
+    'highest_score': Max('runs_scored', filter=Q(batted=True)),
+    'fours': Sum('fours'),
+    'sixes': Sum('sixes'),
+    'fifties': Count('id', filter=Q(runs_scored__gte=50, runs_scored__lt=100)),
+    'hundreds': Count('id', filter=Q(runs_scored__gte=100)),
+}
+# ... and from its bowling performances; balls are summed, not overs
+BOWLING_ROLLUP = {
+    'balls_bowled': Sum('balls_bowled'),
+    'runs_conceded': Sum('runs_conceded'),
+    'wickets_taken': Sum('wickets_taken'),
+    'maidens': Sum('maidens'),
+}
+# Every PlayerTournamentStat column a rollup writes
+ROLLUP_FIELDS = [
+    *BATTING_ROLLUP, 'highest_score_not_out', 'overs_bowled', *BOWLING_ROLLUP, *RATE_FIELDS, 'row_hash',
+]
+
+
+def _clean_name(name):
+    return ' '.join(str(name or '').split())
+
+def _count(entry, key):
+    value = entry.get(key)
+    return 0 if value in (None, '') else int(value)
+
+def _flag(entry, key, default):
+    # Only JSON true/false: bool('false') is True
+    value = entry.get(key, default)
+    if not isinstance(value, bool):
+        raise ValueError(f"{key} must be true or false, not {value!r}")
+    return value
+
+def parse_scorecard(data):
+    """Validates one decoded scorecard and returns it with cleaned names and typed values; ValueError when invalid."""
+    try:
+        match_key = str(data['match_key']).strip()
+        tournament_id = int(data['tournament_id'])
+        played_on = date.fromisoformat(data['date'])
+        batting = [
+            {
+                'player_name': _clean_name(entry['player']),
+                'team_name': _clean_name(entry.get('team')),
+                'batted': _flag(entry, 'batted', True),
+                'not_out': _flag(entry, 'not_out', False),
+                'runs_scored': _count(entry, 'runs'),
+                'balls_faced': _count(entry, 'balls'),
+                'fours': _count(entry, 'fours'),
+                'sixes': _count(entry, 'sixes'),
+            }
+            for entry in data.get('batting', [])
+        ]
+        bowling = [
+            {
+                'player_name': _clean_name(entry['player']),
+                'team_name': _clean_name(entry.get('team')),
+                'overs_bowled': float(entry.get('overs') or 0),
+                'runs_conceded': _count(entry, 'runs'),
+                'wickets_taken': _count(entry, 'wickets'),
+                'maidens': _count(entry, 'maidens'),
+            }
+            for entry in data.get('bowling', [])
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"invalid scorecard: {e!r}") from None
+    if not match_key:
+        raise ValueError("invalid scorecard: empty match_key")
+    for entry in bowling:
+        entry['balls_bowled'] = overs_to_balls([entry['overs_bowled']])[0]
+        if entry['balls_bowled'] != entry['balls_bowled']:
+            raise ValueError(f"invalid scorecard: {entry['overs_bowled']} is not a number of overs")
+        entry['balls_bowled'] = int(entry['balls_bowled'])
+    if any(not entry['player_name'] for entry in batting + bowling):
+        raise ValueError("invalid scorecard: performance without a player name")
+    return {
+        'match_key': match_key,
+        'tournament_id': tournament_id,
+        'date': played_on,
+        'venue': str(data.get('venue') or ''),
+        'team1_name': _clean_name(data.get('team1')),
+        'team2_name': _clean_name(data.get('team2')),
+        'winner_name': _clean_name(data.get('winner')),
+        'batting': batting,
+        'bowling': bowling,
+    }
+
+def read_scorecards(path, chunk_size=SCORECARDS_PER_CHUNK):
+    """Yields the scorecards of a JSON Lines file as lists of up to `chunk_size` parsed scorecards."""
+    loads = orjson.loads if orjson is not None else json.loads
+    chunk = []
+    with open(path, 'rb') as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                chunk.append(parse_scorecard(loads(line)))
+            except ValueError as e:
+                # orjson.JSONDecodeError and json.JSONDecodeError are both ValueErrors
+                raise ValueError(f"{path}, line {line_number}: {e}") from None
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class MatchImporter(BulkStatsImporter):
+    """
+    Loads scorecards (see parse_scorecard) and rolls the touched
+    (player, tournament) pairs up into PlayerTournamentStat, all in one
+    transaction. Players and tournaments are resolved as BulkStatsImporter
+    does, name matching included; no existing stat row is deleted up front.
+    """
+
+    def __init__(self, batch_size=1000, match_threshold=None):
+        super().__init__(batch_size=batch_size, match_threshold=match_threshold)
+        self.matches_created = 0
+        self.matches_replaced = 0
+        self.performances_written = 0
+        self.stats_rolled_up = 0
+        self.stats_deleted = 0
+        self.stats_kept = 0
+        self.affected_pairs = set()
+
+    def run(self, scorecards):
+        return self.run_chunks([scorecards])
+
+    def run_chunks(self, chunks):
+        with transaction.atomic():
+            self.load_players()
+            for scorecards in chunks:
+                self.rows_read += len(scorecards)
+                self.write_matches(scorecards)
+            self.finish()
+        return self
+
+    def write_matches(self, scorecards):
+        """Writes one chunk of scorecards: the matches, then their performances."""
+        # A match repeated later in the chunk replaces the earlier scorecard
+        scorecards = list({card['match_key']: card for card in scorecards}.values())
+        self.resolve_players([
+            {'player_name': entry['player_name'], 'batting_style': '', 'bowling_style': ''}
+            for card in scorecards for entry in card['batting'] + card['bowling']
+        ])
+        self.resolve_tournaments(scorecards)
+
+        keys = [card['match_key'] for card in scorecards]
+        existing = dict(Match.objects.filter(match_key__in=keys).values_list('match_key', 'id'))
+        if existing:
+            # The pairs a replaced scorecard counted towards may lose the match
+            replaced = list(existing.values())
+            for model in (BattingPerformance, BowlingPerformance):
+                performances = model.objects.filter(match__in=replaced)
+                self.affected_pairs.update(performances.values_list('player_id', 'match__tournament_id'))
+                performances.delete()
+        self.matches_replaced += len(existing)
+        self.matches_created += len(keys) - len(existing)
+
+        match_fields = ['tournament_id', 'date', 'venue', 'team1_name', 'team2_name', 'winner_name']
+        Match.objects.bulk_create(
+            [Match(match_key=card['match_key'], **{name: card[name] for name in match_fields}) for card in scorecards],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['match_key'],
+            update_fields=match_fields,
+        )
+        # Not every backend returns primary keys from an upsert
+        match_ids = dict(Match.objects.filter(match_key__in=keys).values_list('match_key', 'id'))
+
+        batting, bowling = {}, {}
+        for card in scorecards:
+            match_id = match_ids[card['match_key']]
+            for entry in card['batting']:
+                player = self.players[entry['player_name']]
+                values = {name: value for name, value in entry.items() if name != 'player_name'}
+                batting[match_id, player.pk] = BattingPerformance(match_id=match_id, player=player, **values)
+                self.affected_pairs.add((player.pk, card['tournament_id']))
+            for entry in card['bowling']:
+                player = self.players[entry['player_name']]
+                values = {name: value for name, value in entry.items() if name not in ('player_name', 'team_name')}
+                bowling[match_id, player.pk] = BowlingPerformance(match_id=match_id, player=player, **values)
+                # A bowler missing from the batting card still played the match
+                batting.setdefault((match_id, player.pk), BattingPerformance(
+                    match_id=match_id, player=player, team_name=entry['team_name'], batted=False
+                ))
+                self.affected_pairs.add((player.pk, card['tournament_id']))
+
+        BattingPerformance.objects.bulk_create(list(batting.values()), batch_size=self.batch_size)
+        BowlingPerformance.objects.bulk_create(list(bowling.values()), batch_size=self.batch_size)
+        self.performances_written += len(batting) + len(bowling)
+
+    def finish(self):
+        self.stats_rolled_up, self.stats_deleted, self.stats_kept = rollup_matches(self.affected_pairs)
+        player_ids = {player_id for player_id, _ in self.affected_pairs} | self.created_player_ids
+        link_teams(player_ids)
+        refresh_career_stats(player_ids)
+        if player_ids or self.tournaments_created:
+            bump_data_version()
+
+
+def rollup_matches(pairs):
+    """
+    Recomputes the PlayerTournamentStat rows of `pairs`, (player id,
+    tournament id) tuples, from their match performances with one grouped
+    query per table and batch of players. A pair left without performances
+    loses its rolled up row. Pairs with an imported row keep it as it is.
+    Returns (rows written, rows deleted, imported rows kept).
+    """
+    tournaments_by_player = {}
+    for player_id, tournament_id in pairs:
+        if tournament_id is not None:
+            tournaments_by_player.setdefault(player_id, set()).add(tournament_id)
+    player_ids = sorted(tournaments_by_player)
+    written = deleted = kept = 0
+    for start in range(0, len(player_ids), ROLLUP_BATCH_SIZE):
+        batch = player_ids[start:start + ROLLUP_BATCH_SIZE]
+        batch_pairs = {(player_id, t) for player_id in batch for t in tournaments_by_player[player_id]}
+        tournament_ids = {tournament_id for _, tournament_id in batch_pairs}
+        batting = _grouped(BattingPerformance, BATTING_ROLLUP, batch, tournament_ids, highest_not_out=Max(
+            'runs_scored', filter=Q(batted=True, not_out=True)
+        ))
+        bowling = _grouped(BowlingPerformance, BOWLING_ROLLUP, batch, tournament_ids)
+        imported = set(
+            PlayerTournamentStat.objects
+            .filter(player__in=batch, tournament__in=tournament_ids, from_matches=False)
+            .values_list('player_id', 'tournament_id')
+        )
+
+        stats, empty = [], []
+        for pair in sorted(batch_pairs):
+            if pair in imported:
+                kept += 1
+                continue
+            if pair not in batting and pair not in bowling:
+                empty.append(pair)
+                continue
+            stats.append(_stat_from_rollup(pair, batting.get(pair), bowling.get(pair)))
+        # Rates come with the rollup, so the rows need no second pass. Only rolled up rows conflict here
+        metrics = stat_metrics({name: as_array([getattr(stat, name) for stat in stats]) for name in COUNT_FIELDS})
+        for index, stat in enumerate(stats):
+            for name, values in metrics.items():
+                setattr(stat, name, values[index])
+        PlayerTournamentStat.objects.bulk_create(
+            stats,
+            batch_size=ROLLUP_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['player', 'tournament'],
+            update_fields=ROLLUP_FIELDS,
+        )
+        written += len(stats)
+        if empty:
+            condition = Q()
+            for player_id, tournament_id in empty:
+                condition |= Q(player_id=player_id, tournament_id=tournament_id)
+            deleted += PlayerTournamentStat.objects.filter(condition, from_matches=True).delete()[0]
+    return written, deleted, kept
+
+def _grouped(model, aggregates, player_ids, tournament_ids, **extra):
+    """{(player id, tournament id): aggregate values} of `model`, grouped in SQL."""
+    aggregates = {**aggregates, **extra}
+    # Annotations may not shadow the model's fields, which most aggregates are named after
+    rows = (
+        model.objects
+        .filter(player__in=player_ids, match__tournament__in=tournament_ids)
+        .values('player_id', 'match__tournament_id')
+        .order_by()
+        .annotate(**{f'rollup_{name}': aggregate for name, aggregate in aggregates.items()})
+    )
+    return {
+        (row['player_id'], row['match__tournament_id']): {name: row[f'rollup_{name}'] for name in aggregates}
+        for row in rows
+    }
+
+def _stat_from_rollup(pair, batting, bowling):
+    player_id, tournament_id = pair
+    values = {name: None for name in ROLLUP_FIELDS}
+    values.update(row_hash='', highest_score_not_out=False, from_matches=True)
+    if batting is not None:
+        highest_not_out = batting.pop('highest_not_out')
+        values.update(batting)
+        values['team_name'] = batting['team_name'] or None
+        values['highest_score_not_out'] = highest_not_out is not None and highest_not_out == batting['highest_score']
+    if bowling is not None:
+        values.update(bowling)
+        values['overs_bowled'] = float(balls_to_overs(bowling['balls_bowled'] or 0))
+    return PlayerTournamentStat(player_id=player_id, tournament_id=tournament_id, **values)
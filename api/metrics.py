@@ -0,0 +1,146 @@
+# In api/metrics.py
+
+"""
+Averages, strike rates and economy computed from raw counts, a whole column
+at a time with NumPy.
+
+The rates in the spreadsheets are not trusted. After every import,
+`recompute_stat_metrics` recomputes them for each tournament row from its
+counts, and api.career computes career rates with the same `compute_rates`
+from summed counts; averaging per-tournament rates would be wrong.
+
+Overs are in cricket notation: 4.3 overs is 4 overs and 3 balls, i.e. 27
+balls. They are converted to balls before any arithmetic, and career overs
+are converted back from summed balls.
+"""
+
+import numpy as np
+
+from .models import PlayerTournamentStat
+from .parsing import python_values
+
+BALLS_PER_OVER = 6
+# Derived columns of PlayerTournamentStat, in compute_rates order
+RATE_FIELDS = ['batting_average', 'batting_strike_rate', 'bowling_average', 'economy_rate', 'bowling_strike_rate']
+# Counts each stat row's metrics are computed from
+COUNT_FIELDS = [
+    'runs_scored', 'innings', 'matches_played', 'not_outs', 'balls_faced',
+    'runs_conceded', 'wickets_taken', 'overs_bowled',
+]
+# Rows read and written per chunk by recompute_stat_metrics
+CHUNK_SIZE = 5000
+# Keeps the IN (...) lists well below SQLite's variable limit
+PLAYER_BATCH_SIZE = 500
+
+
+def as_array(values):
+    """Float array of `values`, NaN for None."""
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+def overs_to_balls(overs):
+    """
+    Balls in each of `overs` (cricket notation): 4.3 -> 27. NaN for missing
+    values and for values that are not overs, like 4.7 or 4.25.
+    """
+    overs = np.asarray(overs, dtype=float)
+    with np.errstate(invalid='ignore'):
+        whole = np.floor(overs + 1e-9)
+        tenths = (overs - whole) * 10
+        balls_part = np.rint(tenths)
+        valid = (overs >= 0) & (balls_part < BALLS_PER_OVER) & (np.abs(tenths - balls_part) < 1e-6)
+    return np.where(valid, whole * BALLS_PER_OVER + balls_part, np.nan)
+
+def balls_to_overs(balls):
+    """Cricket notation for each of `balls`: 27 -> 4.3."""
+    whole, rest = np.divmod(np.asarray(balls, dtype=float), BALLS_PER_OVER)
+    return whole + rest / 10
+
+def _ratio(numerator, denominator, scale=1):
+    """numerator * scale / denominator rounded to 2 places, NaN where the denominator is not positive."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.round(np.where(denominator > 0, numerator * scale / denominator, np.nan), 2)
+
+def compute_rates(runs, innings, not_outs, balls_faced, runs_conceded, wickets, balls_bowled):
+    """
+    {RATE_FIELDS name: float array} from count arrays; NaN where a rate is
+    undefined (no dismissals, no balls faced, no wickets, no balls bowled).
+    A missing not-out count is taken as 0.
+    """
+    dismissals = innings - np.nan_to_num(not_outs)
+    return {
+        'batting_average': _ratio(runs, dismissals),
+        'batting_strike_rate': _ratio(runs, balls_faced, 100),
+        'bowling_average': _ratio(runs_conceded, wickets),
+        'economy_rate': _ratio(runs_conceded, balls_bowled, BALLS_PER_OVER),
+        'bowling_strike_rate': _ratio(balls_bowled, wickets),
+    }
+
+def stat_metrics(counts):
+    """
+    {field: list of Python values} of balls_bowled and every RATE_FIELDS
+    column, for `counts`: {COUNT_FIELDS name: float array} of stat rows.
+    Innings fall back to matches played for sheets without an Inns column.
+    """
+    innings = np.where(np.isnan(counts['innings']), counts['matches_played'], counts['innings'])
+    balls_bowled = overs_to_balls(counts['overs_bowled'])
+    rates = compute_rates(
+        counts['runs_scored'], innings, counts['not_outs'], counts['balls_faced'],
+        counts['runs_conceded'], counts['wickets_taken'], balls_bowled,
+    )
+    metrics = {'balls_bowled': python_values(balls_bowled, integer=True)}
+    metrics.update((name, python_values(values, integer=False)) for name, values in rates.items())
+    return metrics
+
+
+def recompute_stat_metrics(player_ids=None, chunk_size=CHUNK_SIZE):
+    """
+    Recomputes balls_bowled and the rates of the stat rows of `player_ids`,
+    or of every row when None, in one pass over the table. Only rows whose
+    stored values differ are written. Returns the number of rows updated.
+    """
+    if player_ids is None:
+        querysets = [PlayerTournamentStat.objects.all()]
+    else:
+        player_ids = sorted(set(player_ids))
+        querysets = [
+            PlayerTournamentStat.objects.filter(player__in=player_ids[start:start + PLAYER_BATCH_SIZE])
+            for start in range(0, len(player_ids), PLAYER_BATCH_SIZE)
+        ]
+
+    derived = ['balls_bowled', *RATE_FIELDS]
+    updated = 0
+    for queryset in querysets:
+        rows = queryset.order_by('id').values_list(
+            'player_id', 'tournament_id', *COUNT_FIELDS, *derived
+        ).iterator(chunk_size=chunk_size)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                updated += _recompute_chunk(chunk, derived)
+                chunk = []
+        if chunk:
+            updated += _recompute_chunk(chunk, derived)
+    return updated
+
+def _recompute_chunk(rows, derived):
+    columns = list(zip(*rows))
+    keys = list(zip(*columns[:2]))
+    counts = {name: as_array(values) for name, values in zip(COUNT_FIELDS, columns[2:])}
+    stored = dict(zip(derived, columns[2 + len(COUNT_FIELDS):]))
+    metrics = stat_metrics(counts)
+
+    changed = []
+    for index, (player_id, tournament_id) in enumerate(keys):
+        values = {name: metrics[name][index] for name in derived}
+        if any(values[name] != stored[name][index] for name in derived):
+            changed.append(PlayerTournamentStat(player_id=player_id, tournament_id=tournament_id, **values))
+    # An upsert on the existing rows: far cheaper than bulk_update's CASE WHEN per row and field
+    PlayerTournamentStat.objects.bulk_create(
+        changed,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['player', 'tournament'],
+        update_fields=derived,
+    )
+    return len(changed)
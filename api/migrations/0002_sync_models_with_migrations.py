@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='match',
+            name='player_of_the_match',
+        ),
+        migrations.RemoveField(
+            model_name='player',
+            name='photo',
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='contact_number',
+            field=models.CharField(blank=True, max_length=15, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='PlayerEditRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('proposed_changes', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=20)),
+                ('requested_on', models.DateTimeField(auto_now_add=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.player')),
+            ],
+        ),
+    ]
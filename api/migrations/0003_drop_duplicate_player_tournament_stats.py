@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:39
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def drop_duplicate_stats(apps, schema_editor):
+    # Keep the most recently imported row for each (player, tournament) pair
+    PlayerTournamentStat = apps.get_model('api', 'PlayerTournamentStat')
+    latest = (
+        PlayerTournamentStat.objects.values('player', 'tournament')
+        .annotate(keep_id=Max('id'))
+        .values_list('keep_id', flat=True)
+    )
+    PlayerTournamentStat.objects.exclude(id__in=list(latest)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_sync_models_with_migrations'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_stats, migrations.RunPython.noop),
+    ]
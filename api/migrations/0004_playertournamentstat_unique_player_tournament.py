@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_drop_duplicate_player_tournament_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playertournamentstat',
+            name='row_hash',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddConstraint(
+            model_name='playertournamentstat',
+            constraint=models.UniqueConstraint(fields=('player', 'tournament'), name='unique_player_tournament_stat'),
+        ),
+    ]
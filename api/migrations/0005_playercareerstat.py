@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_playertournamentstat_unique_player_tournament'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerCareerStat',
+            fields=[
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='career', serialize=False, to='api.player')),
+                ('player_name', models.CharField(max_length=100)),
+                ('total_matches', models.IntegerField(blank=True, null=True)),
+                ('total_runs', models.IntegerField(blank=True, null=True)),
+                ('total_not_outs', models.IntegerField(blank=True, null=True)),
+                ('total_fours', models.IntegerField(blank=True, null=True)),
+                ('total_sixes', models.IntegerField(blank=True, null=True)),
+                ('career_highest_score', models.IntegerField(blank=True, null=True)),
+                ('total_wickets', models.IntegerField(blank=True, null=True)),
+                ('total_maidens', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total_runs', 'player'], name='career_total_runs_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:44
+
+from django.db import migrations
+from django.db.models import Sum, Max
+
+
+def populate_career_stats(apps, schema_editor):
+    Player = apps.get_model('api', 'Player')
+    PlayerCareerStat = apps.get_model('api', 'PlayerCareerStat')
+    rows = Player.objects.annotate(
+        total_matches=Sum('playertournamentstat__matches_played'),
+        total_runs=Sum('playertournamentstat__runs_scored'),
+        total_wickets=Sum('playertournamentstat__wickets_taken'),
+        career_highest_score=Max('playertournamentstat__highest_score'),
+        total_not_outs=Sum('playertournamentstat__not_outs'),
+        total_fours=Sum('playertournamentstat__fours'),
+        total_sixes=Sum('playertournamentstat__sixes'),
+        total_maidens=Sum('playertournamentstat__maidens'),
+    ).values(
+        'id', 'name', 'total_matches', 'total_runs', 'total_wickets', 'career_highest_score',
+        'total_not_outs', 'total_fours', 'total_sixes', 'total_maidens',
+    )
+    PlayerCareerStat.objects.bulk_create(
+        [PlayerCareerStat(player_id=row.pop('id'), player_name=row.pop('name'), **row) for row in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_playercareerstat'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_career_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_populate_playercareerstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='batting_strike_rate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='bowling_average',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='total_balls_faced',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='total_runs_conceded',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-total_matches', 'player'], name='career_total_matches_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-total_wickets', 'player'], name='career_total_wickets_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-career_highest_score', 'player'], name='career_highest_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-total_not_outs', 'player'], name='career_total_not_outs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-total_fours', 'player'], name='career_total_fours_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-total_sixes', 'player'], name='career_total_sixes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-total_maidens', 'player'], name='career_total_maidens_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-batting_strike_rate', 'player'], name='career_batting_sr_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['bowling_average', 'player'], name='career_bowling_avg_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+from django.db import migrations
+from django.db.models import Sum
+
+
+def populate_ranking_metrics(apps, schema_editor):
+    Player = apps.get_model('api', 'Player')
+    PlayerCareerStat = apps.get_model('api', 'PlayerCareerStat')
+    totals = Player.objects.annotate(
+        balls=Sum('playertournamentstat__balls_faced'),
+        conceded=Sum('playertournamentstat__runs_conceded'),
+    ).values_list('id', 'balls', 'conceded')
+    balls_by_player = {player_id: (balls, conceded) for player_id, balls, conceded in totals}
+
+    career_stats = list(PlayerCareerStat.objects.all())
+    for career in career_stats:
+        balls, conceded = balls_by_player.get(career.player_id, (None, None))
+        career.total_balls_faced = balls
+        career.total_runs_conceded = conceded
+        runs, wickets = career.total_runs, career.total_wickets
+        career.batting_strike_rate = round(runs * 100 / balls, 2) if runs is not None and balls else None
+        career.bowling_average = round(conceded / wickets, 2) if conceded is not None and wickets else None
+    PlayerCareerStat.objects.bulk_update(
+        career_stats,
+        ['total_balls_faced', 'total_runs_conceded', 'batting_strike_rate', 'bowling_average'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_playercareerstat_ranking_metrics'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_ranking_metrics, migrations.RunPython.noop),
+    ]
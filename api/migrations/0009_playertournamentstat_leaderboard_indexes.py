@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_populate_ranking_metrics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='playertournamentstat',
+            index=models.Index(fields=['tournament', '-runs_scored'], name='stat_tournament_runs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playertournamentstat',
+            index=models.Index(fields=['tournament', '-wickets_taken'], name='stat_tournament_wickets_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playertournamentstat',
+            index=models.Index(fields=['team_name', 'tournament'], name='stat_team_tournament_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playertournamentstat',
+            name='highest_score_not_out',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:02
+
+from django.db import migrations
+
+# Serves api.search on PostgreSQL: the % similarity operator and the
+# UPPER(name) LIKE patterns of istartswith/icontains. Other databases search
+# an in-process index instead and get nothing here.
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS player_name_trgm_idx ON api_player USING gin (UPPER(name) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS player_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_playertournamentstat_highest_score_not_out'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
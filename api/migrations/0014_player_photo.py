@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_player_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, upload_to='players/originals/'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='photo_thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_player_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='batting_average',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='bowling_strike_rate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='economy_rate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='total_balls_bowled',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='total_innings',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playercareerstat',
+            name='total_overs',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playertournamentstat',
+            name='balls_bowled',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playertournamentstat',
+            name='innings',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['-batting_average', 'player'], name='career_batting_avg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['economy_rate', 'player'], name='career_economy_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=models.Index(fields=['bowling_strike_rate', 'player'], name='career_bowling_sr_idx'),
+        ),
+    ]
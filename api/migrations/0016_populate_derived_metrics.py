@@ -0,0 +1,121 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:05
+
+from django.db import migrations
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+import numpy as np
+
+# Frozen copies of api.metrics and api.parsing as of this migration, so later
+# changes to the app code cannot change what it writes
+BALLS_PER_OVER = 6
+COUNT_FIELDS = [
+    'runs_scored', 'innings', 'matches_played', 'not_outs', 'balls_faced',
+    'runs_conceded', 'wickets_taken', 'overs_bowled',
+]
+STAT_DERIVED = ['balls_bowled', 'batting_average', 'batting_strike_rate', 'bowling_average', 'economy_rate', 'bowling_strike_rate']
+CAREER_DERIVED = ['batting_average', 'batting_strike_rate', 'total_overs', 'economy_rate', 'bowling_average', 'bowling_strike_rate']
+
+
+def as_array(values):
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+def python_values(values, integer):
+    missing = np.isnan(values)
+    if integer:
+        converted = np.trunc(np.where(missing, 0, values)).astype(np.int64).tolist()
+    else:
+        converted = values.tolist()
+    for index in np.flatnonzero(missing).tolist():
+        converted[index] = None
+    return converted
+
+def overs_to_balls(overs):
+    overs = np.asarray(overs, dtype=float)
+    with np.errstate(invalid='ignore'):
+        whole = np.floor(overs + 1e-9)
+        tenths = (overs - whole) * 10
+        balls_part = np.rint(tenths)
+        valid = (overs >= 0) & (balls_part < BALLS_PER_OVER) & (np.abs(tenths - balls_part) < 1e-6)
+    return np.where(valid, whole * BALLS_PER_OVER + balls_part, np.nan)
+
+def balls_to_overs(balls):
+    whole, rest = np.divmod(np.asarray(balls, dtype=float), BALLS_PER_OVER)
+    return whole + rest / 10
+
+def _ratio(numerator, denominator, scale=1):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.round(np.where(denominator > 0, numerator * scale / denominator, np.nan), 2)
+
+def compute_rates(runs, innings, not_outs, balls_faced, runs_conceded, wickets, balls_bowled):
+    dismissals = innings - np.nan_to_num(not_outs)
+    return {
+        'batting_average': _ratio(runs, dismissals),
+        'batting_strike_rate': _ratio(runs, balls_faced, 100),
+        'bowling_average': _ratio(runs_conceded, wickets),
+        'economy_rate': _ratio(runs_conceded, balls_bowled, BALLS_PER_OVER),
+        'bowling_strike_rate': _ratio(balls_bowled, wickets),
+    }
+
+def stat_metrics(counts):
+    innings = np.where(np.isnan(counts['innings']), counts['matches_played'], counts['innings'])
+    balls_bowled = overs_to_balls(counts['overs_bowled'])
+    rates = compute_rates(
+        counts['runs_scored'], innings, counts['not_outs'], counts['balls_faced'],
+        counts['runs_conceded'], counts['wickets_taken'], balls_bowled,
+    )
+    metrics = {'balls_bowled': python_values(balls_bowled, integer=True)}
+    metrics.update((name, python_values(values, integer=False)) for name, values in rates.items())
+    return metrics
+
+
+def populate_derived_metrics(apps, schema_editor):
+    Player = apps.get_model('api', 'Player')
+    PlayerTournamentStat = apps.get_model('api', 'PlayerTournamentStat')
+    PlayerCareerStat = apps.get_model('api', 'PlayerCareerStat')
+
+    stats = list(PlayerTournamentStat.objects.only('id', *COUNT_FIELDS))
+    if stats:
+        counts = {name: as_array([getattr(stat, name) for stat in stats]) for name in COUNT_FIELDS}
+        metrics = stat_metrics(counts)
+        for index, stat in enumerate(stats):
+            for name in STAT_DERIVED:
+                setattr(stat, name, metrics[name][index])
+        PlayerTournamentStat.objects.bulk_update(stats, STAT_DERIVED, batch_size=500)
+
+    totals = {
+        row['id']: row for row in Player.objects.annotate(
+            innings=Sum(Coalesce('playertournamentstat__innings', 'playertournamentstat__matches_played')),
+            balls_bowled=Sum('playertournamentstat__balls_bowled'),
+        ).values('id', 'innings', 'balls_bowled')
+    }
+    career_stats = list(PlayerCareerStat.objects.all())
+    if not career_stats:
+        return
+    column = lambda values: as_array(list(values))
+    innings = column(totals.get(c.player_id, {}).get('innings') for c in career_stats)
+    balls_bowled = column(totals.get(c.player_id, {}).get('balls_bowled') for c in career_stats)
+    rates = compute_rates(
+        column(c.total_runs for c in career_stats), innings,
+        column(c.total_not_outs for c in career_stats), column(c.total_balls_faced for c in career_stats),
+        column(c.total_runs_conceded for c in career_stats), column(c.total_wickets for c in career_stats),
+        balls_bowled,
+    )
+    derived = {name: python_values(values, integer=False) for name, values in rates.items()}
+    derived['total_overs'] = python_values(balls_to_overs(balls_bowled), integer=False)
+    derived['total_innings'] = python_values(innings, integer=True)
+    derived['total_balls_bowled'] = python_values(balls_bowled, integer=True)
+    for index, career in enumerate(career_stats):
+        for name, values in derived.items():
+            setattr(career, name, values[index])
+    PlayerCareerStat.objects.bulk_update(career_stats, list(derived), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_derived_metrics'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_derived_metrics, migrations.RunPython.noop),
+    ]
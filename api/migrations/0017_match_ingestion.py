@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_populate_derived_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='battingperformance',
+            name='batted',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='battingperformance',
+            name='fours',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='battingperformance',
+            name='not_out',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='battingperformance',
+            name='sixes',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='battingperformance',
+            name='team_name',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='bowlingperformance',
+            name='balls_bowled',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='bowlingperformance',
+            name='maidens',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='match_key',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='tournament',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='api.tournament'),
+        ),
+        migrations.AddIndex(
+            model_name='battingperformance',
+            index=models.Index(fields=['player', 'match'], name='batting_player_match_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bowlingperformance',
+            index=models.Index(fields=['player', 'match'], name='bowling_player_match_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='battingperformance',
+            constraint=models.UniqueConstraint(fields=('match', 'player'), name='unique_batting_match_player'),
+        ),
+        migrations.AddConstraint(
+            model_name='bowlingperformance',
+            constraint=models.UniqueConstraint(fields=('match', 'player'), name='unique_bowling_match_player'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:20
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def populate_teams(apps, schema_editor):
+    Team = apps.get_model('api', 'Team')
+    PlayerTournamentStat = apps.get_model('api', 'PlayerTournamentStat')
+    names = (
+        PlayerTournamentStat.objects.exclude(team_name__isnull=True).exclude(team_name='')
+        .values_list('team_name', flat=True).distinct()
+    )
+    Team.objects.bulk_create([Team(name=name) for name in sorted(set(names))], batch_size=500, ignore_conflicts=True)
+    PlayerTournamentStat.objects.update(
+        team=Subquery(Team.objects.filter(name=OuterRef('team_name')).values('id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_team'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_teams, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_populate_teams'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playertournamentstat',
+            name='from_matches',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:53
+
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+
+def mark_match_stats(apps, schema_editor):
+    # Until now a rollup overwrote any row of a pair with match performances, so those rows hold match values
+    PlayerTournamentStat = apps.get_model('api', 'PlayerTournamentStat')
+    BattingPerformance = apps.get_model('api', 'BattingPerformance')
+    PlayerTournamentStat.objects.filter(Exists(BattingPerformance.objects.filter(
+        player=OuterRef('player'), match__tournament=OuterRef('tournament')
+    ))).update(from_matches=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_stat_from_matches'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_match_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:58
+
+import api.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_populate_stat_from_matches'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='playertournamentstat',
+            name='stat_tournament_runs_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playertournamentstat',
+            name='stat_tournament_wickets_idx',
+        ),
+        migrations.AddIndex(
+            model_name='playertournamentstat',
+            index=api.models.NullsLowIndex(fields=['tournament', '-runs_scored'], name='stat_tournament_runs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playertournamentstat',
+            index=api.models.NullsLowIndex(fields=['tournament', '-wickets_taken'], name='stat_tournament_wickets_idx'),
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:11
+
+import api.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_stat_indexes_nulls_low'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_total_runs_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_total_matches_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_total_wickets_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_highest_score_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_total_not_outs_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_total_fours_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_total_sixes_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_total_maidens_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_batting_sr_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_bowling_avg_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_batting_avg_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_economy_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='playercareerstat',
+            name='career_bowling_sr_idx',
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-total_runs', 'player'], name='career_total_runs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-total_matches', 'player'], name='career_total_matches_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-total_wickets', 'player'], name='career_total_wickets_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-career_highest_score', 'player'], name='career_highest_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-total_not_outs', 'player'], name='career_total_not_outs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-total_fours', 'player'], name='career_total_fours_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-total_sixes', 'player'], name='career_total_sixes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-total_maidens', 'player'], name='career_total_maidens_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-batting_strike_rate', 'player'], name='career_batting_sr_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['bowling_average', 'player'], name='career_bowling_avg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['-batting_average', 'player'], name='career_batting_avg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['economy_rate', 'player'], name='career_economy_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playercareerstat',
+            index=api.models.NullsLowIndex(fields=['bowling_strike_rate', 'player'], name='career_bowling_sr_idx'),
+        ),
+    ]
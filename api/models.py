@@ -2,6 +2,24 @@
 
 from django.db import models
 
+class NullsLowIndex(models.Index):
+    """
+    An index whose nullable columns sort NULLs as their lowest value: first
+    ascending, last descending. SQLite only sorts that way; PostgreSQL sorts
+    NULLs highest, so it gets explicit NULLS FIRST/LAST to match the ORDER BY
+    of cursor pages (api/pagination.py) and rankings (api/career.py).
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        statement = super().create_sql(model, schema_editor, using=using, **kwargs)
+        if schema_editor.connection.vendor == 'postgresql':
+            columns = statement.parts['columns']
+            columns.col_suffixes = [
+                ('DESC NULLS LAST' if order == 'DESC' else 'NULLS FIRST') if model._meta.get_field(name).null else order
+                for name, order in self.fields_orders
+            ]
+        return statement
+
 class Player(models.Model):
     name = models.CharField(max_length=100)
     # 👇 ADDED/UPDATED THESE FIELDS FOR THE PLAYER PROFILE
@@ -9,6 +27,10 @@ class Player(models.Model):
     playing_role = models.CharField(max_length=50, blank=True, null=True)
     batting_style = models.CharField(max_length=50, blank=True, null=True)
     bowling_style = models.CharField(max_length=50, blank=True, null=True)
+    # Original upload; clients get the thumbnails instead (see api/photos.py)
+    photo = models.ImageField(upload_to='players/originals/', blank=True, null=True)
+    # Written by `manage.py generate_thumbnails`: {"source": photo name, "webp": [[width, name], ...], "jpeg": [...]}
+    photo_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return self.name
@@ -20,26 +42,40 @@ class Tournament(models.Model):
     def __str__(self):
         return f"{self.name} ({self.year})"
 
+class Team(models.Model):
+    """A team as named in the stats; linked to its stat rows by api.teams.link_teams."""
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
 class PlayerTournamentStat(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
     tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE)
     team_name = models.CharField(max_length=100, blank=True, null=True) # 👈 ADDED
+    # Set from team_name; the (team, tournament) index below serves team lookups
+    team = models.ForeignKey(Team, on_delete=models.SET_NULL, null=True, blank=True, editable=False, db_index=False)
 
     # Batting Stats
     matches_played = models.IntegerField(default=0, null=True, blank=True)
+    innings = models.IntegerField(null=True, blank=True)
     runs_scored = models.IntegerField(default=0, null=True, blank=True)
     balls_faced = models.IntegerField(default=0, null=True, blank=True)
     highest_score = models.IntegerField(default=0, null=True, blank=True)
+    # The highest score was not out ("37*" in the scorebook)
+    highest_score_not_out = models.BooleanField(default=False)
     not_outs = models.IntegerField(default=0, null=True, blank=True) # 👈 ADDED
     fours = models.IntegerField(default=0, null=True, blank=True) # 👈 ADDED
     sixes = models.IntegerField(default=0, null=True, blank=True) # 👈 ADDED
     fifties = models.IntegerField(default=0, null=True, blank=True) # 👈 ADDED
     hundreds = models.IntegerField(default=0, null=True, blank=True) # 👈 ADDED
+    # Averages and rates are recomputed from the counts after every import (api/metrics.py)
     batting_average = models.FloatField(null=True, blank=True)
     batting_strike_rate = models.FloatField(null=True, blank=True)
 
     # Bowling Stats
-    overs_bowled = models.FloatField(null=True, blank=True)
+    overs_bowled = models.FloatField(null=True, blank=True) # Cricket notation: 4.3 is 4 overs and 3 balls
+    balls_bowled = models.IntegerField(null=True, blank=True) # Derived from overs_bowled
     runs_conceded = models.IntegerField(default=0, null=True, blank=True)
     wickets_taken = models.IntegerField(default=0, null=True, blank=True)
     maidens = models.IntegerField(default=0, null=True, blank=True) # 👈 ADDED
@@ -48,9 +84,91 @@ class PlayerTournamentStat(models.Model):
     bowling_strike_rate = models.FloatField(null=True, blank=True)
     # We can add best_bowling_figures later if needed
 
+    # Hash of the imported values, lets incremental imports skip unchanged rows
+    row_hash = models.CharField(max_length=32, blank=True, default='')
+    # Rolled up from match scorecards (api/matches.py) rather than imported; rollups
+    # only ever overwrite or delete these, and an imported row for the pair replaces one
+    from_matches = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['player', 'tournament'], name='unique_player_tournament_stat'),
+        ]
+        # Per-tournament leaderboards and the /api/stats/ filters
+        indexes = [
+            NullsLowIndex(fields=['tournament', '-runs_scored'], name='stat_tournament_runs_idx'),
+            NullsLowIndex(fields=['tournament', '-wickets_taken'], name='stat_tournament_wickets_idx'),
+            models.Index(fields=['team_name', 'tournament'], name='stat_team_tournament_idx'),
+            # Team aggregates (api/teams.py)
+            models.Index(fields=['team', 'tournament'], name='stat_team_fk_tournament_idx'),
+        ]
+
     def __str__(self):
         return f"{self.player.name}'s stats for {self.tournament.name}"
 
+class PlayerCareerStat(models.Model):
+    """
+    Career totals per player, precomputed from PlayerTournamentStat.
+    Kept up to date by api.career.refresh_career_stats; never edit by hand.
+    """
+    player = models.OneToOneField(Player, on_delete=models.CASCADE, primary_key=True, related_name='career')
+    player_name = models.CharField(max_length=100)
+
+    # Batting
+    total_matches = models.IntegerField(null=True, blank=True)
+    total_runs = models.IntegerField(null=True, blank=True)
+    total_not_outs = models.IntegerField(null=True, blank=True)
+    total_fours = models.IntegerField(null=True, blank=True)
+    total_sixes = models.IntegerField(null=True, blank=True)
+    career_highest_score = models.IntegerField(null=True, blank=True)
+    total_balls_faced = models.IntegerField(null=True, blank=True)
+    total_innings = models.IntegerField(null=True, blank=True)
+    batting_average = models.FloatField(null=True, blank=True)
+    batting_strike_rate = models.FloatField(null=True, blank=True)
+
+    # Bowling
+    total_wickets = models.IntegerField(null=True, blank=True)
+    total_maidens = models.IntegerField(null=True, blank=True)
+    total_runs_conceded = models.IntegerField(null=True, blank=True)
+    total_balls_bowled = models.IntegerField(null=True, blank=True)
+    total_overs = models.FloatField(null=True, blank=True)
+    bowling_average = models.FloatField(null=True, blank=True)
+    economy_rate = models.FloatField(null=True, blank=True)
+    bowling_strike_rate = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        # One index per ranking sort key (api.career.RANKING_METRICS), so a
+        # top-K query reads K index entries instead of sorting the roster
+        indexes = [
+            NullsLowIndex(fields=['-total_runs', 'player'], name='career_total_runs_idx'),
+            NullsLowIndex(fields=['-total_matches', 'player'], name='career_total_matches_idx'),
+            NullsLowIndex(fields=['-total_wickets', 'player'], name='career_total_wickets_idx'),
+            NullsLowIndex(fields=['-career_highest_score', 'player'], name='career_highest_score_idx'),
+            NullsLowIndex(fields=['-total_not_outs', 'player'], name='career_total_not_outs_idx'),
+            NullsLowIndex(fields=['-total_fours', 'player'], name='career_total_fours_idx'),
+            NullsLowIndex(fields=['-total_sixes', 'player'], name='career_total_sixes_idx'),
+            NullsLowIndex(fields=['-total_maidens', 'player'], name='career_total_maidens_idx'),
+            NullsLowIndex(fields=['-batting_strike_rate', 'player'], name='career_batting_sr_idx'),
+            NullsLowIndex(fields=['bowling_average', 'player'], name='career_bowling_avg_idx'),
+            NullsLowIndex(fields=['-batting_average', 'player'], name='career_batting_avg_idx'),
+            NullsLowIndex(fields=['economy_rate', 'player'], name='career_economy_idx'),
+            NullsLowIndex(fields=['bowling_strike_rate', 'player'], name='career_bowling_sr_idx'),
+        ]
+
+    def __str__(self):
+        return f"Career stats for {self.player_name}"
+
+class DataVersion(models.Model):
+    """
+    Single-row counter bumped whenever stats or player data change.
+    The API response cache is keyed on it (see api/caching.py).
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_on = models.DateTimeField()
+
+    def __str__(self):
+        return f"Data version {self.version} ({self.updated_on})"
+
 # 👇 ADD THE NEW MODEL HERE
 class PlayerEditRequest(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
@@ -70,23 +188,91 @@ class PlayerEditRequest(models.Model):
         return f"Edit request for {self.player.name} ({self.status})"
 
 
-# We are no longer using these models, but it's safe to leave them for now
+class Notification(models.Model):
+    """
+    Outbox row for an email that still has to go out. Written in the same
+    transaction as the event it reports and sent later by the
+    `send_notifications` command (see api/notifications.py).
+    """
+    KIND_EDIT_REQUEST = 'edit_request'
+
+    kind = models.CharField(max_length=30, choices=[(KIND_EDIT_REQUEST, 'Player edit request')])
+    recipient = models.EmailField()
+    # What the email is about, e.g. {"edit_request": 3, "player": "Vinay"}
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=20,
+        default='pending',
+        choices=[
+            ('pending', 'Pending'),
+            ('sent', 'Sent'),
+            ('failed', 'Failed')
+        ]
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    # Not picked up before this time: retry backoff, or the lease of the worker sending it
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    sent_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='notification_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.recipient} ({self.status})"
+
+# Match-level scorecards, loaded by api.matches.MatchImporter and rolled up
+# into PlayerTournamentStat by api.matches.rollup_matches
 class Match(models.Model):
+    # The scorecard's own id, so loading a scorecard again replaces the match
+    match_key = models.CharField(max_length=100, unique=True, null=True, blank=True)
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, null=True, blank=True)
     date = models.DateField()
     venue = models.CharField(max_length=100)
     team1_name = models.CharField(max_length=100)
     team2_name = models.CharField(max_length=100)
     winner_name = models.CharField(max_length=100, blank=True)
 
+    def __str__(self):
+        return f"{self.team1_name} v {self.team2_name}, {self.date}"
+
 class BattingPerformance(models.Model):
+    """One player's batting in one match; every player of the XI has one, batted or not."""
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
     match = models.ForeignKey(Match, on_delete=models.CASCADE)
+    team_name = models.CharField(max_length=100, blank=True)
+    batted = models.BooleanField(default=True)
+    not_out = models.BooleanField(default=False)
     runs_scored = models.IntegerField(default=0)
     balls_faced = models.IntegerField(default=0)
+    fours = models.IntegerField(default=0)
+    sixes = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['match', 'player'], name='unique_batting_match_player'),
+        ]
+        indexes = [
+            # The rollup groups a player's performances
+            models.Index(fields=['player', 'match'], name='batting_player_match_idx'),
+        ]
 
 class BowlingPerformance(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
     match = models.ForeignKey(Match, on_delete=models.CASCADE)
-    overs_bowled = models.FloatField(default=0.0)
+    overs_bowled = models.FloatField(default=0.0) # Cricket notation: 4.3 is 4 overs and 3 balls
+    balls_bowled = models.IntegerField(default=0) # Derived from overs_bowled
     runs_conceded = models.IntegerField(default=0)
-    wickets_taken = models.IntegerField(default=0)
\ No newline at end of file
+    wickets_taken = models.IntegerField(default=0)
+    maidens = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['match', 'player'], name='unique_bowling_match_player'),
+        ]
+        indexes = [
+            models.Index(fields=['player', 'match'], name='bowling_player_match_idx'),
+        ]
@@ -0,0 +1,141 @@
+# In api/notifications.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import Notification
+
+# Retry after 1, 2, 4, ... minutes, at most an hour apart
+RETRY_BASE_DELAY = timedelta(minutes=1)
+RETRY_MAX_DELAY = timedelta(hours=1)
+MAX_ATTEMPTS = 6
+# How long a claimed row stays hidden from other workers while it is being sent
+SEND_LEASE = timedelta(minutes=5)
+
+
+def enqueue_edit_request(edit_request):
+    """
+    Queues the admin notification for a new PlayerEditRequest. Call it inside
+    the transaction that saves the request, so neither exists without the other.
+    """
+    now = timezone.now()
+    Notification.objects.bulk_create([
+        Notification(
+            kind=Notification.KIND_EDIT_REQUEST,
+            recipient=recipient,
+            payload={'edit_request': edit_request.pk, 'player': edit_request.player.name},
+            next_attempt_at=now,
+        )
+        for recipient in settings.NOTIFICATION_RECIPIENTS
+    ])
+
+def retry_delay(attempts):
+    """Backoff before the next try after `attempts` failed ones."""
+    return min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY)
+
+def build_message(kind, recipient, notifications):
+    """One email for every queued notification of `kind` to `recipient`."""
+    players = [notification.payload.get('player', '') for notification in notifications]
+    if len(notifications) == 1:
+        subject = 'New Player Edit Request'
+        body = (
+            f'A new edit request has been submitted for {players[0]}. '
+            f'Please review it in the Django admin panel.'
+        )
+    else:
+        subject = f'{len(notifications)} New Player Edit Requests'
+        lines = '\n'.join(f'  - {player}' for player in players)
+        body = (
+            f'{len(notifications)} new edit requests have been submitted:\n\n{lines}\n\n'
+            f'Please review them in the Django admin panel.'
+        )
+    return EmailMessage(subject, body, settings.NOTIFICATION_SENDER, [recipient])
+
+
+class OutboxWorker:
+    """
+    Sends due Notification rows, one digest email per (kind, recipient).
+
+    Each batch is claimed in a short transaction that pushes the rows'
+    `next_attempt_at` past a lease, so concurrent workers skip them and a
+    crashed worker's rows come back on their own. Emails then go out over one
+    backend connection; a failed email is retried with exponential backoff
+    and given up on after `max_attempts`.
+
+        worker = OutboxWorker(batch_size=100)
+        while worker.run_batch():
+            pass
+    """
+
+    def __init__(self, batch_size=100, max_attempts=MAX_ATTEMPTS, connection=None):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.connection = connection
+        self.emails_sent = 0
+        self.notifications_sent = 0
+        self.notifications_retried = 0
+        self.notifications_failed = 0
+
+    def claim(self, now):
+        with transaction.atomic():
+            due = (
+                Notification.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'id')[:self.batch_size]
+            )
+            claimed = list(due)
+            Notification.objects.filter(pk__in=[n.pk for n in claimed]).update(next_attempt_at=now + SEND_LEASE)
+        return claimed
+
+    def run_batch(self):
+        """Sends one batch; returns the number of notifications it handled."""
+        now = timezone.now()
+        claimed = self.claim(now)
+        if not claimed:
+            return 0
+
+        groups = {}
+        for notification in claimed:
+            groups.setdefault((notification.kind, notification.recipient), []).append(notification)
+
+        sent, failed = [], []
+        try:
+            connection = self.connection or get_connection(fail_silently=False)
+            with connection:
+                for (kind, recipient), notifications in groups.items():
+                    message = build_message(kind, recipient, notifications)
+                    message.connection = connection
+                    try:
+                        message.send()
+                    except Exception as e:
+                        failed.extend((notification, e) for notification in notifications)
+                    else:
+                        self.emails_sent += 1
+                        sent.extend(notifications)
+        except Exception as e:
+            # The server could not be reached or dropped the connection: retry whatever was not handled
+            handled = {notification.pk for notification in sent} | {notification.pk for notification, _ in failed}
+            failed.extend((notification, e) for notification in claimed if notification.pk not in handled)
+
+        finished = timezone.now()
+        for notification in sent:
+            notification.status = 'sent'
+            notification.sent_on = finished
+            notification.last_error = ''
+        for notification, error in failed:
+            notification.attempts += 1
+            notification.last_error = f'{type(error).__name__}: {error}'
+            if notification.attempts >= self.max_attempts:
+                notification.status = 'failed'
+                self.notifications_failed += 1
+            else:
+                notification.next_attempt_at = finished + retry_delay(notification.attempts)
+                self.notifications_retried += 1
+        Notification.objects.bulk_update(
+            claimed, ['status', 'sent_on', 'attempts', 'last_error', 'next_attempt_at']
+        )
+        self.notifications_sent += len(sent)
+        return len(claimed)
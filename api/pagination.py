@@ -0,0 +1,168 @@
+# In api/pagination.py
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F
+from rest_framework.pagination import CursorPagination
+
+# StatsCursorPagination.paginate_queryset mirrors CursorPagination's from this
+# DRF release, which has no hook for the position filter; a test fails on any other
+MIRRORED_DRF_VERSION = '3.18'
+
+
+def _reverse_ordering(ordering):
+    """('-runs_scored', 'id') -> ('runs_scored', '-id')"""
+    return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+
+class StatsCursorPagination(CursorPagination):
+    """
+    Default pagination for every list endpoint: ?cursor=... pages of
+    `page_size` rows, ?page_size=N up to `max_page_size`.
+
+    The ordering comes from the view's OrderingFilter when it has one, else
+    from the view's `ordering` attribute, else `pk`. The primary key is
+    always appended as a tie-breaker and a foreign key is ordered by its id
+    column. Stat columns are nullable: they are ordered on the raw column
+    with NULLs as the lowest value, matching the NullsLowIndex definitions
+    (api/models.py), and a NULL cursor position is encoded as `null_position`.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('pk',)
+
+    null_position = '\x00null'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # CursorPagination.paginate_queryset, but ordering nullable columns
+        # with explicit NULLS FIRST/LAST and filtering on NULL-aware positions
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*self._order_by(queryset.model, ordering))
+
+        nulls = None
+        if current_position is not None:
+            order = self.ordering[0]
+            # Test for: (cursor reversed) XOR (queryset reversed)
+            descending = self.cursor.reverse != order.startswith('-')
+            queryset, nulls = self._after_position(queryset, order.lstrip('-'), current_position, descending)
+
+        limit = self.page_size + 1
+        results = list(queryset[offset:offset + limit])
+        if nulls is not None and len(results) < limit:
+            # NULLs follow the smallest values. The offset skips one run of equal
+            # positions, which is among the values if there are any left
+            skip = 0 if results or not offset or queryset.exists() else offset
+            results += nulls[skip:skip + limit - len(results)]
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        else:
+            ordering = getattr(view, 'ordering', None)
+        ordering = ordering or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        ordering = tuple(ordering)
+
+        # A cursor position must be a plain value: order foreign keys by their id column
+        ordering = tuple(self._column_name(queryset.model, name) for name in ordering)
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(name.lstrip('-') in ('pk', 'id', pk_name) for name in ordering):
+            ordering += (pk_name,)
+        return ordering
+
+    def _get_position_from_instance(self, instance, ordering):
+        field_name = ordering[0].lstrip('-')
+        attr = instance[field_name] if isinstance(instance, dict) else getattr(instance, field_name)
+        return self.null_position if attr is None else str(attr)
+
+    def _order_by(self, model, ordering):
+        """`ordering` as order_by() arguments that sort NULLs lowest: first ascending, last descending."""
+        order_by = []
+        for name in ordering:
+            field = self._model_field(model, name.lstrip('-'))
+            if field is None or not field.null:
+                order_by.append(name)
+            elif name.startswith('-'):
+                order_by.append(F(name[1:]).desc(nulls_last=True))
+            else:
+                order_by.append(F(name).asc(nulls_first=True))
+        return order_by
+
+    def _after_position(self, queryset, attr, position, descending):
+        """
+        (rows past `position`, NULL rows that follow them or None) in the
+        queryset's order. The NULLs of a descending column are fetched apart so
+        the first part stays a plain range over the index.
+        """
+        if position == self.null_position:
+            if descending:
+                return queryset.none(), None
+            return queryset.filter(**{f'{attr}__isnull': False}), None
+        lookup = 'lt' if descending else 'gt'
+        rows = queryset.filter(**{f'{attr}__{lookup}': position})
+        field = self._model_field(queryset.model, attr)
+        if descending and field is not None and field.null:
+            return rows, queryset.filter(**{f'{attr}__isnull': True})
+        return rows, None
+
+    @classmethod
+    def _column_name(cls, model, name):
+        field = cls._model_field(model, name.lstrip('-'))
+        if field is None or not field.many_to_one or name.lstrip('-') != field.name:
+            return name
+        return name.replace(field.name, field.attname)
+
+    @staticmethod
+    def _model_field(model, name):
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
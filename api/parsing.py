@@ -0,0 +1,162 @@
+# In api/parsing.py
+
+# Conversion helpers shared by the importers. This module deliberately has no
+# Django imports so it can be loaded inside parser worker processes.
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+# Columns of master_stats.csv that map 1:1 onto PlayerTournamentStat fields
+STAT_INT_FIELDS = [
+    'matches_played', 'innings', 'runs_scored', 'balls_faced', 'highest_score', 'not_outs',
+    'fours', 'sixes', 'fifties', 'hundreds', 'runs_conceded', 'wickets_taken', 'maidens',
+]
+STAT_FLOAT_FIELDS = [
+    'batting_average', 'batting_strike_rate', 'overs_bowled',
+    'bowling_average', 'economy_rate', 'bowling_strike_rate',
+]
+# Set when highest_score was written with a not-out marker, e.g. "37*"
+NOT_OUT_FIELD = 'highest_score_not_out'
+# Every imported value of a stat row, i.e. what an upsert has to overwrite
+STAT_VALUE_FIELDS = ['team_name'] + STAT_INT_FIELDS + STAT_FLOAT_FIELDS + [NOT_OUT_FIELD]
+
+
+def to_int(value):
+    """Helper function to safely convert a value to an integer, returning None on failure."""
+    try:
+        # Handle cases where value might be None or empty string
+        if value is None or value == '':
+            return None
+        return int(float(value))
+    except (ValueError, TypeError):
+        return None
+
+def to_float(value):
+    """Helper function to safely convert a value to a float, returning None on failure."""
+    try:
+        if value is None or value == '':
+            return None
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+def to_score(value):
+    """(score, not out) for a highest score like 37, "37" or "37*"; the score is None on failure."""
+    text = value.strip() if isinstance(value, str) else value
+    if isinstance(text, str) and text.endswith('*'):
+        score = to_int(text[:-1].strip())
+        return score, score is not None
+    return to_int(text), False
+
+def content_hash(fields):
+    """Stable hash of converted stat values, so "5" and "5.0" hash the same."""
+    payload = json.dumps([fields[name] for name in STAT_VALUE_FIELDS])
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def stat_fields_from_row(row):
+    """Converts one CSV row into keyword arguments for PlayerTournamentStat."""
+    fields = {'team_name': row.get('team_name')}
+    for name in STAT_INT_FIELDS:
+        fields[name] = to_int(row.get(name))
+    for name in STAT_FLOAT_FIELDS:
+        fields[name] = to_float(row.get(name))
+    fields['highest_score'], fields[NOT_OUT_FIELD] = to_score(row.get('highest_score'))
+    fields['row_hash'] = content_hash(fields)
+    return fields
+
+def record_from_row(row):
+    """Converts one CSV row into an import record (see `parse_chunk`)."""
+    name = row.get('player_name')
+    return {
+        'player_name': name.strip() if name else None,
+        'tournament_id': to_int(row.get('tournament_id')),
+        'batting_style': row.get('batting_style'),
+        'bowling_style': row.get('bowling_style'),
+        'stats': stat_fields_from_row(row),
+    }
+
+
+# --- Vectorized parsing for the streaming importer ---
+
+def _stripped(series):
+    """`series` as objects with surrounding whitespace removed from its strings; other cells untouched."""
+    # Not .str: a chunk of an object column may hold no strings at all, e.g. only numbers from a workbook
+    return series.astype(object).map(lambda value: value.strip() if isinstance(value, str) else value)
+
+def _to_numbers(series):
+    """Float array of `series` with the same rules as to_int/to_float; NaN where those give None."""
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    return pd.to_numeric(_stripped(series), errors='coerce').to_numpy(dtype=float)
+
+def python_values(values, integer):
+    """A float array as a list of ints or floats, with None for NaN."""
+    missing = np.isnan(values)
+    if integer:
+        converted = np.trunc(np.where(missing, 0, values)).astype(np.int64).tolist()
+    else:
+        converted = values.tolist()
+    for index in np.flatnonzero(missing).tolist():
+        converted[index] = None
+    return converted
+
+def _numeric_column(frame, name, integer):
+    """Converts a column with the same rules as to_int/to_float, as a list of Python values."""
+    if name not in frame.columns:
+        return [None] * len(frame)
+    return python_values(_to_numbers(frame[name]), integer)
+
+def _score_columns(frame):
+    """(highest scores, not-out flags) with the same rules as to_score."""
+    if 'highest_score' not in frame.columns:
+        return [None] * len(frame), [False] * len(frame)
+    text = _stripped(frame['highest_score'])
+    marked = text.map(lambda value: isinstance(value, str) and value.endswith('*')).astype(bool)
+    values = _to_numbers(text.where(~marked, text.map(lambda value: value[:-1] if isinstance(value, str) else value)))
+    not_out = (marked.to_numpy() & ~np.isnan(values)).tolist()
+    return python_values(values, integer=True), not_out
+
+def _text_column(frame, name):
+    if name not in frame.columns:
+        return [None] * len(frame)
+    column = frame[name]
+    return column.astype(object).where(column.notna(), None).tolist()
+
+def parse_chunk(frame):
+    """
+    Converts a chunk of raw CSV text (read with dtype=str, keep_default_na=False)
+    or a typed frame (see process_excel.build_master_frame) into import
+    records. Numeric columns are converted a whole column at a time.
+
+    Returns a list of {'player_name', 'tournament_id', 'batting_style',
+    'bowling_style', 'stats'} dicts in file order.
+    """
+    names = [
+        name.strip() or None if isinstance(name, str) else None for name in _text_column(frame, 'player_name')
+    ]
+    tournament_ids = _numeric_column(frame, 'tournament_id', integer=True)
+    batting_styles = _text_column(frame, 'batting_style')
+    bowling_styles = _text_column(frame, 'bowling_style')
+
+    columns = {'team_name': _text_column(frame, 'team_name')}
+    for name in STAT_INT_FIELDS:
+        columns[name] = _numeric_column(frame, name, integer=True)
+    for name in STAT_FLOAT_FIELDS:
+        columns[name] = _numeric_column(frame, name, integer=False)
+    columns['highest_score'], columns[NOT_OUT_FIELD] = _score_columns(frame)
+
+    records = []
+    for index in range(len(frame)):
+        stats = {name: values[index] for name, values in columns.items()}
+        stats['row_hash'] = content_hash(stats)
+        records.append({
+            'player_name': names[index],
+            'tournament_id': tournament_ids[index],
+            'batting_style': batting_styles[index],
+            'bowling_style': bowling_styles[index],
+            'stats': stats,
+        })
+    return records
@@ -0,0 +1,152 @@
+# In api/photos.py
+
+"""
+Player photo thumbnails.
+
+Originals uploaded to Player.photo are phone photos and screenshots of
+several MB, so profile pages never get them. `manage.py generate_thumbnails`
+renders each new original at THUMBNAIL_WIDTHS in WebP and JPEG and stores
+the files under content-hashed names in THUMBNAIL_DIR, recorded on the
+player:
+
+    photo_thumbnails = {"source": "players/originals/a.jpeg",
+                        "webp": [[96, "players/thumbs/3f9c...-96.webp"], ...],
+                        "jpeg": [[96, "players/thumbs/81ab...-96.jpeg"], ...]}
+
+A changed image always gets a new file name, so `serve_thumbnail` sends
+thumbnails with a one-year immutable Cache-Control, and PlayerSerializer
+exposes them as srcset strings (`photo_sources`).
+"""
+
+import hashlib
+import io
+import posixpath
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+from PIL import Image, ImageOps
+from .caching import bump_data_version
+from .models import Player
+
+THUMBNAIL_DIR = 'players/thumbs'
+THUMBNAIL_WIDTHS = [96, 240, 480]
+# Width of the plain `src`, for clients that ignore srcset
+DEFAULT_WIDTH = 240
+# (key in photo_thumbnails, MIME type, Pillow format, save options)
+THUMBNAIL_FORMATS = [
+    ('webp', 'image/webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpeg', 'image/jpeg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+]
+# Content-hashed names never change content, so caches may keep them for good
+THUMBNAIL_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def render_thumbnails(source):
+    """
+    {format key: [(width, bytes), ...]} for the image in `source` (a path or
+    file object), scaled to each of THUMBNAIL_WIDTHS but never enlarged.
+    """
+    with Image.open(source) as original:
+        # Phone photos are stored sideways with an EXIF rotation flag
+        image = ImageOps.exif_transpose(original)
+        if image.mode != 'RGB':
+            # Screenshots can be RGBA or palette images; JPEG has no alpha, so flatten onto white
+            rgba = image.convert('RGBA')
+            image = Image.new('RGB', rgba.size, 'white')
+            image.paste(rgba, mask=rgba.getchannel('A'))
+
+        sizes = []
+        for width in THUMBNAIL_WIDTHS:
+            scaled = image.copy()
+            scaled.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+            if sizes and scaled.width == sizes[-1].width:
+                break  # the original is narrower than the remaining widths
+            sizes.append(scaled)
+
+    rendered = {}
+    for key, _, pillow_format, options in THUMBNAIL_FORMATS:
+        rendered[key] = []
+        for scaled in sizes:
+            buffer = io.BytesIO()
+            scaled.save(buffer, pillow_format, **options)
+            rendered[key].append((scaled.width, buffer.getvalue()))
+    return rendered
+
+def thumbnail_name(data, width, key):
+    digest = hashlib.blake2b(data, digest_size=10).hexdigest()
+    return posixpath.join(THUMBNAIL_DIR, f"{digest}-{width}.{key}")
+
+def generate_thumbnails(player, storage=default_storage):
+    """Renders and stores the thumbnails of `player.photo` and returns the photo_thumbnails value."""
+    with player.photo.open('rb') as source:
+        rendered = render_thumbnails(source)
+    thumbnails = {'source': player.photo.name}
+    for key, sizes in rendered.items():
+        thumbnails[key] = []
+        for width, data in sizes:
+            name = thumbnail_name(data, width, key)
+            # Same name, same bytes: an earlier run already stored it
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(data))
+            thumbnails[key].append([width, name])
+    return thumbnails
+
+def pending_players():
+    """Players whose photo has no thumbnails yet, or thumbnails of an earlier photo."""
+    players = Player.objects.exclude(photo='').exclude(photo__isnull=True).only('id', 'photo', 'photo_thumbnails')
+    return [player for player in players if player.photo_thumbnails.get('source') != player.photo.name]
+
+def generate_pending_thumbnails(limit=None):
+    """
+    Generates thumbnails for up to `limit` pending players; returns
+    (generated, failed). An unreadable image is recorded with its error and
+    not retried until the photo changes.
+    """
+    generated = failed = 0
+    for player in pending_players()[:limit]:
+        try:
+            player.photo_thumbnails = generate_thumbnails(player)
+            generated += 1
+        except (OSError, Image.DecompressionBombError) as e:
+            player.photo_thumbnails = {'source': player.photo.name, 'error': str(e)}
+            failed += 1
+        player.save(update_fields=['photo_thumbnails'])
+    if generated:
+        # Cached profiles have to pick up the new srcset
+        bump_data_version()
+    return generated, failed
+
+
+def photo_sources(photo_name, thumbnails, build_url=lambda url: url):
+    """
+    The API form of `photo_thumbnails` for the photo stored as `photo_name`,
+    or None when there is no photo or its thumbnails are not generated yet
+    (thumbnails of a cleared or replaced photo are never served):
+
+        {"src": <JPEG at DEFAULT_WIDTH>,
+         "srcset": {"image/webp": "<url> 96w, <url> 240w, ...", "image/jpeg": "..."}}
+
+    for a <picture> with one <source type=...> per entry. `build_url` makes
+    the storage URLs absolute.
+    """
+    if not photo_name or thumbnails.get('source') != photo_name or not thumbnails.get('jpeg'):
+        return None
+    url = lambda name: build_url(default_storage.url(name))
+    srcset = {
+        media_type: ', '.join(f"{url(name)} {width}w" for width, name in thumbnails[key])
+        for key, media_type, _, _ in THUMBNAIL_FORMATS if thumbnails.get(key)
+    }
+    # The widest JPEG not above DEFAULT_WIDTH, or the narrowest there is
+    fitting = [(width, name) for width, name in thumbnails['jpeg'] if width <= DEFAULT_WIDTH]
+    _, src = fitting[-1] if fitting else thumbnails['jpeg'][0]
+    return {'src': url(src), 'srcset': srcset}
+
+def serve_thumbnail(request, path):
+    """Serves a file of THUMBNAIL_DIR from MEDIA_ROOT, cacheable for a year."""
+    response = serve(request, path, document_root=Path(settings.MEDIA_ROOT) / THUMBNAIL_DIR)
+    patch_cache_control(response, public=True, max_age=THUMBNAIL_MAX_AGE, immutable=True)
+    return response
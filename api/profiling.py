@@ -0,0 +1,204 @@
+# In api/profiling.py
+
+"""
+Opt-in per-request profiling. Off unless PROFILING=True in the environment.
+
+ProfilingMiddleware measures every request:
+
+- total: wall time spent in Django, middleware included;
+- db: time in SQL statements and their number (api.instrumentation.QueryRecorder),
+  with identical statements run twice counted as duplicates;
+- render: DRF renderer time (serializer output to JSON, HTML, ...), also
+  when api.caching renders a response itself to cache it
+  (api.instrumentation.timed_render);
+- app: the rest, i.e. view code, serializers building their data and middleware.
+
+It reports them on the response as a Server-Timing header, which browser dev
+tools show in the network panel:
+
+    Server-Timing: total;dur=41.2, db;dur=12.8;desc="9 queries, 0 duplicates", render;dur=3.1, app;dur=25.3
+
+and keeps the last PROFILING_BUFFER_SIZE samples of each route in memory.
+GET /api/profiling/ (admins only) returns p50/p95/p99 of each route.
+
+A statement run PROFILING_REPEAT_THRESHOLD times or more in one request is
+logged to the 'api.profiling' logger as a likely N+1 query. A share of
+PROFILING_SAMPLE_RATE requests runs under cProfile and is dumped to
+PROFILING_DIR as a .prof file for `python -m pstats` or snakeviz. Only one
+request is profiled at a time; a sampled request that finds the profiler busy
+(or another profiling tool active) just runs unprofiled.
+
+Streaming responses (CSV, Arrow, the fast JSON lists) produce their body
+after the middleware returns, so only the time to the first byte is measured
+for them. Queries run in other threads, e.g. by async views, are not seen.
+"""
+
+import cProfile
+import logging
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from .instrumentation import QueryRecorder
+
+logger = logging.getLogger('api.profiling')
+
+PERCENTILES = [50, 95, 99]
+# Per-request measures kept in the ring buffer, in milliseconds except queries
+SAMPLE_FIELDS = ['total_ms', 'db_ms', 'render_ms', 'app_ms', 'queries', 'duplicates']
+
+
+class RouteStats:
+    """Thread-safe ring buffer of the last `size` samples of each route."""
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=self.size))
+        self.counts = defaultdict(int)
+
+    def record(self, route, sample):
+        with self.lock:
+            self.samples[route].append(sample)
+            self.counts[route] += 1
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+
+    def summary(self):
+        """{route: {'requests', 'sampled', field: {'p50', 'p95', 'p99', 'max'}}}, slowest p95 first."""
+        with self.lock:
+            snapshot = {route: (self.counts[route], list(samples)) for route, samples in self.samples.items()}
+        summary = {}
+        for route, (requests, samples) in snapshot.items():
+            values = np.array([[sample[field] for field in SAMPLE_FIELDS] for sample in samples], dtype=float)
+            quantiles = np.percentile(values, PERCENTILES, axis=0)
+            summary[route] = {'requests': requests, 'sampled': len(samples)}
+            for index, field in enumerate(SAMPLE_FIELDS):
+                summary[route][field] = {
+                    **{f"p{p}": round(float(quantiles[i, index]), 2) for i, p in enumerate(PERCENTILES)},
+                    'max': round(float(values[:, index].max()), 2),
+                }
+        return dict(sorted(summary.items(), key=lambda item: -item[1]['total_ms']['p95']))
+
+route_stats = RouteStats(settings.PROFILING_BUFFER_SIZE)
+
+# cProfile cannot run two profilers at once, so concurrent requests take turns
+profiler_lock = threading.Lock()
+
+
+def route_name(request):
+    """'GET player-detail' for the URL pattern a request resolved to."""
+    match = getattr(request, 'resolver_match', None)
+    name = (match.view_name or match.route) if match is not None else 'unresolved'
+    return f"{request.method} {name}"
+
+def server_timing(sample):
+    return (
+        f"total;dur={sample['total_ms']:.1f}, "
+        f"db;dur={sample['db_ms']:.1f};desc=\"{sample['queries']} queries, {sample['duplicates']} duplicates\", "
+        f"render;dur={sample['render_ms']:.1f}, app;dur={sample['app_ms']:.1f}"
+    )
+
+
+class ProfilingMiddleware:
+    """See the module docstring. Put it first in MIDDLEWARE so it times the others too."""
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.render_duration = 0.0
+        started = time.perf_counter()
+        with QueryRecorder() as queries:
+            profiler = self.start_profiler() if random.random() < settings.PROFILING_SAMPLE_RATE else None
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                    profiler_lock.release()
+        total = time.perf_counter() - started
+
+        route = route_name(request)
+        sample = {
+            'total_ms': total * 1000,
+            'db_ms': queries.duration * 1000,
+            'render_ms': request.render_duration * 1000,
+            'app_ms': max(total - queries.duration - request.render_duration, 0) * 1000,
+            'queries': queries.count,
+            'duplicates': queries.duplicates,
+        }
+        route_stats.record(route, sample)
+        response['Server-Timing'] = server_timing(sample)
+
+        for sql, count in queries.repeated(settings.PROFILING_REPEAT_THRESHOLD):
+            logger.warning("Possible N+1 query: %s ran %d times in %s: %s", route, count, request.path, sql)
+        logger.debug("%s %s: %s", route, request.path, response['Server-Timing'])
+        if profiler is not None:
+            self.dump(profiler, route)
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before a DRF Response is rendered
+        render_started = time.perf_counter()
+
+        def rendered(response):
+            request.render_duration += time.perf_counter() - render_started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def start_profiler():
+        """An enabled cProfile.Profile holding `profiler_lock`, or None when profiling is busy."""
+        if not profiler_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiling tool is active, e.g. a debugger or a profiler run outside Django
+            profiler_lock.release()
+            return None
+        return profiler
+
+    @staticmethod
+    def dump(profiler, route):
+        directory = Path(settings.PROFILING_DIR)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', route).strip('-')
+        path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{time.perf_counter_ns() % 10**6:06d}-{slug}.prof"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(path)
+        except OSError:
+            logger.exception("Could not write the profile of %s to %s", route, path)
+            return
+        logger.info("Profiled %s to %s", route, path)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def profiling_stats(request):
+    """Per-route percentiles of the buffered samples; DELETE empties the buffer."""
+    if request.method == 'DELETE':
+        route_stats.clear()
+        return Response(status=204)
+    return Response({
+        'enabled': settings.PROFILING,
+        'buffer_size': route_stats.size,
+        'routes': route_stats.summary(),
+    })
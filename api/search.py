@@ -0,0 +1,193 @@
+# In api/search.py
+
+"""
+Player name search: prefix and fuzzy (trigram) matching with ranking.
+
+Names are compared the way PostgreSQL's pg_trgm does: lowercased, split
+into alphanumeric words, each word padded as "  word " and cut into
+three-character grams. The similarity of two names is shared grams over
+all grams of either.
+
+On PostgreSQL the search runs in the database and is served by the
+player_name_trgm_idx GIN index (migration 0013). Elsewhere it runs on a
+TrigramIndex held in process memory and rebuilt when the data version
+changes. The bulk importers use a TrigramIndex directly to match
+near-duplicate names without a query per row.
+"""
+
+import re
+from collections import Counter, defaultdict
+
+from django.db import connection
+from django.db.models import Case, F, FloatField, Func, IntegerField, Lookup, Q, Value, When
+from django.db.models.functions import Upper
+from .caching import current_data_version
+from .models import Player
+
+# pg_trgm's default similarity_threshold, the cutoff of its % operator
+SIMILARITY_THRESHOLD = 0.3
+# Default cutoff for matching an imported name to an existing player: case,
+# spacing and punctuation variants and one-letter slips in longer names
+NAME_MATCH_THRESHOLD = 0.8
+# Match kinds, best first
+MATCH_KINDS = ['prefix', 'word_prefix', 'fuzzy']
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+def words(name):
+    return _WORD.findall(name.lower())
+
+def normalize_name(name):
+    """Lowercase words joined by single spaces: '  rahul  SHARMA.' -> 'rahul sharma'."""
+    return ' '.join(words(name))
+
+def trigrams(name):
+    """The pg_trgm grams of `name`."""
+    grams = set()
+    for word in words(name):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+def similarity(a, b):
+    """pg_trgm's similarity() of two names, between 0 and 1."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+def match_kind(name, query):
+    """'prefix', 'word_prefix' or None for how `name` starts with the normalized `query`."""
+    normalized = normalize_name(name)
+    if normalized.startswith(query):
+        return 'prefix'
+    if f" {query}" in f" {normalized}":
+        return 'word_prefix'
+    return None
+
+
+class TrigramIndex:
+    """
+    In-memory inverted index from trigram to names.
+
+        index = TrigramIndex([(1, 'Rahul Sharma'), (2, 'Vinay Kumar')])
+        index.search('rahul shar')          # [{'id': 1, 'name': 'Rahul Sharma', 'score': ..., 'match': 'prefix'}]
+        index.best_match('Rahul  Sharmaa')  # (1, 'Rahul Sharma', 0.8)
+
+    A query only scores the names that share a trigram with it.
+    """
+
+    def __init__(self, entries=()):
+        self.names = {}
+        self.grams = {}
+        self.postings = defaultdict(set)
+        for key, name in entries:
+            self.add(key, name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, key, name):
+        self.names[key] = name
+        self.grams[key] = trigrams(name)
+        for gram in self.grams[key]:
+            self.postings[gram].add(key)
+
+    def _scores(self, name):
+        """{key: similarity} for every indexed name sharing a trigram with `name`."""
+        grams = trigrams(name)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        return {
+            key: count / (len(grams) + len(self.grams[key]) - count)
+            for key, count in shared.items()
+        }
+
+    def search(self, query, limit=10, threshold=SIMILARITY_THRESHOLD):
+        """
+        Names starting with `query`, then names with a word starting with it,
+        then names at least `threshold` similar to it; each group by
+        similarity, then name.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        scores = self._scores(normalized)
+        # Every name with a word starting with the query has the query's first gram
+        candidates = set(scores) | self.postings.get(f"  {normalized[0]}", set())
+        results = []
+        for key in candidates:
+            kind = match_kind(self.names[key], normalized)
+            score = scores.get(key, 0.0)
+            if kind is None and score >= threshold:
+                kind = 'fuzzy'
+            if kind is not None:
+                results.append({'id': key, 'name': self.names[key], 'score': score, 'match': kind})
+        results.sort(key=lambda r: (MATCH_KINDS.index(r['match']), -r['score'], r['name'], r['id']))
+        return results[:limit]
+
+    def best_match(self, name, threshold):
+        """(key, name, similarity) of the most similar indexed name, if at least `threshold`; else None."""
+        scores = self._scores(name)
+        if not scores:
+            return None
+        key = min(scores, key=lambda k: (-scores[k], self.names[k], k))
+        if scores[key] < threshold:
+            return None
+        return key, self.names[key], scores[key]
+
+
+_player_index = (None, None)
+
+def player_index():
+    """TrigramIndex of every player's name, rebuilt when the data version changes."""
+    global _player_index
+    version = current_data_version()
+    if _player_index[0] != version:
+        _player_index = (version, TrigramIndex(Player.objects.values_list('id', 'name')))
+    return _player_index[1]
+
+
+class TrigramSimilar(Lookup):
+    """pg_trgm's `%` operator, which the trigram GIN index serves."""
+    lookup_name = 'trigram_similar'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} %% {rhs}", lhs_params + rhs_params
+
+def _search_postgres(query, limit, threshold):
+    # The index is on UPPER(name), which is also what istartswith/icontains compare
+    target = Upper(Value(query))
+    rows = (
+        Player.objects
+        .annotate(
+            score=Func(Upper('name'), target, function='similarity', output_field=FloatField()),
+            kind=Case(
+                When(name__istartswith=query, then=Value(0)),
+                When(name__icontains=f" {query}", then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            ),
+        )
+        .filter(
+            Q(name__istartswith=query) | Q(name__icontains=f" {query}")
+            | Q(TrigramSimilar(Upper('name'), target), score__gte=threshold)
+        )
+        .order_by('kind', F('score').desc(), 'name', 'id')
+        .values('id', 'name', 'score', 'kind')[:limit]
+    )
+    return [
+        {'id': row['id'], 'name': row['name'], 'score': row['score'], 'match': MATCH_KINDS[row['kind']]}
+        for row in rows
+    ]
+
+def search_players(query, limit=10, threshold=SIMILARITY_THRESHOLD):
+    """Ranked [{'id', 'name', 'score', 'match'}] of players matching `query` (see TrigramIndex.search)."""
+    if connection.vendor == 'postgresql':
+        return _search_postgres(normalize_name(query), limit, threshold)
+    return player_index().search(query, limit, threshold)
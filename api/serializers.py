@@ -1,20 +1,50 @@
 # In api/serializers.py
 
 from rest_framework import serializers
-from .models import Player, PlayerTournamentStat, Tournament, PlayerEditRequest
+from .models import Player, PlayerTournamentStat, Team, Tournament, PlayerEditRequest, PlayerCareerStat
+from .photos import photo_sources
+
+class SparseFieldsetMixin:
+    """
+    Lets clients ask for a subset of fields with ?fields=id,name.
+    Only applies to the top-level serializer of a response, never to nested ones.
+    """
+
+    @staticmethod
+    def requested_fields(request):
+        """The set of names in ?fields=, or None when the parameter is absent."""
+        if request is None or not request.query_params.get('fields'):
+            return None
+        return {name.strip() for name in request.query_params['fields'].split(',') if name.strip()}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        is_top_level = parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+        requested = self.requested_fields(self.context.get('request')) if is_top_level else None
+        if requested:
+            for name in list(fields):
+                if name not in requested:
+                    fields.pop(name)
+        return fields
 
 class TournamentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tournament
         fields = ['id', 'name']
 
+class TeamSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Team
+        fields = ['id', 'name']
+
 # --- Nested Serializers for Cleanliness ---
 
 class BattingStatsSerializer(serializers.ModelSerializer):
     class Meta:
         model = PlayerTournamentStat
         fields = [
-            'matches_played', 'runs_scored', 'balls_faced', 'highest_score', 'not_outs',
+            'matches_played', 'innings', 'runs_scored', 'balls_faced', 'highest_score', 'highest_score_not_out', 'not_outs',
             'fours', 'sixes', 'fifties', 'hundreds', 'batting_average', 'batting_strike_rate'
         ]
 
@@ -22,13 +52,13 @@ class BowlingStatsSerializer(serializers.ModelSerializer):
     class Meta:
         model = PlayerTournamentStat
         fields = [
-            'overs_bowled', 'runs_conceded', 'wickets_taken', 'maidens',
+            'overs_bowled', 'balls_bowled', 'runs_conceded', 'wickets_taken', 'maidens',
             'bowling_average', 'economy_rate', 'bowling_strike_rate'
         ]
 
 # --- Main Serializer for Player Detail Page ---
 
-class PlayerTournamentStatSerializer(serializers.ModelSerializer):
+class PlayerTournamentStatSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     tournament_name = serializers.CharField(source='tournament.name', read_only=True)
     team_name = serializers.CharField()
     batting = BattingStatsSerializer(source='*') # Use the nested serializer
@@ -39,14 +69,20 @@ class PlayerTournamentStatSerializer(serializers.ModelSerializer):
         model = PlayerTournamentStat
         fields = ['player_name', 'tournament_name', 'team_name', 'batting', 'bowling']
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # This nests all of a player's stats directly into the player's API response
     stats = PlayerTournamentStatSerializer(many=True, read_only=True, source='playertournamentstat_set')
+    # Thumbnail URLs and srcsets, never the original upload (see api/photos.py)
+    photo = serializers.SerializerMethodField()
 
     class Meta:
         model = Player
         # 👇 ADDED batting_style and bowling_style
-        fields = ['id', 'name', 'playing_role', 'batting_style', 'bowling_style', 'stats']
+        fields = ['id', 'name', 'playing_role', 'batting_style', 'bowling_style', 'photo', 'stats']
+
+    def get_photo(self, player):
+        request = self.context.get('request')
+        return photo_sources(player.photo.name, player.photo_thumbnails, request.build_absolute_uri if request else str)
 
 
 # --- Serializer for the Career Leaderboards ---
@@ -55,26 +91,28 @@ class CareerStatsSerializer(serializers.ModelSerializer):
     """
     Serializer for aggregating player stats across all tournaments.
     """
-    # Batting
-    total_matches = serializers.IntegerField()
-    total_runs = serializers.IntegerField()
-    total_not_outs = serializers.IntegerField()
-    total_fours = serializers.IntegerField()
-    total_sixes = serializers.IntegerField()
-    career_highest_score = serializers.IntegerField()
-
-    # Bowling
-    total_wickets = serializers.IntegerField()
-    total_maidens = serializers.IntegerField()
+    name = serializers.CharField(source='player_name', read_only=True)
 
     class Meta:
-        model = Player
+        model = PlayerCareerStat
         fields = [
             'name', 'total_matches', 'total_runs', 'total_wickets',
             'career_highest_score', 'total_not_outs', 'total_fours',
-            'total_sixes', 'total_maidens'
+            'total_sixes', 'total_maidens', 'total_innings', 'batting_average',
+            'batting_strike_rate', 'total_overs', 'economy_rate', 'bowling_average',
+            'bowling_strike_rate'
         ]
 
+class RankedCareerStatsSerializer(CareerStatsSerializer):
+    """
+    Career stats plus the player's dense rank for the requested metric.
+    """
+    rank = serializers.IntegerField(read_only=True)
+    player_id = serializers.IntegerField(read_only=True)
+
+    class Meta(CareerStatsSerializer.Meta):
+        fields = ['rank', 'player_id'] + CareerStatsSerializer.Meta.fields
+
 # 🚨 New serializer for PlayerEditRequest
 class PlayerEditRequestSerializer(serializers.ModelSerializer):
     class Meta:
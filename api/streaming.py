@@ -0,0 +1,101 @@
+# In api/streaming.py
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .parsing import parse_chunk
+
+_DONE = object()
+
+
+def read_csv_chunks(csv_file_path, chunk_size):
+    """Yields the CSV as DataFrames of at most `chunk_size` rows, every cell kept as text."""
+    return pd.read_csv(
+        csv_file_path, dtype=str, keep_default_na=False, chunksize=chunk_size, encoding='utf-8'
+    )
+
+
+class ChunkPipeline:
+    """
+    Streams parsed import records out of a CSV file with bounded memory.
+
+    A background thread reads fixed-size chunks and parses them, either inline
+    or on a pool of `workers` processes, and hands them to the consumer through
+    a queue of at most `queue_size` chunks. When the DB writer falls behind the
+    reader blocks, so peak memory depends on the chunk size, not the file size.
+    Chunks are delivered in file order.
+
+        for records in ChunkPipeline('master_stats.csv', chunk_size=5000, workers=4):
+            ...
+    """
+
+    def __init__(self, csv_file_path, chunk_size=5000, workers=1, queue_size=2):
+        self.csv_file_path = csv_file_path
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stopped = threading.Event()
+
+    def __iter__(self):
+        # Opening the file here surfaces FileNotFoundError to the caller
+        chunks = read_csv_chunks(self.csv_file_path, self.chunk_size)
+        producer = threading.Thread(target=self._produce, args=(chunks,), daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = self.queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.stopped.set()
+            producer.join()
+
+    def _put(self, item):
+        """Blocks until the consumer takes `item`; gives up if the consumer went away."""
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, chunks):
+        try:
+            if self.workers > 1:
+                self._produce_parallel(chunks)
+            else:
+                for frame in chunks:
+                    if not self._put(parse_chunk(frame)):
+                        return
+            self._put(_DONE)
+        except Exception as e:
+            self._put(e)
+        finally:
+            chunks.close()
+
+    def _produce_parallel(self, chunks):
+        # At most two chunks per worker are in flight on top of the queue
+        max_pending = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for frame in chunks:
+                pending.append(pool.submit(parse_chunk, frame))
+                if len(pending) >= max_pending and not self._put(pending.popleft().result()):
+                    return
+            while pending:
+                if not self._put(pending.popleft().result()):
+                    return
+
+
+def frame_chunks(frame, chunk_size):
+    """Yields a DataFrame already in memory as parsed import records, `chunk_size` rows at a time."""
+    for start in range(0, len(frame), chunk_size):
+        yield parse_chunk(frame.iloc[start:start + chunk_size])
@@ -0,0 +1,145 @@
+# In api/teams.py
+
+"""
+Team and cross-tournament aggregates, each computed by one grouped query
+over PlayerTournamentStat.
+
+Stat rows carry the team as imported text (team_name). `link_teams` gives
+every distinct name a Team row and points the stats' team FK at it. The
+(team, tournament) index then serves these aggregates:
+
+    team_totals(tournament=4)        # every team of tournament 4
+    team_totals(team=team_id)        # one team, per tournament
+    player_team_record(player_id)    # one player, per team
+    top_performers(team_id, 'wickets_taken', tournament_id=4)
+
+Rates are computed from the summed counts by api.metrics.compute_rates, as
+for careers. The endpoints serving these (/api/tournaments/<id>/teams/,
+/api/teams/<id>/ and /top/, /api/players/<id>/teams/) are in the response
+cache, so each tournament's standings are computed once per data version.
+"""
+
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from .metrics import as_array, balls_to_overs, compute_rates
+from .models import PlayerTournamentStat, Team
+from .parsing import python_values
+
+# Keeps the IN (...) lists well below SQLite's variable limit
+LINK_BATCH_SIZE = 500
+
+# Counts summed over a group of stat rows, named as on PlayerCareerStat
+STAT_TOTALS = {
+    'total_innings': Sum(Coalesce('innings', 'matches_played')),
+    'total_runs': Sum('runs_scored'),
+    'total_balls_faced': Sum('balls_faced'),
+    'total_not_outs': Sum('not_outs'),
+    'total_fours': Sum('fours'),
+    'total_sixes': Sum('sixes'),
+    'total_fifties': Sum('fifties'),
+    'total_hundreds': Sum('hundreds'),
+    'top_score': Max('highest_score'),
+    'total_wickets': Sum('wickets_taken'),
+    'total_runs_conceded': Sum('runs_conceded'),
+    'total_balls_bowled': Sum('balls_bowled'),
+    'total_maidens': Sum('maidens'),
+}
+TEAM_TOTALS = {
+    'players': Count('player'),
+    # Stat rows do not say which matches were the team's; its busiest player is the best estimate
+    'matches': Max('matches_played'),
+    **STAT_TOTALS,
+}
+PLAYER_TEAM_TOTALS = {
+    'tournaments': Count('tournament'),
+    'total_matches': Sum('matches_played'),
+    **STAT_TOTALS,
+}
+# Stats the top performers of a team can be ranked by, all "more is better"
+TOP_PERFORMER_METRICS = [
+    'runs_scored', 'wickets_taken', 'sixes', 'fours', 'fifties', 'hundreds', 'maidens', 'matches_played',
+]
+
+
+def link_teams(player_ids=None):
+    """
+    Creates the Team rows for the team names of the stats of `player_ids`,
+    or of every stat when None, and points those stats' team at them.
+    Call it after anything that writes team_name.
+    """
+    if player_ids is None:
+        _link(PlayerTournamentStat.objects.all())
+        return
+    player_ids = sorted(set(player_ids))
+    for start in range(0, len(player_ids), LINK_BATCH_SIZE):
+        _link(PlayerTournamentStat.objects.filter(player__in=player_ids[start:start + LINK_BATCH_SIZE]))
+
+def _link(stats):
+    names = stats.exclude(team_name__isnull=True).exclude(team_name='').values_list('team_name', flat=True)
+    Team.objects.bulk_create(
+        [Team(name=name) for name in sorted(set(names))], batch_size=LINK_BATCH_SIZE, ignore_conflicts=True
+    )
+    # One set-based UPDATE; a stat without a name gets no team
+    stats.update(team=Subquery(Team.objects.filter(name=OuterRef('team_name')).values('id')[:1]))
+
+
+def _renamed(row, **names):
+    """`row` with the lookup keys given as keyword names renamed to their values."""
+    return {names.get(key, key): value for key, value in row.items()}
+
+def with_rates(rows):
+    """Adds total_overs and the career rates to `rows` of STAT_TOTALS, in place; returns them."""
+    totals = {name: as_array([row[name] for row in rows]) for name in STAT_TOTALS}
+    rates = compute_rates(
+        totals['total_runs'], totals['total_innings'], totals['total_not_outs'], totals['total_balls_faced'],
+        totals['total_runs_conceded'], totals['total_wickets'], totals['total_balls_bowled'],
+    )
+    derived = {name: python_values(values, integer=False) for name, values in rates.items()}
+    derived['total_overs'] = python_values(balls_to_overs(totals['total_balls_bowled']), integer=False)
+    for index, row in enumerate(rows):
+        row.update((name, values[index]) for name, values in derived.items())
+    return rows
+
+def team_totals(**filters):
+    """
+    One row per (team, tournament) of the stats matching `filters`, e.g.
+    tournament=4 or team=7, by tournament and then most runs.
+    """
+    rows = (
+        PlayerTournamentStat.objects
+        .filter(team__isnull=False, **filters)
+        .values('team_id', 'team__name', 'tournament_id')
+        .order_by()
+        .annotate(**TEAM_TOTALS)
+        .order_by('tournament_id', Coalesce('total_runs', 0).desc(), 'team__name')
+    )
+    return with_rates([_renamed(row, team__name='team') for row in rows])
+
+def player_team_record(player_id):
+    """One row per team `player_id` has played for, most tournaments first."""
+    rows = (
+        PlayerTournamentStat.objects
+        .filter(player=player_id, team__isnull=False)
+        .values('team_id', 'team__name')
+        .order_by()
+        .annotate(**PLAYER_TEAM_TOTALS)
+        .order_by('-tournaments', 'team__name')
+    )
+    return with_rates([_renamed(row, team__name='team') for row in rows])
+
+def top_performers(team_id, metric, limit=10, tournament_id=None):
+    """
+    The team's `limit` players with the highest summed `metric` (one of
+    TOP_PERFORMER_METRICS), in one tournament or across all of them.
+    """
+    stats = PlayerTournamentStat.objects.filter(team=team_id)
+    if tournament_id is not None:
+        stats = stats.filter(tournament=tournament_id)
+    rows = (
+        stats.values('player_id', 'player__name')
+        .order_by()
+        .annotate(value=Sum(metric))
+        .filter(value__isnull=False)
+        .order_by('-value', 'player_id')[:limit]
+    )
+    return [_renamed(row, player__name='name') for row in rows]
@@ -1,3 +1,1456 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import openpyxl
+from PIL import Image
+import pandas as pd
+import numpy as np
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase as DjangoTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+import rest_framework
+from rest_framework.permissions import IsAdminUser
+
+from .approvals import approve_edit_requests
+from .caching import bump_data_version
+from . import export
+from .career import CAREER_AGGREGATES, refresh_career_stats
+from .importer import BulkStatsImporter, CopyStatsImporter, IncrementalStatsImporter, copy_csv
+from .instrumentation import QueryRecorder
+from .metrics import overs_to_balls, recompute_stat_metrics
+from .models import (
+    DataVersion, Match, Player, Team, Tournament, PlayerTournamentStat, PlayerCareerStat, PlayerEditRequest, Notification,
+)
+from .notifications import OutboxWorker
+from .pagination import MIRRORED_DRF_VERSION
+from .parsing import parse_chunk, record_from_row, to_score
+from .search import TrigramIndex, similarity
+from .profiling import profiler_lock, route_stats
+from .streaming import read_csv_chunks
+from .teams import link_teams
+from .urls import router
+from benchmarks import synthetic
+from cricket_stats.database import database_settings
+import process_excel
+
+
+class TestCase(DjangoTestCase):
+    def setUp(self):
+        super().setUp()
+        # Cached responses are keyed on the data version, which rolls back between tests
+        cache.clear()
+
+
+def stat_snapshot():
+    """Every stat row as comparable tuples, independent of primary keys."""
+    fields = [f.name for f in PlayerTournamentStat._meta.fields if f.name not in ('id', 'player', 'tournament')]
+    return sorted(
+        tuple(str(value) for value in row)
+        for row in PlayerTournamentStat.objects.values_list('player__name', 'tournament_id', *fields)
+    )
+
+
+class ImportStatsTests(TestCase):
+    def import_stats(self, **options):
+        call_command('import_stats', file='master_stats.csv', stdout=io.StringIO(), **options)
+
+    def test_failed_row_by_row_import_keeps_the_previous_stats(self):
+        self.import_stats(bulk=True)
+        before = stat_snapshot()
+        version = DataVersion.objects.get().version
+
+        output = io.StringIO()
+        with mock.patch('api.management.commands.import_stats.link_teams', side_effect=RuntimeError('boom')):
+            call_command('import_stats', file='master_stats.csv', stdout=output)
+        self.assertIn('boom', output.getvalue())
+        self.assertEqual(stat_snapshot(), before)
+        self.assertEqual(DataVersion.objects.get().version, version)
+
+    def test_bulk_import_matches_row_by_row_import(self):
+        self.import_stats()
+        expected = stat_snapshot()
+        players = set(Player.objects.values_list('name', 'batting_style', 'bowling_style'))
+
+        PlayerTournamentStat.objects.all().delete()
+        Player.objects.all().delete()
+        Tournament.objects.all().delete()
+        self.import_stats(bulk=True, batch_size=50)
+
+        self.assertEqual(stat_snapshot(), expected)
+        self.assertEqual(set(Player.objects.values_list('name', 'batting_style', 'bowling_style')), players)
+
+    def test_streaming_import_matches_row_by_row_import(self):
+        self.import_stats()
+        expected = stat_snapshot()
+
+        for workers in (1, 2):
+            PlayerTournamentStat.objects.all().delete()
+            self.import_stats(stream=True, chunk_size=37, workers=workers)
+            self.assertEqual(stat_snapshot(), expected)
+
+    def test_parse_chunk_matches_row_parser(self):
+        with open('master_stats.csv', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        records = [record for chunk in read_csv_chunks('master_stats.csv', 100) for record in parse_chunk(chunk)]
+        self.assertEqual(records, [record_from_row(row) for row in rows])
+
+    def test_parse_chunk_without_strings_in_object_columns(self):
+        # A one-row chunk of a workbook column that mixes "37*" and 37 elsewhere
+        frame = pd.DataFrame({
+            'player_name': ['A', 'B'],
+            'highest_score': pd.Series([37, np.nan], dtype=object),
+            'runs_scored': pd.Series([None, 12], dtype=object),
+        })
+        stats = [record['stats'] for record in parse_chunk(frame)]
+        self.assertEqual(
+            [(stat['highest_score'], stat['highest_score_not_out'], stat['runs_scored']) for stat in stats],
+            [(37, False, None), (None, False, 12)],
+        )
+        self.assertEqual(stats[0], record_from_row({'player_name': 'A', 'highest_score': '37'})['stats'])
+
+    def test_not_out_highest_score_sets_flag(self):
+        self.assertEqual(to_score(' 37* '), (37, True))
+        self.assertEqual(to_score('37'), (37, False))
+        self.assertEqual(to_score('*'), (None, False))
+        frame = pd.DataFrame({'player_name': ['A', 'B', 'C'], 'highest_score': ['37*', '12', '']})
+        stats = [record['stats'] for record in parse_chunk(frame)]
+        self.assertEqual(
+            [(stat['highest_score'], stat['highest_score_not_out']) for stat in stats],
+            [(37, True), (12, False), (None, False)],
+        )
+        self.assertEqual(stats[0], record_from_row({'player_name': 'A', 'highest_score': '37*'})['stats'])
+
+    def test_bulk_import_reuses_existing_players_and_tournaments(self):
+        player = Player.objects.create(name='Aditya', batting_style='LHB')
+        Tournament.objects.create(id=2, name='Corporate Cup', year=2023)
+
+        self.import_stats(bulk=True)
+
+        self.assertEqual(Player.objects.filter(name='Aditya').count(), 1)
+        player.refresh_from_db()
+        self.assertEqual(player.batting_style, 'LHB')
+        self.assertEqual(player.bowling_style, 'Right-arm fast')
+        self.assertEqual(Tournament.objects.get(id=2).name, 'Corporate Cup')
+        self.assertTrue(PlayerTournamentStat.objects.filter(player=player, tournament_id=2).exists())
+
+
+@skipUnless(export.arrow_available(), 'needs pyarrow')
+class ArrowExportTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.directory = Path(scratch.name) / 'stats'
+
+    def test_parquet_dataset_round_trips_by_tournament(self):
+        rows = export.write_parquet_dataset(self.directory, batch_size=7)
+        self.assertEqual(rows, PlayerTournamentStat.objects.count())
+        tournament_ids = set(PlayerTournamentStat.objects.values_list('tournament_id', flat=True))
+        self.assertEqual(
+            {path.name for path in self.directory.iterdir()}, {f"tournament_id={pk}" for pk in tournament_ids}
+        )
+
+        table = export.read_parquet_dataset(self.directory)
+        self.assertEqual(table.schema.field('runs_scored').type, export.pa.int32())
+        self.assertEqual(table.schema.field('highest_score_not_out').type, export.pa.bool_())
+        exported = sorted(zip(*(table.column(name).to_pylist() for name in ('id', 'player_name', 'highest_score'))))
+        self.assertEqual(
+            exported, list(PlayerTournamentStat.objects.order_by('id').values_list('id', 'player__name', 'highest_score'))
+        )
+
+        tournament_id = min(tournament_ids)
+        only = export.read_parquet_dataset(self.directory, columns=['id'], filters=[('tournament_id', '=', tournament_id)])
+        self.assertEqual(only.num_rows, PlayerTournamentStat.objects.filter(tournament_id=tournament_id).count())
+
+    def test_arrow_endpoint_streams_filtered_stats(self):
+        tournament_id = PlayerTournamentStat.objects.values_list('tournament_id', flat=True).first()
+        response = self.client.get(
+            reverse('playertournamentstat-arrow'), {'tournament': tournament_id},
+            HTTP_ACCEPT=export.ARROW_STREAM_MEDIA_TYPE,
+        )
+        self.assertEqual(response['Content-Type'], export.ARROW_STREAM_MEDIA_TYPE)
+        table = export.pa.ipc.open_stream(b''.join(response.streaming_content)).read_all()
+        self.assertEqual(table.schema, export.arrow_schema())
+        self.assertEqual(
+            table.column('id').to_pylist(),
+            list(PlayerTournamentStat.objects.filter(tournament_id=tournament_id).order_by('id').values_list('id', flat=True)),
+        )
+
+
+class CSVExportTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def read_csv(self, url, params=None):
+        response = self.client.get(url, params or {}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_stats_csv_applies_list_filters(self):
+        tournament_id = PlayerTournamentStat.objects.values_list('tournament_id', flat=True).first()
+        rows = self.read_csv(reverse('playertournamentstat-export-csv'), {'tournament': tournament_id})
+        expected = PlayerTournamentStat.objects.filter(tournament_id=tournament_id).order_by('id')
+        self.assertEqual([int(row['id']) for row in rows], list(expected.values_list('id', flat=True)))
+        self.assertEqual(rows[0]['player_name'], expected[0].player.name)
+
+    def test_career_csv_is_in_leaderboard_order(self):
+        rows = self.read_csv(reverse('career-stats-export-csv'))
+        self.assertEqual(
+            [row['name'] for row in rows],
+            list(PlayerCareerStat.objects.order_by('-total_runs', 'player').values_list('player_name', flat=True)),
+        )
+
+    def test_rows_are_streamed_in_chunks(self):
+        queryset = PlayerTournamentStat.objects.order_by('id')
+        chunks = list(export.stream_csv(queryset, export.STAT_CSV_COLUMNS, chunk_size=5))
+        self.assertGreater(len(chunks), queryset.count() // 5)
+        self.assertEqual(len(list(csv.reader(io.StringIO(''.join(chunks))))), queryset.count() + 1)
+
+
+class PlayerSearchTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        for name in ('Rahul Sharma', 'Rahul Dravid', 'Karan Rahulkar', 'Vinay Kumar', 'Sharma Ji'):
+            Player.objects.create(name=name)
+        bump_data_version()
+
+    def search(self, **params):
+        response = self.client.get(reverse('player-search'), params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return [(result['name'], result['match']) for result in response.json()['results']]
+
+    def test_similarity_matches_pg_trgm(self):
+        # SELECT similarity('word', 'two words') in PostgreSQL
+        self.assertAlmostEqual(similarity('word', 'two words'), 4 / 11)
+        self.assertEqual(similarity('Rahul  SHARMA.', 'rahul sharma'), 1.0)
+
+    def test_prefix_matches_rank_before_word_prefix_and_fuzzy(self):
+        self.assertEqual(self.search(q='rah'), [
+            ('Rahul Dravid', 'prefix'), ('Rahul Sharma', 'prefix'), ('Karan Rahulkar', 'word_prefix'),
+        ])
+        self.assertEqual(self.search(q='sharma')[:2], [('Sharma Ji', 'prefix'), ('Rahul Sharma', 'word_prefix')])
+        self.assertEqual(self.search(q='Vinai Kumar'), [('Vinay Kumar', 'fuzzy')])
+        self.assertEqual(self.search(q='rah', limit=1), [('Rahul Dravid', 'prefix')])
+
+    def test_new_players_are_searchable_after_a_change(self):
+        self.assertEqual(self.search(q='zubin'), [])
+        Player.objects.create(name='Zubin Mehta')
+        bump_data_version()
+        self.assertEqual(self.search(q='zubin'), [('Zubin Mehta', 'prefix')])
+
+    def test_missing_query_is_rejected(self):
+        response = self.client.get(reverse('player-search'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_import_matches_near_duplicate_names(self):
+        index = TrigramIndex([(1, 'Rahul Sharma')])
+        self.assertEqual(index.best_match('Rahul  Sharmaa', 0.8)[:2], (1, 'Rahul Sharma'))
+        self.assertIsNone(index.best_match('Rahul Dravid', 0.8))
+
+        csv_path = Path(tempfile.mkdtemp()) / 'stats.csv'
+        self.addCleanup(csv_path.unlink)
+        csv_path.write_text(
+            "player_name,tournament_id,runs_scored\n"
+            "rahul sharmaa,1,10\nVinay  Kumar,2,20\nRahul Sharmaa,2,30\nNew Player,1,5\n"
+        )
+        call_command('import_stats', file=str(csv_path), match_names=0.8, stdout=io.StringIO())
+
+        self.assertEqual(Player.objects.count(), 6)
+        self.assertEqual(
+            sorted(PlayerTournamentStat.objects.values_list('player__name', 'tournament_id', 'runs_scored')),
+            [('New Player', 1, 5), ('Rahul Sharma', 1, 10), ('Rahul Sharma', 2, 30), ('Vinay Kumar', 2, 20)],
+        )
+
+
+class PlayerPhotoTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=Path(media.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def add_photo(self, name, size, mode='RGB', fmt='PNG'):
+        buffer = io.BytesIO()
+        Image.new(mode, size, 'red').save(buffer, fmt)
+        player = Player.objects.create(name=name)
+        player.photo.save(f"{name}.{fmt.lower()}", ContentFile(buffer.getvalue()))
+        return player
+
+    def generate(self):
+        output = io.StringIO()
+        call_command('generate_thumbnails', stdout=output)
+        return output.getvalue()
+
+    def test_thumbnails_are_content_hashed_and_exposed_as_srcset(self):
+        player = self.add_photo('Rahul', (1200, 900), mode='RGBA')
+        small = self.add_photo('Vinay', (60, 40), fmt='JPEG')
+        self.assertIn('for 2 photos', self.generate())
+
+        player.refresh_from_db()
+        self.assertEqual([width for width, _ in player.photo_thumbnails['webp']], [96, 240, 480])
+        small.refresh_from_db()
+        self.assertEqual([width for width, _ in small.photo_thumbnails['jpeg']], [60])
+
+        photo = self.client.get(f'/api/players/{player.pk}/', HTTP_ACCEPT='application/json').json()['photo']
+        self.assertRegex(photo['src'], r'^http://testserver/media/players/thumbs/[0-9a-f]{20}-240\.jpeg$')
+        self.assertEqual(photo['srcset']['image/webp'].count('w, '), 2)
+        self.assertNotIn(player.photo.url, str(photo))
+
+        response = self.client.get(photo['src'].removeprefix('http://testserver'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+        # Nothing is pending until a photo changes
+        self.assertIn('for 0 photos', self.generate())
+
+    def test_cleared_or_replaced_photo_is_not_served(self):
+        player = self.add_photo('Rahul', (300, 200))
+        self.generate()
+        urls = [f'/api/players/{player.pk}/', f'/api/async/players/{player.pk}/']
+        for url in urls:
+            self.assertIsNotNone(self.client.get(url, HTTP_ACCEPT='application/json').json()['photo'])
+
+        player.refresh_from_db()
+        player.photo = ''
+        player.save()
+        bump_data_version()
+        for url in urls:
+            self.assertIsNone(self.client.get(url, HTTP_ACCEPT='application/json').json()['photo'])
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (300, 200), 'blue').save(buffer, 'PNG')
+        player.photo.save('Rahul-new.png', ContentFile(buffer.getvalue()))
+        bump_data_version()
+        for url in urls:
+            self.assertIsNone(self.client.get(url, HTTP_ACCEPT='application/json').json()['photo'])
+        self.assertIn('for 1 photos', self.generate())
+        self.assertIsNotNone(self.client.get(urls[0], HTTP_ACCEPT='application/json').json()['photo'])
+
+    def test_unreadable_photo_is_recorded_once(self):
+        player = Player.objects.create(name='Broken')
+        player.photo.save('broken.png', ContentFile(b'not an image'))
+        self.assertIn('1 photos could not be read', self.generate())
+        player.refresh_from_db()
+        self.assertIn('error', player.photo_thumbnails)
+        self.assertIsNone(self.client.get(f'/api/players/{player.pk}/', HTTP_ACCEPT='application/json').json()['photo'])
+        self.assertNotIn('could not be read', self.generate())
+
+
+class LoadExcelTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.directory = Path(scratch.name)
+        self.batting, self.bowling = synthetic.write_workbooks(self.directory, 120)
+
+    def load_excel(self, **options):
+        call_command(
+            'load_excel', folder=str(self.directory), batting='batting.xlsx', bowling='bowling.xlsx',
+            no_cache=True, stdout=io.StringIO(), **options
+        )
+
+    def test_load_matches_import_of_generated_csv(self):
+        csv_path = self.directory / 'master_stats.csv'
+        frame = process_excel.build_master_frame(self.batting, self.bowling, cache_dir=None)
+        frame.replace({float('nan'): None}).to_csv(csv_path, index=False)
+        call_command('import_stats', file=str(csv_path), bulk=True, stdout=io.StringIO())
+        expected = stat_snapshot()
+
+        for chunk_size in (25, 1):
+            PlayerTournamentStat.objects.all().delete()
+            self.load_excel(chunk_size=chunk_size)
+            self.assertEqual(stat_snapshot(), expected)
+
+        self.assertEqual(PlayerTournamentStat.objects.count(), 120)
+        not_out = PlayerTournamentStat.objects.filter(highest_score_not_out=True)
+        self.assertTrue(not_out.exists())
+        self.assertFalse(not_out.filter(highest_score__isnull=True).exists())
+
+    def test_copy_csv_keeps_empty_text_apart_from_null(self):
+        self.assertEqual(copy_csv([[1, None, '', 'a,b', False]]).read(), '1,\\N,,"a,b",False\n')
+
+
+class SyntheticDataTests(TestCase):
+    def test_imported_csv_matches_populated_dataset(self):
+        synthetic.populate(300, seed=3)
+        expected = stat_snapshot()
+        careers = set(PlayerCareerStat.objects.values_list('player__name', 'total_runs', 'batting_average'))
+        self.assertEqual(len(expected), 300)
+        self.assertTrue(PlayerTournamentStat.objects.filter(team__isnull=False).exists())
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = synthetic.write_csv(Path(directory) / 'master_stats.csv', 300, seed=3)
+            call_command('import_stats', file=str(csv_path), bulk=True, stdout=io.StringIO())
+
+        # Only imports record the content hash for incremental reloads
+        PlayerTournamentStat.objects.update(row_hash='')
+        self.assertEqual(stat_snapshot(), expected)
+        self.assertEqual(
+            set(PlayerCareerStat.objects.values_list('player__name', 'total_runs', 'batting_average')), careers
+        )
+
+
+class MatchImportTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.path = Path(scratch.name) / 'scorecards.jsonl'
+
+    def scorecard(self, key, aditya_runs, **aditya):
+        return {
+            'match_key': key, 'tournament_id': 90, 'date': '2024-03-01', 'venue': 'Nehru Stadium',
+            'team1': 'Gajapade', 'team2': 'Hampi', 'winner': 'Gajapade',
+            'batting': [
+                {'player': 'Aditya', 'team': 'Gajapade', 'runs': aditya_runs, 'balls': 40, 'fours': 5, **aditya},
+                {'player': 'Vinay  Kumar', 'team': 'Gajapade', 'batted': False},
+            ],
+            'bowling': [{'player': 'Karan', 'team': 'Hampi', 'overs': 3.4, 'runs': 30, 'wickets': 2}],
+        }
+
+    def import_matches(self, *scorecards):
+        self.path.write_text(''.join(json.dumps(card) + '\n' for card in scorecards))
+        call_command('import_matches', file=str(self.path), chunk_size=1, stdout=io.StringIO())
+
+    def test_rollup_updates_only_the_affected_stats(self):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+        before = stat_snapshot()
+        self.import_matches(self.scorecard('m1', 62), self.scorecard('m2', 71, not_out=True))
+
+        aditya = PlayerTournamentStat.objects.get(player__name='Aditya', tournament_id=90)
+        self.assertEqual(
+            (aditya.matches_played, aditya.innings, aditya.runs_scored, aditya.not_outs, aditya.fifties),
+            (2, 2, 133, 1, 2),
+        )
+        self.assertEqual((aditya.highest_score, aditya.highest_score_not_out), (71, True))
+        self.assertEqual(aditya.batting_average, 133.0)
+        vinay = PlayerTournamentStat.objects.get(player__name='Vinay Kumar', tournament_id=90)
+        self.assertEqual((vinay.matches_played, vinay.innings, vinay.runs_scored), (2, 0, 0))
+        # Karan only bowled, yet played both matches; 22 + 22 balls are 7.2 overs
+        karan = PlayerTournamentStat.objects.get(player__name='Karan', tournament_id=90)
+        self.assertEqual((karan.matches_played, karan.overs_bowled, karan.balls_bowled), (2, 7.2, 44))
+        self.assertEqual(karan.economy_rate, round(60 * 6 / 44, 2))
+        self.assertEqual(PlayerCareerStat.objects.get(player__name='Karan').total_wickets, 4)
+        # Spreadsheet rows of other tournaments are untouched
+        after = stat_snapshot()
+        self.assertLessEqual(set(before), set(after))
+        self.assertEqual(len(after), len(before) + 3)
+
+    def test_reloading_a_match_replaces_it(self):
+        self.import_matches(self.scorecard('m1', 62), self.scorecard('m2', 71))
+        self.import_matches({**self.scorecard('m2', 10), 'bowling': []})
+
+        self.assertEqual(Match.objects.count(), 2)
+        aditya = PlayerTournamentStat.objects.get(player__name='Aditya', tournament_id=90)
+        self.assertEqual((aditya.matches_played, aditya.runs_scored, aditya.highest_score), (2, 72, 62))
+        karan = PlayerTournamentStat.objects.get(player__name='Karan', tournament_id=90)
+        self.assertEqual((karan.matches_played, karan.wickets_taken, karan.overs_bowled), (1, 2, 3.4))
+
+    def test_imported_rows_are_never_overwritten_or_deleted_by_rollups(self):
+        csv_path = self.path.with_name('master_stats.csv')
+        csv_path.write_text(
+            'player_name,tournament_id,team_name,matches_played,runs_scored\n'
+            'Aditya,90,Gajapade,8,300\n'
+        )
+        call_command('import_stats', file=str(csv_path), bulk=True, stdout=io.StringIO())
+        self.import_matches(self.scorecard('m1', 62))
+
+        def stat(name):
+            return PlayerTournamentStat.objects.filter(player__name=name, tournament_id=90).first()
+
+        aditya = stat('Aditya')
+        self.assertEqual((aditya.matches_played, aditya.runs_scored, aditya.from_matches), (8, 300, False))
+        self.assertEqual((stat('Karan').matches_played, stat('Karan').from_matches), (1, True))
+
+        # Aditya and Karan drop out of the replaced scorecard
+        self.import_matches({**self.scorecard('m1', 0), 'batting': [{'player': 'Vinay Kumar', 'team': 'Gajapade'}],
+                             'bowling': []})
+        self.assertEqual((stat('Aditya').matches_played, stat('Aditya').runs_scored), (8, 300))
+        self.assertIsNone(stat('Karan'))
+        self.assertEqual(PlayerCareerStat.objects.get(player__name='Aditya').total_runs, 300)
+
+        # Reloading the spreadsheet keeps the rolled up rows of the pairs it does not cover
+        call_command('import_stats', file=str(csv_path), bulk=True, stdout=io.StringIO())
+        self.assertEqual((stat('Vinay Kumar').matches_played, stat('Vinay Kumar').from_matches), (1, True))
+        self.assertEqual(stat('Aditya').runs_scored, 300)
+
+    def test_invalid_scorecard_writes_nothing(self):
+        invalid = [
+            {**self.scorecard('m2', 1), 'bowling': [{'player': 'Karan', 'overs': 3.7}]},
+            self.scorecard('m2', 1, not_out='false'),
+            self.scorecard('m2', 1, batted=0),
+        ]
+        for card in invalid:
+            with self.subTest(card=card), self.assertRaisesMessage(CommandError, 'line 2'):
+                self.import_matches(self.scorecard('m1', 62), card)
+            self.assertFalse(Match.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'COPY ... FROM STDIN needs PostgreSQL')
+class CopyStatsImporterTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        with open('master_stats.csv', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        # Aditya's Tournament 2 row comes again in the second chunk with other runs
+        repeated = next(row for row in rows if (row['player_name'], row['tournament_id']) == ('Aditya', '2'))
+        half = len(rows) // 2
+        self.chunks = [
+            [record_from_row(row) for row in rows[:half]],
+            [record_from_row(row) for row in rows[half:] + [{**repeated, 'runs_scored': '99'}]],
+        ]
+        self.rows = rows
+
+    def import_chunks(self, importer):
+        """Runs `importer` over the chunks after a first import with one pair turned into a match rollup."""
+        PlayerTournamentStat.objects.all().delete()
+        BulkStatsImporter().run(self.rows)
+        PlayerTournamentStat.objects.filter(player__name='Abhinava Venkataraman', tournament_id=4).update(
+            from_matches=True, runs_scored=500
+        )
+        importer.run_chunks(self.chunks)
+        return stat_snapshot()
+
+    def test_copy_import_matches_the_batched_import(self):
+        expected = self.import_chunks(BulkStatsImporter())
+        importer = CopyStatsImporter()
+        self.assertEqual(self.import_chunks(importer), expected)
+        self.assertGreater(importer.rows_copied, 0)
+
+        self.assertEqual(PlayerTournamentStat.objects.get(player__name='Aditya', tournament_id=2).runs_scored, 99)
+        # The imported row replaced the rolled up one
+        rolled_up = PlayerTournamentStat.objects.get(player__name='Abhinava Venkataraman', tournament_id=4)
+        self.assertEqual((rolled_up.from_matches, rolled_up.runs_scored), (False, None))
+
+
+class IncrementalImportTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        with open('master_stats.csv', encoding='utf-8') as file:
+            self.rows = list(csv.DictReader(file))
+        self.stat_count = len({(row['player_name'].strip(), row['tournament_id']) for row in self.rows})
+
+    def run_import(self, rows, **options):
+        return IncrementalStatsImporter(**options).run(rows)
+
+    def test_reimporting_unchanged_rows_writes_nothing(self):
+        first = self.run_import(self.rows)
+        self.assertEqual(first.stats_created, self.stat_count)
+        ids_before = set(PlayerTournamentStat.objects.values_list('id', flat=True))
+
+        second = self.run_import(self.rows)
+        self.assertEqual((second.stats_created, second.stats_updated), (0, 0))
+        self.assertEqual(second.stats_unchanged, self.stat_count)
+        self.assertEqual(set(PlayerTournamentStat.objects.values_list('id', flat=True)), ids_before)
+
+    def test_changed_row_is_updated_in_place(self):
+        self.run_import(self.rows)
+        stat = PlayerTournamentStat.objects.get(player__name='Aditya', tournament_id=2)
+
+        rows = [dict(row) for row in self.rows]
+        for row in rows:
+            if row['player_name'] == 'Aditya' and row['tournament_id'] == '2':
+                row['runs_scored'] = '99'
+        result = self.run_import(rows)
+
+        self.assertEqual((result.stats_created, result.stats_updated), (0, 1))
+        stat.refresh_from_db()
+        self.assertEqual(stat.runs_scored, 99)
+
+    def test_prune_removes_rows_missing_from_the_file(self):
+        self.run_import(self.rows)
+        rows = [row for row in self.rows if row['tournament_id'] != '4']
+
+        kept = self.run_import(rows)
+        self.assertEqual(kept.stats_pruned, 0)
+        self.assertTrue(PlayerTournamentStat.objects.filter(tournament_id=4).exists())
+
+        pruned = self.run_import(rows, prune=True)
+        self.assertEqual(pruned.stats_pruned, 46)
+        self.assertFalse(PlayerTournamentStat.objects.filter(tournament_id=4).exists())
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every GET endpoint registered in api/urls.py declares a `query_budget` on
+    its viewset ({action: max queries}); this fails when one is exceeded or missing.
+    The dataset is large enough that any per-row query blows the budget.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        tournaments = [Tournament.objects.create(name=f"Cup {i}", year=2024) for i in range(3)]
+        players = [Player.objects.create(name=f"Player {i}") for i in range(5)]
+        for player in players:
+            for tournament in tournaments:
+                PlayerTournamentStat.objects.create(
+                    player=player, tournament=tournament, team_name='Team A', runs_scored=10, wickets_taken=1
+                )
+        link_teams()
+        refresh_career_stats()
+        edit_request = PlayerEditRequest.objects.create(player=players[0], proposed_changes={'playing_role': 'Batter'})
+        # Admin-only endpoints are measured as a logged-in admin, session lookups included
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+        # Primary key to request for each basename's detail routes
+        cls.detail_pks = {
+            'playereditrequest': edit_request.pk,
+            'player': players[0].pk,
+            'playertournamentstat': PlayerTournamentStat.objects.first().pk,
+            'career-stats': players[0].pk,
+            'tournament': tournaments[0].pk,
+            'team': Team.objects.get().pk,
+        }
+
+    # Query string for actions with required parameters
+    query_strings = {'player-search': '?q=player'}
+
+    def endpoints(self):
+        """Yields (url name, url, budget, admin only) for every GET action of every registered viewset."""
+        for prefix, viewset, basename in router.registry:
+            budget = getattr(viewset, 'query_budget', None)
+            self.assertIsNotNone(budget, f"{viewset.__name__} declares no query_budget")
+
+            actions = []
+            if hasattr(viewset, 'list'):
+                actions.append(('list', 'list', False))
+            if hasattr(viewset, 'retrieve'):
+                actions.append(('retrieve', 'detail', True))
+            for extra in viewset.get_extra_actions():
+                if 'get' in extra.mapping:
+                    actions.append((extra.__name__, extra.url_name, extra.detail))
+
+            for action_name, url_name, detail in actions:
+                self.assertIn(action_name, budget, f"{viewset.__name__}.{action_name} has no query budget")
+                args = [self.detail_pks[basename]] if detail else []
+                admin_only = IsAdminUser in viewset.permission_classes
+                name = f"{basename}-{url_name}"
+                url = reverse(name, args=args) + self.query_strings.get(name, '')
+                yield name, url, budget[action_name], admin_only
+
+    def test_endpoints_stay_within_query_budget(self):
+        for name, url, budget, admin_only in self.endpoints():
+            with self.subTest(endpoint=name):
+                if admin_only:
+                    self.client.force_login(self.admin)
+                else:
+                    self.client.logout()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, HTTP_ACCEPT='application/json')
+                    # A streamed body runs its queries as it is consumed
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    len(queries), budget,
+                    f"{name} ran {len(queries)} queries (budget {budget}):\n"
+                    + "\n".join(query['sql'] for query in queries.captured_queries)
+                )
+
+
+@override_settings(PROFILING=True)
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+
+    def setUp(self):
+        super().setUp()
+        route_stats.clear()
+
+    def test_server_timing_and_route_percentiles(self):
+        for _ in range(3):
+            response = self.client.get('/api/career-stats/rank/?by=total_wickets', HTTP_ACCEPT='application/json')
+        self.assertRegex(response['Server-Timing'], r'total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries, 0 duplicates"')
+
+        self.client.force_login(self.admin)
+        routes = self.client.get('/api/profiling/', HTTP_ACCEPT='application/json').json()['routes']
+        rank = routes['GET career-stats-rank']
+        self.assertEqual((rank['requests'], rank['sampled']), (3, 3))
+        self.assertLessEqual(rank['total_ms']['p50'], rank['total_ms']['p99'])
+        self.assertGreater(rank['queries']['max'], 0)
+
+    def test_repeated_queries_are_flagged(self):
+        with QueryRecorder() as queries:
+            for player_id in (1, 2, 2):
+                list(Player.objects.filter(pk=player_id))
+        self.assertEqual((queries.count, queries.duplicates), (3, 1))
+        self.assertEqual([count for _, count in queries.repeated(3)], [3])
+
+    def test_sampled_requests_are_dumped_with_cprofile(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=directory.name):
+            with self.assertLogs('api.profiling', 'INFO') as logs:
+                self.client.get('/api/tournaments/', HTTP_ACCEPT='application/json')
+        dumps = list(Path(directory.name).glob('*-GET-tournament-list.prof'))
+        self.assertEqual(len(dumps), 1)
+        self.assertIn(str(dumps[0]), logs.output[0])
+
+    def test_busy_or_failing_profiler_never_fails_a_request(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=directory.name):
+            with profiler_lock:
+                self.assertEqual(self.client.get('/api/tournaments/', HTTP_ACCEPT='application/json').status_code, 200)
+            with mock.patch('api.profiling.cProfile.Profile') as profile:
+                profile.return_value.enable.side_effect = ValueError("Another profiling tool is already active")
+                self.assertEqual(self.client.get('/api/tournaments/', HTTP_ACCEPT='application/json').status_code, 200)
+            self.assertEqual(list(Path(directory.name).iterdir()), [])
+            # The lock was released either way
+            self.assertFalse(profiler_lock.locked())
+
+    @override_settings(PROFILING=False)
+    def test_off_by_default(self):
+        response = self.client.get('/api/tournaments/', HTTP_ACCEPT='application/json')
+        self.assertNotIn('Server-Timing', response)
+
+
+class CareerStatsTests(TestCase):
+    def live_aggregates(self):
+        """Career totals computed the slow way, straight from the stats table."""
+        return {
+            row.pop('name'): row
+            for row in Player.objects.annotate(**CAREER_AGGREGATES).values('name', *CAREER_AGGREGATES)
+        }
+
+    def endpoint_rows(self):
+        response = self.client.get('/api/career-stats/?page_size=200', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()['next'])
+        return response.json()['results']
+
+    def test_endpoint_matches_live_aggregates_after_import(self):
+        call_command('import_stats', file='master_stats.csv', incremental=True, stdout=io.StringIO())
+
+        live = self.live_aggregates()
+        rows = {
+            row.pop('name'): {key: value for key, value in row.items() if key in CAREER_AGGREGATES}
+            for row in self.endpoint_rows()
+        }
+        self.assertEqual(rows, {name: {key: live[name][key] for key in rows[name]} for name in live})
+        runs = [row['total_runs'] for row in self.endpoint_rows() if row['total_runs'] is not None]
+        self.assertEqual(runs, sorted(runs, reverse=True))
+
+    def test_stat_delete_refreshes_only_the_affected_player(self):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+        aditya = Player.objects.get(name='Aditya')
+        stat = PlayerTournamentStat.objects.get(player=aditya, tournament_id=2)
+        before = PlayerCareerStat.objects.get(player=aditya).total_runs
+        PlayerCareerStat.objects.exclude(player=aditya).update(total_runs=-1)
+
+        response = self.client.delete(f'/api/stats/{stat.pk}/')
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(PlayerCareerStat.objects.get(player=aditya).total_runs, before - stat.runs_scored)
+        self.assertFalse(PlayerCareerStat.objects.exclude(player=aditya).exclude(total_runs=-1).exists())
+
+    def test_admin_player_edits_refresh_careers_and_the_cache(self):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+        self.client.force_login(User.objects.create_superuser('admin'))
+        aditya = Player.objects.get(name='Aditya')
+        etag = self.client.get('/api/career-stats/', HTTP_ACCEPT='application/json')['ETag']
+
+        response = self.client.post(f'/admin/api/player/{aditya.pk}/change/', {'name': 'Aditya R'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(PlayerCareerStat.objects.get(player=aditya).player_name, 'Aditya R')
+        after = self.client.get('/api/career-stats/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(after.status_code, 200)
+
+        response = self.client.post(f'/admin/api/player/{aditya.pk}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(PlayerCareerStat.objects.filter(player_id=aditya.pk).exists())
+        gone = self.client.get('/api/career-stats/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=after['ETag'])
+        self.assertEqual(gone.status_code, 200)
+
+
+class DerivedMetricsTests(TestCase):
+    def test_overs_are_converted_in_cricket_notation(self):
+        balls = overs_to_balls([4.3, 4.0, 0.5, 4.7, 4.25, float('nan')])
+        self.assertEqual(balls[:3].tolist(), [27, 24, 5])
+        self.assertTrue(all(value != value for value in balls[3:]))
+
+    def test_spreadsheet_rates_are_recomputed_from_counts(self):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+        bowler = PlayerTournamentStat.objects.filter(balls_bowled__gt=0, wickets_taken__gt=0).first()
+        self.assertEqual(bowler.balls_bowled, overs_to_balls([bowler.overs_bowled])[0])
+        self.assertEqual(bowler.economy_rate, round(bowler.runs_conceded * 6 / bowler.balls_bowled, 2))
+        self.assertEqual(bowler.bowling_strike_rate, round(bowler.balls_bowled / bowler.wickets_taken, 2))
+        # Already up to date, so nothing to write
+        self.assertEqual(recompute_stat_metrics(), 0)
+
+    def test_career_rates_come_from_summed_balls(self):
+        player = Player.objects.create(name='Overs Test')
+        for tournament_id, overs, conceded in [(1, 4.3, 30), (2, 3.3, 20)]:
+            tournament = Tournament.objects.create(id=tournament_id, name=f"T{tournament_id}", year=2024)
+            PlayerTournamentStat.objects.create(
+                player=player, tournament=tournament, matches_played=2, runs_scored=60, not_outs=1,
+                overs_bowled=overs, runs_conceded=conceded, wickets_taken=2,
+            )
+        recompute_stat_metrics([player.pk])
+        refresh_career_stats([player.pk])
+
+        career = PlayerCareerStat.objects.get(player=player)
+        # 27 + 21 balls is 8 overs, not the 7.6 that adding the notation gives
+        self.assertEqual((career.total_balls_bowled, career.total_overs), (48, 8.0))
+        self.assertEqual(career.economy_rate, 6.25)
+        self.assertEqual(career.bowling_strike_rate, 12.0)
+        # Innings fall back to matches played: 120 runs over 4 - 2 dismissals
+        self.assertEqual(career.batting_average, 60.0)
+
+
+class TeamAggregateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_stats_are_linked_to_one_team_per_name(self):
+        names = set(PlayerTournamentStat.objects.exclude(team_name='').exclude(team_name__isnull=True)
+                    .values_list('team_name', flat=True))
+        self.assertEqual(set(Team.objects.values_list('name', flat=True)), names)
+        self.assertFalse(PlayerTournamentStat.objects.filter(team_name__in=names, team__isnull=True).exists())
+        self.assertFalse(PlayerTournamentStat.objects.exclude(team__name=F('team_name')).filter(team__isnull=False).exists())
+
+    def test_tournament_team_totals_match_the_stats(self):
+        body = self.get('/api/tournaments/4/teams/')
+        expected = {}
+        for stat in PlayerTournamentStat.objects.filter(tournament_id=4, team__isnull=False):
+            runs, wickets = expected.get(stat.team_name, (0, 0))
+            expected[stat.team_name] = (runs + (stat.runs_scored or 0), wickets + (stat.wickets_taken or 0))
+        self.assertEqual(
+            {row['team']: (row['total_runs'] or 0, row['total_wickets'] or 0) for row in body['teams']}, expected
+        )
+        runs = [row['total_runs'] or 0 for row in body['teams']]
+        self.assertEqual(runs, sorted(runs, reverse=True))
+
+    def test_team_page_top_performers_and_player_record(self):
+        stat = PlayerTournamentStat.objects.filter(team__isnull=False, runs_scored__gt=0).order_by('-runs_scored').first()
+        team = self.get(f'/api/teams/{stat.team_id}/')
+        self.assertEqual(team['name'], stat.team_name)
+        self.assertIn(stat.tournament_id, [row['tournament_id'] for row in team['tournaments']])
+
+        top = self.get(f'/api/teams/{stat.team_id}/top/?by=runs_scored&tournament={stat.tournament_id}&limit=3')
+        self.assertEqual(top['results'][0]['value'], stat.runs_scored)
+        self.assertEqual(
+            self.client.get(f'/api/teams/{stat.team_id}/top/?by=economy_rate').status_code, 400
+        )
+
+        record = self.get(f'/api/players/{stat.player_id}/teams/')
+        teams = PlayerTournamentStat.objects.filter(player=stat.player_id, team__isnull=False)
+        self.assertEqual(
+            sum(row['tournaments'] for row in record['teams']), teams.count()
+        )
+
+
+class CareerRankingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def expected_ranking(self, metric, descending=True):
+        """(name, value, dense rank) for every player with a value, best first."""
+        careers = PlayerCareerStat.objects.exclude(**{f'{metric}__isnull': True})
+        ordered = sorted(careers, key=lambda c: (-getattr(c, metric) if descending else getattr(c, metric), c.player_id))
+        ranking, rank, previous = [], 0, object()
+        for career in ordered:
+            value = getattr(career, metric)
+            if value != previous:
+                rank, previous = rank + 1, value
+            ranking.append((career.player_name, value, rank))
+        return ranking
+
+    def fetch_all_pages(self, metric, limit):
+        url, rows = f'/api/career-stats/rank/?by={metric}&limit={limit}', []
+        while url:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertLessEqual(len(body['results']), limit)
+            rows.extend((row['name'], row[metric], row['rank']) for row in body['results'])
+            url = body['next']
+        return rows
+
+    def test_top_k_matches_python_dense_rank(self):
+        response = self.client.get('/api/career-stats/rank/?by=total_wickets&limit=10', HTTP_ACCEPT='application/json')
+        results = response.json()['results']
+        self.assertEqual(
+            [(row['name'], row['total_wickets'], row['rank']) for row in results],
+            self.expected_ranking('total_wickets')[:10],
+        )
+
+    def test_keyset_pages_cover_the_whole_ranking(self):
+        self.assertEqual(self.fetch_all_pages('total_sixes', 7), self.expected_ranking('total_sixes'))
+        self.assertEqual(
+            self.fetch_all_pages('bowling_average', 9), self.expected_ranking('bowling_average', descending=False)
+        )
+
+    def test_unknown_metric_is_rejected(self):
+        response = self.client.get('/api/career-stats/rank/?by=player_name', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class StatsFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def get_stats(self, query):
+        response = self.client.get(f'/api/stats/?page_size=200&{query}', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_filters_are_applied(self):
+        rows = self.get_stats('tournament=4&runs_scored__gte=50')
+        expected = PlayerTournamentStat.objects.filter(tournament_id=4, runs_scored__gte=50)
+        self.assertEqual(len(rows), expected.count())
+        self.assertTrue(rows)
+        self.assertTrue(all(row['tournament_name'] == 'Tournament 4' for row in rows))
+        self.assertTrue(all(row['batting']['runs_scored'] >= 50 for row in rows))
+
+        team_rows = self.get_stats('team_name__iexact=gajapade')
+        self.assertEqual(len(team_rows), PlayerTournamentStat.objects.filter(team_name='Gajapade').count())
+
+    def test_ordering_by_numeric_column(self):
+        rows = self.get_stats('tournament=4&ordering=-wickets_taken')
+        wickets = [row['bowling']['wickets_taken'] or 0 for row in rows]
+        self.assertEqual(wickets, sorted(wickets, reverse=True))
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def walk(self, url):
+        """Follows `next` links, returning every result and the size of each page."""
+        results, sizes = [], []
+        while url:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            results.extend(body['results'])
+            sizes.append(len(body['results']))
+            url = body['next']
+        return results, sizes
+
+    def test_list_endpoints_are_paginated_and_capped(self):
+        results, sizes = self.walk('/api/players/?fields=id')
+        self.assertEqual(sizes[0], 50)
+        self.assertEqual(len(results), Player.objects.count())
+
+        _, sizes = self.walk('/api/stats/?page_size=100000')
+        self.assertEqual(max(sizes), 200)
+
+    def test_cursor_walk_over_nullable_ordering_visits_every_row_once(self):
+        results, _ = self.walk('/api/stats/?tournament=4&ordering=-runs_scored&page_size=7')
+        expected = PlayerTournamentStat.objects.filter(tournament_id=4)
+        self.assertEqual(len(results), expected.count())
+        self.assertTrue(expected.filter(runs_scored__isnull=True).exists())
+        runs = [row['batting']['runs_scored'] for row in results]
+        self.assertEqual(runs, sorted(runs, key=lambda value: -1 if value is None else value, reverse=True))
+
+        leaderboard, _ = self.walk('/api/career-stats/?page_size=9')
+        self.assertEqual(len(leaderboard), PlayerCareerStat.objects.count())
+
+    def test_cursor_pages_order_on_the_raw_column_with_nulls_lowest(self):
+        for ordering in ('-runs_scored', 'runs_scored'):
+            with self.subTest(ordering=ordering):
+                url = f'/api/stats/?tournament=4&ordering={ordering}&page_size=3'
+                with CaptureQueriesContext(connection) as queries:
+                    forward, _ = self.walk(url)
+                page_sql = next(query['sql'] for query in queries if 'ORDER BY' in query['sql'])
+                self.assertNotIn('COALESCE', page_sql)
+                self.assertIn('NULLS LAST' if ordering.startswith('-') else 'NULLS FIRST', page_sql)
+                expected = PlayerTournamentStat.objects.filter(tournament_id=4).order_by(
+                    F('runs_scored').desc(nulls_last=True) if ordering.startswith('-')
+                    else F('runs_scored').asc(nulls_first=True), 'id')
+                self.assertEqual(
+                    [(row['player_name'], row['batting']['runs_scored']) for row in forward],
+                    list(expected.values_list('player__name', 'runs_scored')),
+                )
+
+                if ordering.startswith('-'):
+                    # Back from the second page through `previous` (ascending, both pages are all NULLs)
+                    second = self.client.get(self.client.get(url).json()['next'], HTTP_ACCEPT='application/json')
+                    first = self.client.get(second.json()['previous'], HTTP_ACCEPT='application/json')
+                    self.assertEqual(first.json()['results'], forward[:3])
+
+    def test_paginator_mirrors_the_installed_drf(self):
+        # On a DRF upgrade, diff CursorPagination.paginate_queryset against
+        # StatsCursorPagination.paginate_queryset, then bump MIRRORED_DRF_VERSION
+        installed = '.'.join(rest_framework.VERSION.split('.')[:2])
+        self.assertEqual(installed, MIRRORED_DRF_VERSION)
+
+    def test_sparse_fieldset_skips_nested_stats(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/players/?fields=id,name', HTTP_ACCEPT='application/json')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'name'})
+
+        response = self.client.get('/api/players/?fields=name,stats', HTTP_ACCEPT='application/json')
+        player = response.json()['results'][0]
+        self.assertEqual(set(player), {'name', 'stats'})
+        # Nested stat rows keep their full shape
+        self.assertIn('batting', player['stats'][0])
+
+        response = self.client.get('/api/stats/?fields=player_name,batting', HTTP_ACCEPT='application/json')
+        self.assertEqual(set(response.json()['results'][0]), {'player_name', 'batting'})
+
+
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def get(self, url, **headers):
+        return self.client.get(url, HTTP_ACCEPT='application/json', **headers)
+
+    def test_cached_response_is_served_with_one_query_and_revalidates(self):
+        first = self.get('/api/career-stats/')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', first)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get('/api/career-stats/')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(second.content, first.content)
+
+        not_modified = self.get('/api/career-stats/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        since = self.get('/api/career-stats/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(since.status_code, 304)
+
+    def test_data_change_invalidates_cached_responses(self):
+        player = Player.objects.get(name='Aditya')
+        first = self.get(f'/api/players/{player.pk}/')
+
+        stat = PlayerTournamentStat.objects.filter(player=player).first()
+        self.assertEqual(self.client.delete(f'/api/stats/{stat.pk}/').status_code, 204)
+
+        after = self.get(f'/api/players/{player.pk}/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after['ETag'], first['ETag'])
+        self.assertEqual(len(after.json()['stats']), len(first.json()['stats']) - 1)
+
+    def test_unchanged_incremental_import_keeps_the_cache(self):
+        with open('master_stats.csv', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        etag = self.get('/api/tournaments/')['ETag']
+
+        IncrementalStatsImporter().run(rows)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get('/api/tournaments/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(len(queries), 1)
+
+        # A bump re-renders, but identical content keeps its strong ETag
+        bump_data_version()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get('/api/tournaments/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(len(queries), 2)
+
+
+class FastJSONPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def fetch_pages(self, url, fast):
+        """Every page body of a cursor walk, with the fast path on or off."""
+        from .views import CareerStatsViewSet, PlayerTournamentStatViewSet
+        bodies = []
+        with mock.patch.object(PlayerTournamentStatViewSet, 'fast_path_enabled', fast), \
+                mock.patch.object(CareerStatsViewSet, 'fast_path_enabled', fast):
+            while url:
+                cache.clear()
+                response = self.client.get(url, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                bodies.append(response.content)
+                url = response.json()['next']
+        return bodies
+
+    def test_fast_path_is_byte_identical_to_the_serializers(self):
+        urls = [
+            '/api/stats/?page_size=40',
+            '/api/stats/?tournament=4&ordering=-runs_scored&page_size=7',
+            '/api/stats/?team_name__iexact=gajapade&ordering=team_name',
+            '/api/stats/?ordering=-batting_average&runs_scored__gte=20',
+            '/api/stats/?ordering=tournament',
+            '/api/career-stats/?page_size=9',
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                fast = self.fetch_pages(url, fast=True)
+                self.assertGreater(len(fast), 1 if 'page_size' in url else 0)
+                self.assertEqual(fast, self.fetch_pages(url, fast=False))
+
+    def test_line_separators_are_escaped_like_drf(self):
+        stat = PlayerTournamentStat.objects.first()
+        stat.team_name = 'Team \u2028\u00fc\u2029'
+        stat.save()
+        url = f'/api/stats/?player={stat.player_id}'
+        fast = self.fetch_pages(url, fast=True)
+        self.assertIn(b'\\u2028', fast[0])
+        self.assertEqual(fast, self.fetch_pages(url, fast=False))
+
+
+@override_settings(NOTIFICATION_RECIPIENTS=['admin@example.com', 'captain@example.com'])
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.players = [Player.objects.create(name=name) for name in ('Vinay', 'Rahul', 'Kiran')]
+
+    def request_edit(self, player):
+        response = self.client.post(
+            f'/api/players/{player.pk}/request-edit/', {'batting_style': 'Left'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def send(self, **options):
+        call_command('send_notifications', stdout=io.StringIO(), **options)
+
+    def test_request_edit_only_queues_the_email(self):
+        self.request_edit(self.players[0])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Notification.objects.filter(status='pending').count(), 2)
+
+    def test_worker_sends_one_digest_per_recipient(self):
+        for player in self.players:
+            self.request_edit(player)
+        self.send()
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['admin@example.com', 'captain@example.com'])
+        digest = mail.outbox[0]
+        self.assertEqual(digest.subject, '3 New Player Edit Requests')
+        self.assertTrue(all(player.name in digest.body for player in self.players))
+        self.assertFalse(Notification.objects.exclude(status='sent').exists())
+
+        # Nothing left to send
+        self.send()
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_batches_split_a_large_backlog(self):
+        for player in self.players:
+            self.request_edit(player)
+        worker = OutboxWorker(batch_size=4)
+        self.assertEqual([worker.run_batch(), worker.run_batch(), worker.run_batch()], [4, 2, 0])
+        self.assertEqual(worker.notifications_sent, 6)
+        self.assertEqual(len(mail.outbox), worker.emails_sent)
+
+    def test_failed_sends_back_off_then_give_up(self):
+        self.request_edit(self.players[0])
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP down')):
+            self.send()
+            retry_at = {n.next_attempt_at for n in Notification.objects.all()}
+            self.assertTrue(all(at > timezone.now() for at in retry_at))
+            self.assertEqual(set(Notification.objects.values_list('attempts', flat=True)), {1})
+
+            # Not due yet: a second run leaves the rows alone
+            self.send()
+            self.assertEqual(set(Notification.objects.values_list('attempts', flat=True)), {1})
+
+            Notification.objects.update(next_attempt_at=timezone.now())
+            self.send(max_attempts=2)
+        self.assertEqual(set(Notification.objects.values_list('status', 'attempts')), {('failed', 2)})
+        self.assertIn('SMTP down', Notification.objects.first().last_error)
+
+        # Sending works again, but failed rows are not retried
+        self.send()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxWorker().run_batch(), 0)
+
+    def test_unreachable_server_counts_as_a_failed_attempt(self):
+        self.request_edit(self.players[0])
+        refused = ConnectionRefusedError('no SMTP server')
+        with mock.patch('django.core.mail.backends.base.BaseEmailBackend.open', side_effect=refused):
+            worker = OutboxWorker(max_attempts=2)
+            self.assertEqual(worker.run_batch(), 2)
+            self.assertEqual(worker.notifications_retried, 2)
+            self.assertEqual(set(Notification.objects.values_list('status', 'attempts')), {('pending', 1)})
+
+            Notification.objects.update(next_attempt_at=timezone.now())
+            worker.run_batch()
+        self.assertEqual(set(Notification.objects.values_list('status', 'attempts')), {('failed', 2)})
+        self.assertIn('no SMTP server', Notification.objects.first().last_error)
+
+
+class EditRequestApprovalTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.vinay = Player.objects.create(name='Vinay', contact_number='111')
+        self.rahul = Player.objects.create(name='Rahul')
+        PlayerTournamentStat.objects.create(
+            player=self.vinay, tournament=Tournament.objects.create(name='Cup', year=2024), runs_scored=10
+        )
+        refresh_career_stats()
+        bump_data_version()
+
+    def edit(self, player, **changes):
+        return PlayerEditRequest.objects.create(player=player, proposed_changes=changes)
+
+    def test_requests_for_a_player_are_merged_in_order(self):
+        first = self.edit(self.vinay, name='Vinay K', batting_style='Left')
+        second = self.edit(self.vinay, name='Vinay Kumar')
+        other = self.edit(self.rahul, playing_role='Bowler')
+
+        with CaptureQueriesContext(connection) as queries:
+            results = approve_edit_requests([other.pk, first.pk, second.pk])
+        self.assertEqual([result['status'] for result in results], ['approved'] * 3)
+        self.assertEqual([result['id'] for result in results], [other.pk, first.pk, second.pk])
+
+        self.vinay.refresh_from_db()
+        self.assertEqual((self.vinay.name, self.vinay.batting_style), ('Vinay Kumar', 'Left'))
+        self.assertEqual(Player.objects.get(pk=self.rahul.pk).playing_role, 'Bowler')
+        self.assertEqual(PlayerCareerStat.objects.get(player=self.vinay).player_name, 'Vinay Kumar')
+        self.assertFalse(PlayerEditRequest.objects.exclude(status='approved').exists())
+
+        # The same number of queries no matter how many requests
+        for i in range(20):
+            self.edit(self.rahul, playing_role=f'Role {i}')
+        pending = list(PlayerEditRequest.objects.filter(status='pending').values_list('pk', flat=True))
+        with CaptureQueriesContext(connection) as many:
+            approve_edit_requests(pending)
+        self.assertEqual(len(many), len(queries))
+
+    def test_invalid_requests_are_rejected_without_blocking_the_rest(self):
+        bad_field = self.edit(self.rahul, id=99)
+        too_long = self.edit(self.rahul, playing_role='x' * 51)
+        taken = self.edit(self.rahul, contact_number='111')
+        good = self.edit(self.rahul, bowling_style='Off spin')
+        vinay_request = self.edit(self.vinay, contact_number='222')
+        done = self.edit(self.vinay, name='Vinay')
+        done.status = 'approved'
+        done.save()
+
+        results = {result['id']: result for result in approve_edit_requests(
+            [bad_field.pk, too_long.pk, taken.pk, good.pk, done.pk, 12345]
+        )}
+        self.assertEqual(results[bad_field.pk]['errors'], {'id': ['Unknown or read-only field.']})
+        self.assertIn('playing_role', results[too_long.pk]['errors'])
+        self.assertIn('contact_number', results[taken.pk]['errors'])
+        self.assertEqual(results[good.pk]['status'], 'approved')
+        self.assertEqual(results[done.pk]['status'], 'skipped')
+        self.assertEqual(results[12345]['status'], 'not_found')
+
+        self.rahul.refresh_from_db()
+        self.assertEqual((self.rahul.bowling_style, self.rahul.contact_number), ('Off spin', None))
+        self.assertEqual(PlayerEditRequest.objects.get(pk=taken.pk).status, 'rejected')
+
+        # Once Vinay gives up '111', Rahul can take it in the same batch
+        swap = self.edit(self.rahul, contact_number='111')
+        results = approve_edit_requests([vinay_request.pk, swap.pk])
+        self.assertEqual([result['status'] for result in results], ['approved', 'approved'])
+
+    def test_malformed_unique_value_rejects_only_its_request(self):
+        malformed = self.edit(self.rahul, contact_number=['123'])
+        nested = self.edit(self.rahul, name={'first': 'Rahul'})
+        good = self.edit(self.rahul, contact_number='333')
+        other = self.edit(self.vinay, playing_role='Captain')
+
+        results = {result['id']: result for result in approve_edit_requests(
+            [malformed.pk, nested.pk, good.pk, other.pk]
+        )}
+        self.assertEqual(results[malformed.pk]['status'], 'rejected')
+        self.assertIn('contact_number', results[malformed.pk]['errors'])
+        self.assertIn('name', results[nested.pk]['errors'])
+        self.assertEqual((results[good.pk]['status'], results[other.pk]['status']), ('approved', 'approved'))
+        self.rahul.refresh_from_db()
+        self.assertEqual((self.rahul.name, self.rahul.contact_number), ('Rahul', '333'))
+
+    def test_api_action_requires_an_admin(self):
+        edit_request = self.edit(self.vinay, playing_role='Captain')
+        url = '/api/edit-requests/approve/'
+        self.assertEqual(self.client.post(url, {'ids': [edit_request.pk]}, content_type='application/json').status_code, 403)
+
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        response = self.client.post(url, {'ids': [edit_request.pk]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['approved'], 1)
+        self.assertEqual(response.json()['results'], [{'id': edit_request.pk, 'player': self.vinay.pk, 'status': 'approved'}])
+
+        response = self.client.post(f'/api/edit-requests/{edit_request.pk}/approve/')
+        self.assertEqual(response.json()['skipped'], 1)
+        self.assertEqual(self.client.post(url, {'ids': 'all'}, content_type='application/json').status_code, 400)
+
+    def test_api_action_rejects_a_list_body_and_bool_ids(self):
+        edit_request = self.edit(self.vinay, playing_role='Captain')
+        self.client.force_login(User.objects.create_user('admin', is_staff=True))
+        url = '/api/edit-requests/approve/'
+        for body in ([edit_request.pk], {'ids': [True]}, {'ids': [edit_request.pk, False]}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post(url, body, content_type='application/json').status_code, 400)
+        edit_request.refresh_from_db()
+        self.assertEqual(edit_request.status, 'pending')
+
+
+class AsyncReadAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('import_stats', file='master_stats.csv', bulk=True, stdout=io.StringIO())
+
+    def sync_results(self, url):
+        results = []
+        while url:
+            body = self.client.get(url, HTTP_ACCEPT='application/json').json()
+            results.extend(body['results'])
+            url = body['next']
+        return results
+
+    async def async_results(self, url):
+        results = []
+        while url:
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            results.extend(body['results'])
+            url = body['next']
+        return results
+
+    async def test_async_endpoints_match_the_sync_api(self):
+        for sync_url, async_url in [
+            ('/api/players/?page_size=200', '/api/async/players/?page_size=7'),
+            ('/api/stats/?tournament=4&runs_scored__gte=20', '/api/async/stats/?tournament=4&runs_scored__gte=20&page_size=5'),
+            ('/api/career-stats/rank/?by=total_wickets&limit=100', '/api/async/career-stats/rank/?by=total_wickets&limit=6'),
+        ]:
+            with self.subTest(url=async_url):
+                expected = await sync_to_async(self.sync_results)(sync_url)
+                self.assertTrue(expected)
+                self.assertEqual(await self.async_results(async_url), expected)
+
+        player = await Player.objects.afirst()
+        response = await self.async_client.get(f'/api/async/players/{player.pk}/')
+        expected = await sync_to_async(self.client.get)(f'/api/players/{player.pk}/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.content, expected.content)
+
+    async def test_async_errors(self):
+        self.assertEqual((await self.async_client.get('/api/async/players/999999/')).status_code, 404)
+        self.assertEqual((await self.async_client.get('/api/async/stats/?tournament=abc')).status_code, 400)
+        self.assertEqual((await self.async_client.get('/api/async/stats/?cursor=!!')).status_code, 400)
+        self.assertEqual((await self.async_client.get('/api/async/career-stats/rank/?by=nope')).status_code, 400)
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def settings_for(self, **env):
+        env = {'DB_PASSWORD': 'secret', **env}
+
+        def config(name, default=None, cast=None):
+            # decouple's config() against `env` instead of the process environment
+            if name not in env:
+                return default
+            if cast is bool:
+                return env[name].lower() in ('1', 'true', 'yes')
+            return cast(env[name]) if cast else env[name]
+        return database_settings(config)
+
+    def test_persistent_connections_by_default(self):
+        database = self.settings_for()
+        self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (60, True))
+        self.assertNotIn('pool', database['OPTIONS'])
+        self.assertIsNone(self.settings_for(DB_CONN_MAX_AGE='None')['CONN_MAX_AGE'])
+
+    def test_pool_replaces_persistent_connections(self):
+        database = self.settings_for(DB_POOL='true', DB_POOL_MAX_SIZE='20')
+        self.assertEqual(database['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10.0})
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+
+    def test_sqlite_and_unknown_engines(self):
+        database = self.settings_for(DB_ENGINE='sqlite3', DB_POOL='true')
+        self.assertEqual(database['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(database['OPTIONS'], {})
+        with self.assertRaises(ImproperlyConfigured):
+            self.settings_for(DB_ENGINE='mysql')
+
+
+class ProcessExcelTests(SimpleTestCase):
+    def setUp(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.directory = Path(scratch.name)
+        self.batting, self.bowling = synthetic.write_workbooks(self.directory, 300)
+        self.cache_dir = self.directory / 'cache'
+
+    def build(self, **options):
+        options.setdefault('cache_dir', self.cache_dir)
+        return process_excel.build_master_frame(self.batting, self.bowling, **options)
+
+    def test_single_pass_read_matches_pandas_header_read(self):
+        frame = process_excel.process_excel_file(self.batting, workers=1, cache_dir=None)
+        xls = pd.ExcelFile(self.batting)
+        expected = pd.read_excel(xls, sheet_name=xls.sheet_names[0], header=1)
+        first = frame[frame['tournament_id'] == 1].reset_index(drop=True)
+        self.assertEqual(list(first['highest_score']), list(expected['Highest']))
+        self.assertEqual(first['player_name'][0], expected['Player Name'][0].strip().title())
+
+        self.assertEqual(
+            dict(first.drop(columns='tournament_id').dtypes), dict(expected.rename(columns=process_excel.COLUMN_MAP).dtypes)
+        )
+
+        # A blank header cell and a repeated header are named as pandas names them
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'Tournament 7'
+        sheet.append(['Batting'])
+        sheet.append(['Player Name', 'Runs', None, 'Runs', 'Runs.1', 'Team Name'])
+        sheet.append([' ravi kumar', 10, 'x', 3, 4, 'Gajapade'])
+        path = self.directory / 'odd_headers.xlsx'
+        workbook.save(path)
+        parsed = process_excel.parse_sheet(str(path), 'Tournament 7')
+        expected = pd.read_excel(path, header=1).rename(columns=process_excel.COLUMN_MAP)
+        self.assertEqual(list(parsed.columns), list(expected.columns) + ['tournament_id'])
+        self.assertEqual(list(parsed.columns[:5]), ['player_name', 'runs_scored', 'Unnamed: 2', 'Runs.2', 'Runs.1'])
+        self.assertEqual(parsed['runs_scored'].tolist(), [10])
+
+        master = self.build(workers=2)
+        self.assertEqual(len(master), 300)
+        self.assertEqual(list(master.columns), process_excel.FINAL_COLUMNS_ORDER)
+        pd.testing.assert_frame_equal(master, self.build(workers=1, cache_dir=None))
+
+    def test_clean_player_names_without_strings(self):
+        for names in (pd.Series([np.nan, np.nan]), pd.Series([7, np.nan], dtype=object)):
+            with self.subTest(dtype=names.dtype):
+                pd.testing.assert_series_equal(process_excel.clean_player_names(names), names)
+        mixed = pd.Series(['  ravi   kumar ', 7, np.nan], dtype=object)
+        self.assertEqual(process_excel.clean_player_names(mixed).tolist()[:2], ['Ravi Kumar', 7])
+
+    def test_cache_reparses_only_edited_sheets(self):
+        first = self.build(workers=1)
+        with mock.patch('process_excel.parse_sheet', wraps=process_excel.parse_sheet) as parse:
+            pd.testing.assert_frame_equal(self.build(workers=1), first)
+            self.assertEqual(parse.call_count, 0)
+
+            workbook = openpyxl.load_workbook(self.bowling)
+            workbook['Tournament 1']['E3'] = 999  # runs conceded of the first bowler
+            workbook.save(self.bowling)
+            edited = self.build(workers=1)
+            self.assertEqual([call.args[1] for call in parse.call_args_list], ['Tournament 1'])
+        self.assertEqual(edited['runs_conceded'].tolist().count(999), 1)
@@ -2,8 +2,10 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .profiling import profiling_stats
 from .views import (
-    PlayerViewSet, PlayerTournamentStatViewSet, CareerStatsViewSet, TournamentViewSet
+    PlayerViewSet, PlayerTournamentStatViewSet, CareerStatsViewSet, TournamentViewSet,
+    PlayerEditRequestViewSet, TeamViewSet
 )
 
 router = DefaultRouter()
@@ -11,7 +13,13 @@ router.register(r'players', PlayerViewSet)
 router.register(r'stats', PlayerTournamentStatViewSet)
 router.register(r'career-stats', CareerStatsViewSet, basename='career-stats')
 router.register(r'tournaments', TournamentViewSet)
+router.register(r'teams', TeamViewSet)
+router.register(r'edit-requests', PlayerEditRequestViewSet)
 
 urlpatterns = [
+    # Async read endpoints, for ASGI deployments
+    path('async/', include('api.async_views')),
+    # Per-route request timings, for admins; empty unless PROFILING=True
+    path('profiling/', profiling_stats, name='profiling-stats'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
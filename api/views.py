@@ -1,19 +1,105 @@
 # In api/views.py
 
-from rest_framework import viewsets, status
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import viewsets, status, filters, permissions, renderers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum, Max
-from django.core.mail import send_mail
-from .models import Player, PlayerTournamentStat, Tournament, PlayerEditRequest
+
+from django.db.models import Prefetch
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from .approvals import approve_edit_requests
+from .caching import CachedReadMixin, bump_data_version
+from .career import (
+    RANKING_METRICS, decode_rank_cursor, encode_rank_cursor, ranking_queryset, ranks_above, refresh_career_stats
+)
+from .export import (
+    ARROW_STREAM_MEDIA_TYPE, CAREER_CSV_COLUMNS, STAT_CSV_COLUMNS, arrow_available, stream_arrow_ipc, stream_csv
+)
+from .fastpath import CAREER_ROW_MAPPER, STAT_ROW_MAPPER, FastListMixin
+from .filters import NUMERIC_STAT_FIELDS, PlayerTournamentStatFilter
+from .metrics import recompute_stat_metrics
+from .models import Player, PlayerTournamentStat, Team, Tournament, PlayerEditRequest, PlayerCareerStat
+from .notifications import enqueue_edit_request
+from .search import search_players
 from .serializers import (
     PlayerSerializer, PlayerTournamentStatSerializer, CareerStatsSerializer, TournamentSerializer,
-    PlayerEditRequestSerializer
+    PlayerEditRequestSerializer, RankedCareerStatsSerializer, TeamSerializer
 )
+from .teams import TOP_PERFORMER_METRICS, link_teams, player_team_record, team_totals, top_performers
 
-class PlayerViewSet(viewsets.ModelViewSet):
-    queryset = Player.objects.all()
+class PlayerViewSet(CachedReadMixin, viewsets.ModelViewSet):
+    # Load every player's stats (and their tournaments) in one extra query
+    queryset = Player.objects.prefetch_related(
+        Prefetch(
+            'playertournamentstat_set',
+            queryset=PlayerTournamentStat.objects.select_related('tournament'),
+        )
+    )
     serializer_class = PlayerSerializer
+    # Only the profile page and search are cached; the list changes shape with ?fields=
+    cached_actions = ('retrieve', 'search', 'teams')
+    # Max SQL queries per action, enforced by api.tests.QueryBudgetTests
+    query_budget = {'list': 2, 'retrieve': 3, 'search': 3, 'teams': 3}
+
+    default_search_limit = 10
+    max_search_limit = 50
+
+    def get_queryset(self):
+        # ?fields= without 'stats' skips the nested block, so skip loading it too
+        requested = PlayerSerializer.requested_fields(self.request)
+        if self.action == 'teams' or (requested is not None and 'stats' not in requested):
+            return Player.objects.all()
+        return super().get_queryset()
+
+    def perform_create(self, serializer):
+        player = serializer.save()
+        refresh_career_stats([player.pk])
+        bump_data_version()
+
+    def perform_update(self, serializer):
+        player = serializer.save()
+        refresh_career_stats([player.pk])
+        bump_data_version()
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        bump_data_version()
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Players by name, e.g. /api/players/search/?q=rahul&limit=10
+
+        Names starting with the query come first, then names with a word
+        starting with it, then similar spellings (see api/search.py).
+        """
+        return self.cached_response(self.searching, request)
+
+    def searching(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'q': ['This parameter is required.']}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_search_limit)), self.max_search_limit)
+        except ValueError:
+            return Response({'detail': 'Invalid limit.'}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({'detail': 'Invalid limit.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = search_players(query, limit)
+        for result in results:
+            result['score'] = round(result['score'], 3)
+        return Response({'query': query, 'results': results})
+
+    @action(detail=True, methods=['get'])
+    def teams(self, request, pk=None):
+        """The player's record for each team they played for, e.g. /api/players/5/teams/"""
+        return self.cached_response(self.team_record, request, pk=pk)
+
+    def team_record(self, request, pk=None):
+        player = self.get_object()
+        return Response({'player_id': player.pk, 'name': player.name, 'teams': player_team_record(player.pk)})
 
     # 🚨 New custom action to handle edit requests
     @action(detail=True, methods=['post'], url_path='request-edit')
@@ -21,17 +107,10 @@ class PlayerViewSet(viewsets.ModelViewSet):
         player = self.get_object()
         serializer = PlayerEditRequestSerializer(data={'player': player.id, 'proposed_changes': request.data})
         if serializer.is_valid():
-            serializer.save()
-
-            # 🚨 Send an email notification to the admin
-            send_mail(
-                'New Player Edit Request',
-                f'A new edit request has been submitted for {player.name}. Please review it in the Django admin panel.',
-                'noreply@yourdomain.com', # Replace with a valid sender email
-                ['your-admin-email@example.com'], # Replace with your admin email
-                fail_silently=False,
-            )
-            
+            # The admin email is queued with the request and sent by `manage.py send_notifications`
+            with transaction.atomic():
+                enqueue_edit_request(serializer.save())
+
             return Response(
                 {'status': 'Edit request submitted for approval.'},
                 status=status.HTTP_201_CREATED
@@ -40,29 +119,240 @@ class PlayerViewSet(viewsets.ModelViewSet):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PlayerTournamentStatViewSet(viewsets.ModelViewSet):
-    queryset = PlayerTournamentStat.objects.all()
+class ArrowStreamRenderer(renderers.JSONRenderer):
+    """Lets clients ask for Arrow with Accept or ?format=arrow; only error bodies go through it, as JSON."""
+    media_type = ARROW_STREAM_MEDIA_TYPE
+    format = 'arrow'
+
+class CSVStreamRenderer(renderers.JSONRenderer):
+    """Same as ArrowStreamRenderer, for text/csv."""
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+def csv_response(rows, filename):
+    """Streams CSV text from `rows` (see api.export.stream_csv), never cached."""
+    response = StreamingHttpResponse(rows, content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class PlayerTournamentStatViewSet(FastListMixin, viewsets.ModelViewSet):
+    queryset = PlayerTournamentStat.objects.select_related('player', 'tournament')
     serializer_class = PlayerTournamentStatSerializer
-    filterset_fields = ['tournament']
+    # JSON lists skip the serializer (see api/fastpath.py)
+    row_mapper = STAT_ROW_MAPPER
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = PlayerTournamentStatFilter
+    # e.g. ?tournament=4&ordering=-runs_scored (served by stat_tournament_runs_idx)
+    ordering_fields = ['id', 'team_name', 'tournament', 'player'] + NUMERIC_STAT_FIELDS
+    ordering = ['id']
+    query_budget = {'list': 1, 'retrieve': 1, 'arrow': 1, 'export_csv': 1}
+
+    @action(detail=False, methods=['get'], renderer_classes=[renderers.JSONRenderer, ArrowStreamRenderer])
+    def arrow(self, request):
+        """
+        Every stat matching the list filters as one Arrow IPC stream, for bulk
+        consumers (see api/export.py), e.g. /api/stats/arrow/?tournament=4
+        """
+        if not arrow_available():
+            return Response(
+                {'detail': 'Arrow export is not available: pyarrow is not installed.'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(stream_arrow_ipc(queryset), content_type=ARROW_STREAM_MEDIA_TYPE)
+        response['Content-Disposition'] = 'attachment; filename="stats.arrows"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='csv', renderer_classes=[renderers.JSONRenderer, CSVStreamRenderer])
+    def export_csv(self, request):
+        """Every stat matching the list filters as CSV, streamed as it is read, e.g. /api/stats/csv/?tournament=4"""
+        return csv_response(stream_csv(self.filter_queryset(self.get_queryset()), STAT_CSV_COLUMNS), 'stats.csv')
+
+    # Keep the precomputed career totals in step with every write
+    def perform_create(self, serializer):
+        stat = serializer.save()
+        recompute_stat_metrics([stat.player_id])
+        link_teams([stat.player_id])
+        refresh_career_stats([stat.player_id])
+        bump_data_version()
+
+    def perform_update(self, serializer):
+        previous_player_id = serializer.instance.player_id
+        stat = serializer.save()
+        recompute_stat_metrics([stat.player_id])
+        link_teams([stat.player_id])
+        refresh_career_stats([previous_player_id, stat.player_id])
+        bump_data_version()
+
+    def perform_destroy(self, instance):
+        player_id = instance.player_id
+        instance.delete()
+        refresh_career_stats([player_id])
+        bump_data_version()
 
-class TournamentViewSet(viewsets.ReadOnlyModelViewSet):
+class PlayerEditRequestViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Edit requests for admins to review. Approve them in bulk with
+    POST /api/edit-requests/approve/ {"ids": [1, 2, 3]}
+    or one at a time with POST /api/edit-requests/{id}/approve/.
+    """
+    queryset = PlayerEditRequest.objects.order_by('id')
+    serializer_class = PlayerEditRequestSerializer
+    permission_classes = [permissions.IsAdminUser]
+    filterset_fields = ['status', 'player']
+    ordering = ['id']
+    # Includes the session and user lookups of the admin's login
+    query_budget = {'list': 3, 'retrieve': 3}
+
+    @action(detail=False, methods=['post'], url_path='approve')
+    def approve_many(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        # bool is an int subclass, but true/false are not ids
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return Response({'ids': ['Expected a non-empty list of request ids.']}, status=status.HTTP_400_BAD_REQUEST)
+        return self.approval_response(approve_edit_requests(ids))
+
+    @action(detail=True, methods=['post'])
+    def approve(self, request, pk=None):
+        return self.approval_response(approve_edit_requests([self.get_object().pk]))
+
+    @staticmethod
+    def approval_response(results):
+        counts = {key: 0 for key in ('approved', 'rejected', 'skipped', 'not_found')}
+        for result in results:
+            counts[result['status']] += 1
+        return Response({**counts, 'results': results})
+
+class TournamentViewSet(CachedReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tournament.objects.all().order_by('id')
     serializer_class = TournamentSerializer
+    cached_actions = ('list', 'retrieve', 'teams')
+    query_budget = {'list': 2, 'retrieve': 2, 'teams': 3}
+
+    @action(detail=True, methods=['get'])
+    def teams(self, request, pk=None):
+        """Every team's totals in the tournament, most runs first, e.g. /api/tournaments/4/teams/"""
+        return self.cached_response(self.team_standings, request, pk=pk)
+
+    def team_standings(self, request, pk=None):
+        tournament = self.get_object()
+        return Response({'tournament_id': tournament.pk, 'teams': team_totals(tournament=tournament.pk)})
+
+class TeamViewSet(CachedReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Teams, each with its totals per tournament (see api/teams.py), and its
+    top performers: /api/teams/7/top/?by=wickets_taken&tournament=4&limit=5
+    """
+    queryset = Team.objects.order_by('name', 'id')
+    serializer_class = TeamSerializer
+    cached_actions = ('list', 'retrieve', 'top')
+    query_budget = {'list': 2, 'retrieve': 3, 'top': 3}
+
+    default_top_limit = 10
+    max_top_limit = 50
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(self.team_page, request, *args, **kwargs)
+
+    def team_page(self, request, *args, **kwargs):
+        team = self.get_object()
+        return Response({**self.get_serializer(team).data, 'tournaments': team_totals(team=team.pk)})
+
+    @action(detail=True, methods=['get'])
+    def top(self, request, pk=None):
+        return self.cached_response(self.top_players, request, pk=pk)
 
-class CareerStatsViewSet(viewsets.ReadOnlyModelViewSet):
+    def top_players(self, request, pk=None):
+        metric = request.query_params.get('by', 'runs_scored')
+        if metric not in TOP_PERFORMER_METRICS:
+            return Response(
+                {'by': [f"Unknown metric. Choose one of: {', '.join(TOP_PERFORMER_METRICS)}."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_top_limit)), self.max_top_limit)
+            tournament = request.query_params.get('tournament')
+            tournament_id = int(tournament) if tournament else None
+        except ValueError:
+            return Response({'detail': 'Invalid limit or tournament.'}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({'detail': 'Invalid limit or tournament.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        team = self.get_object()
+        return Response({
+            'team_id': team.pk,
+            'tournament_id': tournament_id,
+            'by': metric,
+            'results': top_performers(team.pk, metric, limit, tournament_id),
+        })
+
+class CareerStatsViewSet(CachedReadMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     This view provides aggregated career stats for each player.
+    Reads the precomputed PlayerCareerStat table (see api/career.py).
     """
+    queryset = PlayerCareerStat.objects.order_by('-total_runs', 'player')
     serializer_class = CareerStatsSerializer
+    row_mapper = CAREER_ROW_MAPPER
+    # Leaderboard order, also used by the cursor pagination
+    ordering = ['-total_runs', 'player']
+    cached_actions = ('list', 'retrieve', 'rank')
+    query_budget = {'list': 2, 'retrieve': 2, 'rank': 2, 'export_csv': 1}
 
-    def get_queryset(self):
-        return Player.objects.annotate(
-            total_matches=Sum('playertournamentstat__matches_played'),
-            total_runs=Sum('playertournamentstat__runs_scored'),
-            total_wickets=Sum('playertournamentstat__wickets_taken'),
-            career_highest_score=Max('playertournamentstat__highest_score'),
-            total_not_outs=Sum('playertournamentstat__not_outs'),
-            total_fours=Sum('playertournamentstat__fours'),
-            total_sixes=Sum('playertournamentstat__sixes'),
-            total_maidens=Sum('playertournamentstat__maidens')
-        ).order_by('-total_runs')
\ No newline at end of file
+    default_rank_limit = 10
+    max_rank_limit = 100
+
+    @action(detail=False, methods=['get'])
+    def rank(self, request):
+        """
+        Top-K leaderboard for any metric in RANKING_METRICS, e.g.
+        /api/career-stats/rank/?by=total_wickets&limit=10
+
+        Results carry a dense rank computed in the database. Follow `next`
+        (keyset pagination on (metric, player)) for the following page.
+        """
+        return self.cached_response(self.ranking, request)
+
+    @action(detail=False, methods=['get'], url_path='csv', renderer_classes=[renderers.JSONRenderer, CSVStreamRenderer])
+    def export_csv(self, request):
+        """The whole career table in leaderboard order as CSV, streamed as it is read."""
+        return csv_response(stream_csv(self.filter_queryset(self.get_queryset()), CAREER_CSV_COLUMNS), 'career-stats.csv')
+
+    def ranking(self, request):
+        metric = request.query_params.get('by', 'total_runs')
+        if metric not in RANKING_METRICS:
+            return Response(
+                {'by': [f"Unknown metric. Choose one of: {', '.join(RANKING_METRICS)}."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_rank_limit)), self.max_rank_limit)
+            after = decode_rank_cursor(request.query_params.get('cursor'))
+        except (TypeError, ValueError):
+            return Response({'detail': 'Invalid limit or cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({'detail': 'Invalid limit or cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        page = list(ranking_queryset(metric, after)[:limit + 1])
+        if after is not None and page:
+            # The window only sees rows after the cursor; offset by the distinct values ranked above them
+            base_rank = ranks_above(metric, getattr(page[0], metric)).count()
+            for career in page:
+                career.rank += base_rank
+
+        next_url = None
+        if len(page) > limit:
+            page = page[:limit]
+            last = page[-1]
+            cursor = encode_rank_cursor(getattr(last, metric), last.player_id)
+            next_url = request.build_absolute_uri(
+                f"{request.path}?by={metric}&limit={limit}&cursor={cursor}"
+            )
+
+        return Response({
+            'by': metric,
+            'next': next_url,
+            'results': RankedCareerStatsSerializer(page, many=True).data,
+        })
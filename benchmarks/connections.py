@@ -0,0 +1,89 @@
+# In benchmarks/connections.py
+
+"""
+Measures what database connection reuse saves per request.
+
+Sends requests through Django's real WSGI handler, which closes or keeps
+the connection at the end of each request according to CONN_MAX_AGE and
+CONN_HEALTH_CHECKS, and counts how many new connections were opened. Runs
+against a scratch database of the configured backend; on SQLite it uses a
+file database so closing a connection really closes it.
+
+    python -m benchmarks.connections --requests 500
+    DB_POOL=true python -m benchmarks.connections        # PostgreSQL with psycopg[pool]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.harness import benchmark_database, percentile, setup_django, timer
+
+# (label, settings_dict overrides); a configured pool is measured on its own
+MODES = [
+    ('new connection per request', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}),
+    ('persistent', {'CONN_MAX_AGE': None, 'CONN_HEALTH_CHECKS': False}),
+    ('persistent + health checks', {'CONN_MAX_AGE': None, 'CONN_HEALTH_CHECKS': True}),
+]
+
+
+def run(handler, environ, requests):
+    """Returns (latencies, new connections) for `requests` GETs through `handler`."""
+    from django.db.backends.signals import connection_created
+
+    opened = []
+    receiver = lambda sender, connection, **kwargs: opened.append(connection.alias)
+    connection_created.connect(receiver)
+    latencies = []
+    try:
+        for _ in range(requests):
+            with timer() as elapsed:
+                response = handler(dict(environ), lambda status, headers: None)
+                b''.join(response)
+                # Ends the request: fires request_finished, which applies CONN_MAX_AGE
+                response.close()
+            latencies.append(elapsed['seconds'])
+    finally:
+        connection_created.disconnect(receiver)
+    return latencies, len(opened)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500, help='Requests per mode (default: 500).')
+    parser.add_argument('--path', default='/api/tournaments/1/', help='Endpoint to request (default: a cached detail).')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.test import RequestFactory
+    from api.models import Tournament
+
+    settings.ALLOWED_HOSTS = ['*']
+    scratch = tempfile.TemporaryDirectory()
+    if connection.vendor == 'sqlite':
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = str(Path(scratch.name) / 'connections.sqlite3')
+
+    with benchmark_database() as connection:
+        Tournament.objects.create(id=1, name='Benchmark Cup', year=2024)
+        connection.close()
+
+        handler = WSGIHandler()
+        environ = RequestFactory(HTTP_ACCEPT='application/json')._base_environ(PATH_INFO=args.path)
+        pooled = 'pool' in connection.settings_dict.get('OPTIONS', {})
+        modes = [('psycopg pool', {})] if pooled else MODES
+        print(f"{args.requests} requests to {args.path} on {connection.vendor}\n")
+        for label, overrides in modes:
+            connection.close()
+            connection.settings_dict.update(overrides)
+            latencies, opened = run(handler, environ, args.requests)
+            print(f"== {label}")
+            print(f"   {len(latencies) / sum(latencies):8.1f} req/s   p50 {percentile(latencies, 50) * 1000:6.2f} ms"
+                  f"   p99 {percentile(latencies, 99) * 1000:6.2f} ms   {opened} connections opened\n")
+        connection.close()
+    scratch.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# In benchmarks/fast_json.py
+
+"""
+Compares /api/stats/ and /api/career-stats/ list throughput with the
+serializer-free fast path (api/fastpath.py) on and off.
+
+Loads a synthetic dataset into a scratch database, then requests the same
+pages through the test client both ways and checks the bodies are identical.
+
+    python -m benchmarks.fast_json --rows 20000 --page-size 200
+"""
+
+import argparse
+from unittest import mock
+
+from benchmarks.harness import benchmark_database, setup_django, timer
+from benchmarks import synthetic
+
+
+def run(client, url, repeat):
+    """Returns (seconds, first body) for `repeat` GETs of `url`."""
+    from django.core.cache import cache
+
+    body = None
+    with timer() as elapsed:
+        for _ in range(repeat):
+            # The career list is cached; measure rendering, not cache hits
+            cache.clear()
+            response = client.get(url, HTTP_ACCEPT='application/json')
+            assert response.status_code == 200, response.status_code
+            body = body or response.content
+    return elapsed['seconds'], body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000, help='Synthetic stat rows to load (default: 20000).')
+    parser.add_argument('--page-size', type=int, default=200, help='Rows per page requested (default: 200).')
+    parser.add_argument('--repeat', type=int, default=50, help='Requests per endpoint and mode (default: 50).')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+    from api import fastpath
+    from api.views import CareerStatsViewSet, PlayerTournamentStatViewSet
+
+    settings.ALLOWED_HOSTS = ['*']
+    with benchmark_database() as connection:
+        rows = synthetic.populate(args.rows)
+        print(f"Loaded {rows} stat rows into {connection.vendor}; "
+              f"encoder: {'orjson' if fastpath.orjson else 'json'}\n")
+
+        client = Client()
+        identical = True
+        for label, viewset, url in [
+            ('stats', PlayerTournamentStatViewSet, f'/api/stats/?page_size={args.page_size}'),
+            ('stats by runs', PlayerTournamentStatViewSet,
+             f'/api/stats/?ordering=-runs_scored&page_size={args.page_size}'),
+            ('career stats', CareerStatsViewSet, f'/api/career-stats/?page_size={args.page_size}'),
+        ]:
+            results = {}
+            for fast in (False, True):
+                with mock.patch.object(viewset, 'fast_path_enabled', fast):
+                    run(client, url, 1)  # warm up
+                    results[fast] = run(client, url, args.repeat)
+            (slow_seconds, slow_body), (fast_seconds, fast_body) = results[False], results[True]
+            identical = identical and slow_body == fast_body
+            print(f"== {label}: {url}")
+            print(f"   serializers: {args.repeat / slow_seconds:8.1f} req/s")
+            print(f"   fast path:   {args.repeat / fast_seconds:8.1f} req/s "
+                  f"({slow_seconds / fast_seconds:.1f}x, body {'identical' if slow_body == fast_body else 'DIFFERS'})\n")
+
+    raise SystemExit(0 if identical else 1)
+
+
+if __name__ == '__main__':
+    main()
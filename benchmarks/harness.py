@@ -0,0 +1,60 @@
+# In benchmarks/harness.py
+
+"""
+Shared setup for the benchmark scripts.
+
+Benchmarks never touch the configured database: they create a throwaway test
+database next to it (the same way `manage.py test` does) and drop it afterwards.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Makes the project importable and configures Django, honouring DJANGO_SETTINGS_MODULE."""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cricket_stats.settings")
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """Creates and migrates a scratch database for the duration of the block."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer():
+    """Yields a dict whose 'seconds' key is filled in when the block exits."""
+    result = {}
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result['seconds'] = time.perf_counter() - started
+
+
+def percentile(values, pct):
+    """The `pct`th percentile (0-100) of `values`, nearest-rank method."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
@@ -0,0 +1,145 @@
+# In benchmarks/load_async.py
+
+"""
+Load test comparing the sync API (DRF viewsets) with the async read API
+(api/async_views.py) on the same endpoints, reporting requests/sec and
+p50/p99 latency for each.
+
+By default both stacks run in-process on a scratch database: the sync
+stack through Django's WSGI request handler on a pool of `--concurrency`
+threads (like threaded WSGI workers), the async stack through the ASGI
+handler as `--concurrency` coroutines on one event loop.
+
+    python -m benchmarks.load_async --rows 20000 --requests 500 --concurrency 32
+
+With --base-url the same requests go over HTTP to running servers instead,
+e.g. gunicorn (WSGI) and uvicorn (ASGI) in front of the configured database:
+
+    python -m benchmarks.load_async --base-url http://127.0.0.1:8000 --async-base-url http://127.0.0.1:8001
+"""
+
+import argparse
+import asyncio
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.harness import benchmark_database, percentile, setup_django
+from benchmarks import synthetic
+
+# (label, sync path, async path)
+ENDPOINTS = [
+    ('players', '/api/players/?page_size=50', '/api/async/players/?page_size=50'),
+    ('player detail', '/api/players/{player}/', '/api/async/players/{player}/'),
+    ('stats', '/api/stats/?page_size=100&runs_scored__gte=20', '/api/async/stats/?page_size=100&runs_scored__gte=20'),
+    ('career rank', '/api/career-stats/rank/?by=total_wickets&limit=50',
+     '/api/async/career-stats/rank/?by=total_wickets&limit=50'),
+]
+
+
+def summarize(latencies, elapsed):
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+def run_threads(fetch, urls, concurrency):
+    """Calls `fetch(url)` for every url on `concurrency` threads; returns summary stats."""
+    def timed(url):
+        started = time.perf_counter()
+        fetch(url)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, urls))
+    return summarize(latencies, time.perf_counter() - started)
+
+async def run_coroutines(fetch, urls, concurrency):
+    """Awaits `fetch(url)` for every url, at most `concurrency` at a time; returns summary stats."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(url):
+        async with semaphore:
+            started = time.perf_counter()
+            await fetch(url)
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed(url) for url in urls))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def in_process_fetchers():
+    from django.db import connections
+    from django.test import AsyncClient, Client
+
+    def sync_fetch(url):
+        response = Client().get(url, HTTP_ACCEPT='application/json')
+        assert response.status_code == 200, (url, response.status_code)
+        connections.close_all()
+
+    client = AsyncClient()
+
+    async def async_fetch(url):
+        response = await client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+
+    return sync_fetch, async_fetch
+
+def http_fetcher():
+    def fetch(url):
+        with urllib.request.urlopen(urllib.request.Request(url, headers={'Accept': 'application/json'})) as response:
+            response.read()
+    return fetch
+
+
+def report(label, sync, async_):
+    print(f"== {label}")
+    for name, result in (('sync ', sync), ('async', async_)):
+        print(f"   {name} {result['rps']:8.1f} req/s   p50 {result['p50_ms']:7.1f} ms   p99 {result['p99_ms']:7.1f} ms")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000, help='Synthetic stat rows to load in-process (default: 20000).')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and stack (default: 500).')
+    parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once (default: 32).')
+    parser.add_argument('--base-url', help='Sync server to test over HTTP instead of in-process.')
+    parser.add_argument('--async-base-url', help='Async (ASGI) server; defaults to --base-url.')
+    parser.add_argument('--player', type=int, default=1, help='Player id for the detail endpoint (default: 1).')
+    args = parser.parse_args()
+
+    def urls(path, base=''):
+        return [base + path.format(player=args.player)] * args.requests
+
+    if args.base_url:
+        fetch = http_fetcher()
+        async_base = args.async_base_url or args.base_url
+        for label, sync_path, async_path in ENDPOINTS:
+            sync = run_threads(fetch, urls(sync_path, args.base_url), args.concurrency)
+            async_ = run_threads(fetch, urls(async_path, async_base), args.concurrency)
+            report(label, sync, async_)
+        return
+
+    setup_django()
+    from django.conf import settings
+    from api.models import Player
+
+    settings.ALLOWED_HOSTS = ['*']
+    with benchmark_database() as connection:
+        synthetic.populate(args.rows)
+        args.player = Player.objects.order_by('pk').values_list('pk', flat=True).first()
+        print(f"Loaded {args.rows} stat rows into {connection.vendor}; "
+              f"{args.requests} requests per endpoint, {args.concurrency} in flight\n")
+        sync_fetch, async_fetch = in_process_fetchers()
+        for label, sync_path, async_path in ENDPOINTS:
+            sync = run_threads(sync_fetch, urls(sync_path), args.concurrency)
+            async_ = asyncio.run(run_coroutines(async_fetch, urls(async_path), args.concurrency))
+            report(label, sync, async_)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# In benchmarks/stats_indexes.py
+
+"""
+Shows which indexes the /api/stats/ leaderboard and filter queries use.
+
+Loads a synthetic dataset into a scratch database, then prints the EXPLAIN
+plan and timing of each query as the stats endpoint would build it.
+
+    python -m benchmarks.stats_indexes --rows 100000
+"""
+
+import argparse
+
+from benchmarks.harness import benchmark_database, setup_django, timer
+from benchmarks import synthetic
+
+
+def stats_queries():
+    """(label, queryset, index expected in the plan) for the hot /api/stats/ queries."""
+    from api.filters import PlayerTournamentStatFilter
+    from api.models import PlayerTournamentStat
+    from api.pagination import StatsCursorPagination
+
+    base = PlayerTournamentStat.objects.select_related('player', 'tournament')
+    team = PlayerTournamentStat.objects.values_list('team_name', flat=True).first()
+    paginator = StatsCursorPagination()
+
+    def filtered(params, ordering):
+        # Ordered as the cursor paginator orders a page
+        queryset = PlayerTournamentStatFilter(params, queryset=base).qs
+        return queryset.order_by(*paginator._order_by(PlayerTournamentStat, ordering + ['id']))
+
+    def next_page(params, ordering, position):
+        rows, _ = paginator._after_position(filtered(params, ordering), ordering[0].lstrip('-'), position, True)
+        return rows
+
+    return [
+        ("top run scorers in a tournament (?tournament=1&ordering=-runs_scored)",
+         filtered({'tournament': 1}, ['-runs_scored'])[:10], 'stat_tournament_runs_idx'),
+        ("next page of run scorers (?tournament=1&ordering=-runs_scored&cursor=...)",
+         next_page({'tournament': 1}, ['-runs_scored'], '50')[:10], 'stat_tournament_runs_idx'),
+        ("top wicket takers in a tournament (?tournament=1&ordering=-wickets_taken)",
+         filtered({'tournament': 1}, ['-wickets_taken'])[:10], 'stat_tournament_wickets_idx'),
+        (f"one team's rows (?team_name={team})",
+         filtered({'team_name': team}, ['id'])[:10], 'stat_team_tournament_idx'),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='Synthetic stat rows to load (default: 100000).')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed executions per query (default: 20).')
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database() as connection:
+        with timer() as load:
+            rows = synthetic.populate(args.rows)
+        with connection.cursor() as cursor:
+            # Give the planner row estimates, as a production database would have
+            cursor.execute('ANALYZE')
+        print(f"Loaded {rows} stat rows into {connection.vendor} in {load['seconds']:.1f}s\n")
+
+        all_used = True
+        for label, queryset, index_name in stats_queries():
+            plan = queryset.explain()
+            with timer() as elapsed:
+                for _ in range(args.repeat):
+                    list(queryset)
+            used = index_name in plan
+            all_used = all_used and used
+            print(f"== {label}")
+            print(plan)
+            print(f"-> {index_name}: {'used' if used else 'NOT used'}, "
+                  f"{elapsed['seconds'] / args.repeat * 1000:.2f} ms/query\n")
+
+    raise SystemExit(0 if all_used else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+# In benchmarks/suite.py
+
+"""
+The benchmark suite: import_stats, every GET endpoint of the API router
+(api/urls.py) and process_excel.py, on synthetic datasets of each size.
+
+For each size it
+- writes the dataset (benchmarks/synthetic.py) as a master_stats.csv and
+  imports it into an empty scratch database with each import_stats mode;
+- loads it into the emptied database and requests every router endpoint
+  `--requests` times, with the response cache cleared before each request;
+- writes it as batting and bowling workbooks and builds the master frame from
+  them with process_excel.py, once without and once with the parsed sheet cache.
+
+Every benchmark records throughput, latency (p50/p95/p99/max for endpoints),
+SQL statements run and the peak memory Python allocated (tracemalloc, in a
+separate run so tracing does not slow down the timed one). Results are saved
+as JSON; --compare prints the change against an earlier results file.
+
+It runs on SQLite (cricket_stats.settings_test unless DJANGO_SETTINGS_MODULE
+says otherwise) with no other services:
+
+    python -m benchmarks.suite --sizes 1k,100k,1M
+    python -m benchmarks.suite --sizes 1k --only endpoints --compare benchmarks/results/before.json
+
+The 1M row size takes a while and a few GB of memory; process_excel's parser
+processes allocate outside tracemalloc's view, so its peak covers the merge only.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.harness import REPO_ROOT, benchmark_database, percentile, setup_django, timer
+from benchmarks import synthetic
+
+BENCHMARKS = ['import', 'endpoints', 'excel']
+# import_stats options per mode; each reloads the same CSV, so incremental finds nothing to change
+IMPORT_MODES = {
+    'bulk': {'bulk': True},
+    'stream': {'stream': True},
+    'incremental': {'incremental': True},
+}
+# Query string for actions with required parameters
+QUERY_STRINGS = {'player-search': '?q=player'}
+PERCENTILES = [50, 95, 99]
+RESULTS_DIR = REPO_ROOT / 'benchmarks' / 'results'
+
+
+def parse_size(text):
+    """Row count from '5000', '1k' or '1M'."""
+    text = text.strip()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:].lower(), 1)
+    digits = text[:-1] if multiplier > 1 else text
+    try:
+        rows = int(float(digits) * multiplier)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size {text!r}; use e.g. 1000, 1k or 1M.")
+    if rows < 1:
+        raise argparse.ArgumentTypeError("Sizes must be at least 1 row.")
+    return rows
+
+def size_label(rows):
+    for suffix, multiplier in (('M', 1_000_000), ('k', 1_000)):
+        if rows >= multiplier and rows % multiplier == 0:
+            return f"{rows // multiplier}{suffix}"
+    return str(rows)
+
+
+def peak_memory(run):
+    """Peak bytes Python allocated while running `run()`."""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measured(run, rows, memory):
+    """Times one `run()` and counts its queries; `rows` gives the throughput."""
+    from api.instrumentation import QueryCounter
+
+    with QueryCounter() as queries, timer() as elapsed:
+        run()
+    result = {
+        'rows': rows,
+        'seconds': round(elapsed['seconds'], 4),
+        'rows_per_second': round(rows / elapsed['seconds'], 1) if elapsed['seconds'] else None,
+        'queries': queries.count,
+    }
+    if memory:
+        result['peak_memory_bytes'] = peak_memory(run)
+    return result
+
+
+def empty_database():
+    from django.core.management import call_command
+
+    call_command('flush', interactive=False, verbosity=0)
+
+def bench_import(directory, rows, seed, memory):
+    """{mode: result} for import_stats in each of IMPORT_MODES into an empty database."""
+    from django.core.management import call_command
+
+    csv_path = synthetic.write_csv(Path(directory) / 'master_stats.csv', rows, seed)
+    empty_database()
+    results = {}
+    for mode, options in IMPORT_MODES.items():
+        def run():
+            call_command('import_stats', file=str(csv_path), stdout=io.StringIO(), **options)
+        results[mode] = measured(run, rows, memory)
+        report(f"import_stats {mode}", results[mode])
+    return results
+
+
+def endpoints():
+    """Yields (url name, url, admin only) for every GET action of every viewset in the API router."""
+    from django.urls import reverse
+    from rest_framework.permissions import IsAdminUser
+    from api.urls import router
+
+    for prefix, viewset, basename in router.registry:
+        actions = []
+        if hasattr(viewset, 'list'):
+            actions.append(('list', False))
+        if hasattr(viewset, 'retrieve'):
+            actions.append(('detail', True))
+        for extra in viewset.get_extra_actions():
+            if 'get' in extra.mapping:
+                actions.append((extra.url_name, extra.detail))
+
+        pk = viewset.queryset.order_by('pk').values_list('pk', flat=True).first()
+        for url_name, detail in actions:
+            name = f"{basename}-{url_name}"
+            url = reverse(name, args=[pk] if detail else []) + QUERY_STRINGS.get(name, '')
+            yield name, url, IsAdminUser in viewset.permission_classes
+
+def bench_endpoint(client, url, requests, memory):
+    """Latency, throughput, queries and response size of `requests` cold GETs of `url`."""
+    from django.core.cache import cache
+    from api.instrumentation import QueryCounter
+
+    def fetch():
+        response = client.get(url, HTTP_ACCEPT='application/json')
+        # Streamed exports do their work while the body is read
+        body = response.getvalue()
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}: {body[:200]!r}")
+        return body
+
+    fetch()  # warm up
+    latencies = []
+    for _ in range(requests):
+        # Cached endpoints would otherwise be measured as cache hits
+        cache.clear()
+        with QueryCounter() as queries, timer() as elapsed:
+            body = fetch()
+        latencies.append(elapsed['seconds'])
+
+    total = sum(latencies)
+    result = {
+        'url': url,
+        'requests': requests,
+        'requests_per_second': round(requests / total, 1) if total else None,
+        **{f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 3) for pct in PERCENTILES},
+        'max_ms': round(max(latencies) * 1000, 3),
+        'queries': queries.count,
+        'response_bytes': len(body),
+    }
+    if memory:
+        cache.clear()
+        result['peak_memory_bytes'] = peak_memory(fetch)
+    return result
+
+def bench_endpoints(rows, seed, requests, memory):
+    """{url name: result} for every router endpoint on a loaded dataset."""
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from api.models import Player, PlayerEditRequest
+
+    settings.ALLOWED_HOSTS = ['*']
+    empty_database()
+    synthetic.populate(rows, seed)
+    PlayerEditRequest.objects.bulk_create([
+        PlayerEditRequest(player_id=pk, proposed_changes={'playing_role': 'Batter'})
+        for pk in Player.objects.order_by('pk').values_list('pk', flat=True)[:50]
+    ])
+    admin = User.objects.create_user('benchmark-admin', is_staff=True)
+
+    results = {}
+    for name, url, admin_only in endpoints():
+        # Admin-only endpoints are measured as a logged-in admin, session lookups included
+        client = Client()
+        if admin_only:
+            client.force_login(admin)
+        results[name] = bench_endpoint(client, url, requests, memory)
+        report(name, results[name])
+    return results
+
+
+def bench_excel(directory, rows, seed, memory):
+    """{'uncached', 'cached': result} for process_excel.build_master_frame on generated workbooks."""
+    import process_excel
+
+    batting, bowling = synthetic.write_workbooks(directory, rows, seed)
+    cache_dir = Path(directory) / 'excel_cache'
+    results = {}
+    for label, cache in (('uncached', None), ('cached', cache_dir)):
+        if cache is not None:
+            process_excel.build_master_frame(batting, bowling, cache_dir=cache)  # fill the cache
+
+        def run():
+            process_excel.build_master_frame(batting, bowling, cache_dir=cache)
+        results[label] = measured(run, rows, memory)
+        del results[label]['queries']
+        report(f"process_excel {label}", results[label])
+    return results
+
+
+def report(label, result):
+    if 'p50_ms' in result:
+        line = (f"{result['requests_per_second']:9.1f} req/s   p50 {result['p50_ms']:8.2f} ms   "
+                f"p99 {result['p99_ms']:8.2f} ms   {result['queries']:3d} queries")
+    else:
+        line = f"{result['rows_per_second']:11.0f} rows/s   {result['seconds']:8.2f} s"
+        if 'queries' in result:
+            line += f"   {result['queries']:5d} queries"
+    if 'peak_memory_bytes' in result:
+        line += f"   peak {result['peak_memory_bytes'] / 2**20:8.1f} MiB"
+    print(f"   {label:<32} {line}", flush=True)
+
+
+def metadata(args):
+    """What produced the results, so that runs can be told apart."""
+    import django
+    import sqlite3
+    from django.db import connection
+
+    def git(*command):
+        try:
+            return subprocess.run(
+                ['git', *command], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git('rev-parse', 'HEAD'),
+        # Uncommitted changes to tracked files: the commit alone does not describe the code
+        'dirty': bool(status) if status is not None else None,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'database': connection.vendor,
+        'sqlite': sqlite3.sqlite_version,
+        'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+        'benchmarks': args.only,
+        'seed': args.seed,
+        'requests': args.requests,
+        'memory': not args.no_memory,
+    }
+
+
+def comparable(results):
+    """{(size, group, name): (metric, value)}, the headline figure of every benchmark in `results`."""
+    figures = {}
+    for size, groups in results['sizes'].items():
+        for group, benchmarks in groups.items():
+            for name, result in benchmarks.items():
+                metric = 'p50_ms' if 'p50_ms' in result else 'seconds'
+                figures[size, group, name] = metric, result[metric]
+    return figures
+
+def compare(baseline, results):
+    """Prints the change of every benchmark in both result sets; lower is better for both metrics."""
+    before, after = comparable(baseline), comparable(results)
+    print(f"\nCompared with {baseline['metadata'].get('commit') or 'baseline'} "
+          f"({baseline['metadata'].get('created')}):")
+    for key in sorted(before.keys() & after.keys()):
+        (metric, old), (_, new) = before[key], after[key]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"   {'/'.join(key):<56} {metric:<8} {old:10.3f} -> {new:10.3f}  ({change:+6.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=lambda value: [parse_size(size) for size in value.split(',')],
+                        default=[1_000, 100_000, 1_000_000], help='Dataset sizes in stat rows (default: 1k,100k,1M).')
+    parser.add_argument('--only', type=lambda value: value.split(','), default=BENCHMARKS,
+                        help=f"Benchmarks to run (default: {','.join(BENCHMARKS)}).")
+    parser.add_argument('--requests', type=int, default=20, help='Timed requests per endpoint (default: 20).')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic data seed (default: 0).')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc runs.')
+    parser.add_argument('--output', type=Path, help=f'Results file (default: a new file in {RESULTS_DIR}).')
+    parser.add_argument('--compare', type=Path, help='Earlier results file to compare with.')
+    args = parser.parse_args()
+    unknown = set(args.only) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}. Choose from {', '.join(BENCHMARKS)}.")
+    if args.requests < 1:
+        parser.error("--requests must be at least 1.")
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cricket_stats.settings_test')
+    setup_django()
+    memory = not args.no_memory
+    results = {'metadata': metadata(args), 'sizes': {}}
+
+    for rows in args.sizes:
+        label = size_label(rows)
+        print(f"\n== {label} stat rows", flush=True)
+        groups = results['sizes'][label] = {}
+        with tempfile.TemporaryDirectory() as directory, benchmark_database():
+            if 'import' in args.only:
+                groups['import_stats'] = bench_import(directory, rows, args.seed, memory)
+            if 'endpoints' in args.only:
+                groups['endpoints'] = bench_endpoints(rows, args.seed, args.requests, memory)
+            if 'excel' in args.only:
+                groups['process_excel'] = bench_excel(directory, rows, args.seed, memory)
+
+    output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + '\n')
+    print(f"\nSaved results to {output}")
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == '__main__':
+    main()
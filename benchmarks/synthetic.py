@@ -0,0 +1,179 @@
+# In benchmarks/synthetic.py
+
+"""
+Deterministic synthetic Player / Tournament / PlayerTournamentStat datasets.
+"""
+
+import random
+
+TEAMS_PER_TOURNAMENT = 8
+
+
+def stat_values(rng):
+    """Plausible batting and bowling figures for one player in one tournament."""
+    matches = rng.randint(1, 8)
+    balls = rng.randint(0, matches * 30)
+    runs = int(balls * rng.uniform(0.6, 1.8))
+    not_outs = rng.randint(0, matches // 2)
+    dismissals = max(matches - not_outs, 1)
+    overs = rng.randint(0, matches * 4)
+    wickets = rng.randint(0, overs // 2 + 1) if overs else 0
+    conceded = int(overs * rng.uniform(4, 11))
+    return {
+        'matches_played': matches,
+        'innings': matches,
+        'runs_scored': runs,
+        'balls_faced': balls,
+        'highest_score': min(runs, rng.randint(0, 90)),
+        'not_outs': not_outs,
+        'fours': runs // 9,
+        'sixes': runs // 25,
+        'fifties': runs // 120,
+        'hundreds': 0,
+        'batting_average': round(runs / dismissals, 2),
+        'batting_strike_rate': round(runs * 100 / balls, 2) if balls else None,
+        'overs_bowled': float(overs) if overs else None,
+        'runs_conceded': conceded,
+        'wickets_taken': wickets,
+        'maidens': rng.randint(0, overs // 6 + 1) if overs else 0,
+        'bowling_average': round(conceded / wickets, 2) if wickets else None,
+        'economy_rate': round(conceded / overs, 2) if overs else None,
+        'bowling_strike_rate': round(overs * 6 / wickets, 2) if wickets else None,
+    }
+
+
+def dataset_shape(rows):
+    """(players, tournaments) for a dataset of roughly `rows` stat rows."""
+    tournaments = max(1, min(200, rows // 500))
+    players = max(10, rows // tournaments * 2)
+    return players, tournaments
+
+
+def generate_rows(rows, seed=0):
+    """
+    Yields `rows` dicts shaped like master_stats.csv rows (player_name,
+    tournament_id, team_name, styles, stats). Every (player, tournament) pair
+    is unique and the output only depends on `rows` and `seed`.
+    """
+    rng = random.Random(seed)
+    players, tournaments = dataset_shape(rows)
+    per_tournament = -(-rows // tournaments)
+    produced = 0
+    for tournament_id in range(1, tournaments + 1):
+        for player_index in rng.sample(range(players), min(per_tournament, players)):
+            if produced == rows:
+                return
+            yield {
+                'player_name': f"Player {player_index:07d}",
+                'tournament_id': tournament_id,
+                'team_name': f"Team {tournament_id}-{player_index % TEAMS_PER_TOURNAMENT}",
+                'batting_style': rng.choice(['RHB', 'LHB']),
+                'bowling_style': rng.choice(['Right-arm medium', 'Right-arm fast', 'Left-arm spin', '']),
+                **stat_values(rng),
+            }
+            produced += 1
+
+
+def populate(rows, seed=0, batch_size=5000):
+    """
+    Bulk-loads a synthetic dataset of `rows` stat rows into the database,
+    `batch_size` rows at a time, then derives metrics, teams and careers as
+    an import does.
+    """
+    from itertools import islice
+    from api.models import Player, Tournament, PlayerTournamentStat
+    from api.career import refresh_career_stats
+    from api.metrics import recompute_stat_metrics
+    from api.teams import link_teams
+
+    # A first pass for the players and tournaments keeps the stats out of memory
+    names, tournament_ids = set(), set()
+    for row in generate_rows(rows, seed):
+        names.add(row['player_name'])
+        tournament_ids.add(row['tournament_id'])
+    Tournament.objects.bulk_create(
+        [Tournament(id=tid, name=f"Synthetic Cup {tid}", year=2000 + tid % 25) for tid in sorted(tournament_ids)],
+        batch_size=batch_size,
+    )
+    Player.objects.bulk_create([Player(name=name) for name in sorted(names)], batch_size=batch_size)
+    player_ids = dict(Player.objects.values_list('name', 'id'))
+
+    written = 0
+    data = generate_rows(rows, seed)
+    while batch := list(islice(data, batch_size)):
+        stats = []
+        for row in batch:
+            values = {key: value for key, value in row.items()
+                      if key not in ('player_name', 'tournament_id', 'batting_style', 'bowling_style')}
+            stats.append(PlayerTournamentStat(
+                player_id=player_ids[row['player_name']], tournament_id=row['tournament_id'], **values
+            ))
+        PlayerTournamentStat.objects.bulk_create(stats, batch_size=batch_size)
+        written += len(stats)
+    recompute_stat_metrics()
+    link_teams()
+    refresh_career_stats()
+    return written
+
+
+def write_csv(path, rows, seed=0):
+    """Writes the dataset as a master_stats.csv for import_stats; returns `path`."""
+    import csv
+    from process_excel import FINAL_COLUMNS_ORDER
+
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=FINAL_COLUMNS_ORDER)
+        writer.writeheader()
+        writer.writerows(generate_rows(rows, seed))
+    return path
+
+
+BATTING_HEADER = ['Player Name', 'Team Name', 'Mat', 'Inns', 'Runs', 'Balls', 'Highest', 'N/O',
+                  'Avg', 'SR', '4s', '6s', '50s', '100s', 'Batting Hand']
+BOWLING_HEADER = ['Player Name', 'Team Name', 'Mat', 'Overs', 'Runs', 'Wickets', 'Avg', 'Econ',
+                  'SR', 'Maidens', 'Bowling Style']
+
+
+def write_workbooks(directory, rows, seed=0):
+    """
+    Writes batting and bowling workbooks laid out like the ones process_excel.py
+    reads: one sheet per tournament, a title row above the header, untidy
+    player names and "37*" not-out highest scores. Returns their paths.
+    """
+    from pathlib import Path
+    from openpyxl import Workbook
+
+    sheets = {}
+    for row in generate_rows(rows, seed):
+        sheets.setdefault(row['tournament_id'], []).append(row)
+
+    batting, bowling = Workbook(write_only=True), Workbook(write_only=True)
+    for tournament_id, sheet_rows in sheets.items():
+        bat = batting.create_sheet(f"Tournament {tournament_id}")
+        bowl = bowling.create_sheet(f"Tournament {tournament_id}")
+        for sheet, header in ((bat, BATTING_HEADER), (bowl, BOWLING_HEADER)):
+            sheet.append([f"Synthetic Cup {tournament_id}"])
+            sheet.append(header)
+        for row in sheet_rows:
+            name = f"  {row['player_name'].lower()} "
+            highest = row['highest_score']
+            if row['not_outs'] and highest:
+                highest = f"{highest}*"
+            bat.append([
+                name, row['team_name'], row['matches_played'], row['matches_played'], row['runs_scored'],
+                row['balls_faced'], highest, row['not_outs'], row['batting_average'],
+                row['batting_strike_rate'], row['fours'], row['sixes'], row['fifties'], row['hundreds'],
+                row['batting_style'],
+            ])
+            if row['overs_bowled']:
+                bowl.append([
+                    name, row['team_name'], row['matches_played'], row['overs_bowled'], row['runs_conceded'],
+                    row['wickets_taken'], row['bowling_average'], row['economy_rate'],
+                    row['bowling_strike_rate'], row['maidens'], row['bowling_style'] or None,
+                ])
+
+    directory = Path(directory)
+    paths = directory / 'batting.xlsx', directory / 'bowling.xlsx'
+    batting.save(paths[0])
+    bowling.save(paths[1])
+    return paths
@@ -2,6 +2,9 @@
 ASGI config for cricket_stats project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server, e.g. ``uvicorn cricket_stats.asgi:application``,
+to run the async read endpoints under /api/async/ (api/async_views.py)
+without tying up a worker per request.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
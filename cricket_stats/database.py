@@ -0,0 +1,65 @@
+"""
+Builds the DATABASES['default'] setting from environment / .env values.
+
+    DB_ENGINE               postgresql (default) or sqlite3
+    DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+    DB_CONN_MAX_AGE         seconds to keep a connection between requests
+                            (default 60; 0 closes it after every request,
+                            "None" keeps it forever)
+    DB_CONN_HEALTH_CHECKS   ping a reused connection before the request uses it (default True)
+    DB_POOL                 use a psycopg 3 connection pool instead (default False, PostgreSQL only)
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT
+                            pool size bounds and seconds to wait for a free connection
+
+A pool needs `pip install "psycopg[pool]"` and replaces persistent
+connections, so CONN_MAX_AGE is forced to 0 when it is on.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENGINES = {
+    'postgresql': 'django.db.backends.postgresql',
+    'sqlite3': 'django.db.backends.sqlite3',
+}
+
+
+def conn_max_age(value):
+    """decouple cast for DB_CONN_MAX_AGE: an int, or None for unlimited."""
+    if str(value).strip().lower() in ('none', 'unlimited'):
+        return None
+    return int(value)
+
+def database_settings(config, engine=None, default_name='godrej_cricket_db'):
+    """
+    The DATABASES['default'] dict; `config` is decouple's config (or anything
+    with its signature). `engine` overrides DB_ENGINE.
+    """
+    engine = engine or config('DB_ENGINE', default='postgresql')
+    if engine not in ENGINES:
+        raise ImproperlyConfigured(f"DB_ENGINE must be one of {', '.join(ENGINES)}, not {engine!r}.")
+
+    database = {
+        'ENGINE': ENGINES[engine],
+        'NAME': config('DB_NAME', default=default_name),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=conn_max_age),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'OPTIONS': {},
+    }
+    if engine == 'sqlite3':
+        return database
+
+    database.update({
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD'),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+    })
+    if config('DB_POOL', default=False, cast=bool):
+        database['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        }
+        # Django refuses persistent connections on top of a pool
+        database['CONN_MAX_AGE'] = 0
+    return database
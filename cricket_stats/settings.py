@@ -11,7 +11,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
+from cricket_stats.database import database_settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -34,6 +35,7 @@ ALLOWED_HOSTS = []
 INSTALLED_APPS = [
     "api" , 
     'rest_framework',
+    'django_filters',
     'corsheaders',
     "django.contrib.admin",
     "django.contrib.auth",
@@ -44,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Does nothing unless PROFILING=True (see below)
+    'api.profiling.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -77,18 +81,67 @@ WSGI_APPLICATION = "cricket_stats.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection lifetime, health checks and optional pooling come from .env,
+# see cricket_stats/database.py for the DB_* variables
 DATABASES = {
+    'default': database_settings(config),
+}
+
+
+# Cache
+# API responses are cached until the data version changes (api/caching.py).
+# Use django.core.cache.backends.filebased.FileBasedCache with a directory
+# LOCATION to share the cache between worker processes.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'godrej_cricket_db',
-        'USER': 'postgres',
-        'PASSWORD': config('DB_PASSWORD'), # actual password - next improved security using .env
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='cricket-stats'),
     }
 }
 
 
+# Email notifications
+# Edit requests are queued in the api.Notification outbox and sent by
+# `python manage.py send_notifications` (api/notifications.py).
+
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+NOTIFICATION_SENDER = config('NOTIFICATION_SENDER', default='noreply@yourdomain.com')
+NOTIFICATION_RECIPIENTS = config('NOTIFICATION_RECIPIENTS', default='your-admin-email@example.com', cast=Csv())
+
+
+# Request profiling
+# Off by default. With PROFILING=True every response gets a Server-Timing
+# header, GET /api/profiling/ shows per-route percentiles, and a share of
+# PROFILING_SAMPLE_RATE requests is dumped as cProfile stats (api/profiling.py).
+
+PROFILING = config('PROFILING', default=False, cast=bool)
+PROFILING_BUFFER_SIZE = config('PROFILING_BUFFER_SIZE', default=1000, cast=int)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_REPEAT_THRESHOLD = config('PROFILING_REPEAT_THRESHOLD', default=5, cast=int)
+
+
+# Logging
+# Everything goes to the console; LOG_LEVEL=DEBUG also logs the timing of
+# each profiled request.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {'format': '{asctime} {levelname} {name}: {message}', 'style': '{'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simple'},
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'api': {'handlers': ['console'], 'level': config('LOG_LEVEL', default='INFO'), 'propagate': False},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -125,11 +178,22 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploaded files (player photos)
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR / "media"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Django REST framework
+REST_FRAMEWORK = {
+    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # Cursor pages of 50 rows, ?page_size= up to 200 (see api/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.StatsCursorPagination',
+}
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -0,0 +1,30 @@
+"""
+Settings profile for running the test suite and benchmarks on SQLite,
+without a PostgreSQL server or a .env file:
+
+    python manage.py test --settings=cricket_stats.settings_test
+    DJANGO_SETTINGS_MODULE=cricket_stats.settings_test python -m benchmarks.connections
+
+Connection lifetime settings (DB_CONN_MAX_AGE, DB_CONN_HEALTH_CHECKS) still
+come from the environment, so persistent connection handling runs here too.
+"""
+
+import os
+
+# Only needed so the main settings import; never used for anything real
+os.environ.setdefault('SECRET_KEY', 'insecure-test-only-secret-key')
+os.environ.setdefault('DB_PASSWORD', '')
+
+from .settings import *  # noqa: E402,F403
+from .settings import BASE_DIR, config, database_settings  # noqa: E402
+
+DATABASES = {
+    'default': {
+        **database_settings(config, engine='sqlite3'),
+        'NAME': config('TEST_SQLITE_NAME', default=str(BASE_DIR / 'test.sqlite3')),
+    }
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+# Hashing test users' passwords properly only slows the suite down
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
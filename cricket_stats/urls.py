@@ -1,11 +1,15 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
+from api.photos import THUMBNAIL_DIR, serve_thumbnail
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    # Content-hashed thumbnails with a long-lived Cache-Control; a front-end
+    # server may serve this directory itself with the same headers
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}{THUMBNAIL_DIR}/(?P<path>.+)$", serve_thumbnail),
 ]
 
 if settings.DEBUG:
@@ -1,13 +1,27 @@
 import pandas as pd
+import argparse
+import hashlib
 import os
+import pickle
 import re
+import zipfile
 import numpy as np
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import PurePosixPath
+from xml.etree import ElementTree
 
 # --- CONFIGURATION ---
 EXCEL_FOLDER_PATH = os.path.expanduser("~/Desktop/excel_data")
 BATTING_FILENAME = "Batting 1_merged.xlsx"
 BOWLING_FILENAME = "bowling 1 june _merged.xlsx"
 OUTPUT_CSV_PATH = "master_stats.csv"
+# Parsed sheets are kept here between runs (see SheetCache)
+CACHE_DIR = ".excel_cache"
+# Bump to invalidate every cached sheet after changing how sheets are parsed
+CACHE_VERSION = 1
+# The header row is looked for in this many leading rows
+HEADER_SEARCH_ROWS = 5
 
 # --- Column mapping to standardize all variations ---
 # 👇 UPDATED to include all new columns
@@ -26,44 +40,266 @@ BOWLING_RENAME_MAP = {
     'batting_strike_rate': 'bowling_strike_rate'
 }
 
+# 👇 This list now defines everything we want to keep
+FINAL_COLUMNS_ORDER = [
+    'player_name', 'tournament_id', 'team_name', 'batting_style', 'bowling_style',
+    'matches_played', 'innings', 'runs_scored', 'balls_faced', 'highest_score', 'not_outs',
+    'fours', 'sixes', 'fifties', 'hundreds', 'batting_average', 'batting_strike_rate',
+    'overs_bowled', 'runs_conceded', 'wickets_taken', 'maidens', 'bowling_average',
+    'economy_rate', 'bowling_strike_rate'
+]
+
 def find_header_row(df_head):
-    for i, row in df_head.iterrows():
-        if 'Player Name' in row.values:
-            return i
-    return 0
+    """Index of the first of the leading rows that contains 'Player Name', else 0."""
+    matches = (df_head.head(HEADER_SEARCH_ROWS) == 'Player Name').any(axis=1)
+    return int(matches.to_numpy().argmax()) if matches.any() else 0
+
+def header_names(cells):
+    """
+    Column names from a header row as `pd.read_excel(header=...)` makes them:
+    a blank cell becomes 'Unnamed: <position>' and a repeated name 'Runs.1',
+    'Runs.2', ... skipping names the header already has.
+    """
+    names = [f"Unnamed: {index}" if pd.isna(cell) or cell == '' else cell for index, cell in enumerate(cells)]
+    unnamed = [index for index, cell in enumerate(cells) if pd.isna(cell) or cell == '']
+    counts = defaultdict(int)
+    # Named columns keep their names before unnamed ones are renamed
+    for index in [index for index in range(len(names)) if index not in unnamed] + unnamed:
+        name = original = names[index]
+        count = counts[name]
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts[name]
+        names[index] = name
+        counts[name] = count + 1
+    return names
 
 def clean_player_name(name):
     if isinstance(name, str):
         return " ".join(name.strip().split()).title()
     return name
 
-def process_excel_file(filepath, is_bowling=False):
-    xls = pd.ExcelFile(filepath)
-    all_sheets_data = []
-    for sheet_name in xls.sheet_names:
-        match = re.search(r'(\d+)', sheet_name)
-        if not match:
-            continue
-        tournament_id = int(match.group(1))
-        header_row_index = find_header_row(pd.read_excel(xls, sheet_name=sheet_name, header=None, nrows=5))
-        df = pd.read_excel(xls, sheet_name=sheet_name, header=header_row_index)
-        df.rename(columns=COLUMN_MAP, inplace=True)
-        if is_bowling:
-            df.rename(columns=BOWLING_RENAME_MAP, inplace=True)
-        df['tournament_id'] = tournament_id
-        df['player_name'] = df['player_name'].apply(clean_player_name)
-        all_sheets_data.append(df)
-    return pd.concat(all_sheets_data, ignore_index=True)
+def clean_player_names(names):
+    """`clean_player_name` over a whole column, with vectorized string ops for a string column."""
+    if not pd.api.types.is_string_dtype(names.dtype):
+        # No strings to clean, e.g. an all-empty column read as floats
+        return names
+    if names.dtype == object:
+        # Mixed cells: .str needs strings, so clean those and keep the rest as they were
+        return pd.Series([clean_player_name(name) for name in names], index=names.index, dtype=object, name=names.name)
+    # A string column: keep its dtype, missing names stay missing
+    return names.str.split().str.join(" ").str.title().astype(names.dtype)
 
-def main():
-    """Main function to run the entire process."""
-    batting_filepath = os.path.join(EXCEL_FOLDER_PATH, BATTING_FILENAME)
-    bowling_filepath = os.path.join(EXCEL_FOLDER_PATH, BOWLING_FILENAME)
+def tournament_id_from_sheet(sheet_name):
+    match = re.search(r'(\d+)', sheet_name)
+    return int(match.group(1)) if match else None
 
-    batting_df = process_excel_file(batting_filepath, is_bowling=False)
-    bowling_df = process_excel_file(bowling_filepath, is_bowling=True)
+def parse_sheet(filepath, sheet_name, is_bowling=False):
+    """
+    Reads one sheet in a single pass and returns it with standardized columns.
+    `filepath` may also be an open pd.ExcelFile.
 
-    print("\nMerging batting and bowling data...")
+    The whole sheet is read without a header, the header row is found in the
+    in-memory frame, and the rows below it become the sheet's frame. Cells
+    come typed from the workbook, so each column is inferred from its values
+    as `pd.read_excel(header=...)` would.
+    """
+    raw = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    header_row_index = find_header_row(raw)
+    rows = raw.astype(object).values.tolist()
+    df = pd.DataFrame(rows[header_row_index + 1:], columns=header_names(rows[header_row_index]))
+    df.rename(columns=COLUMN_MAP, inplace=True)
+    if is_bowling:
+        df.rename(columns=BOWLING_RENAME_MAP, inplace=True)
+    df['tournament_id'] = tournament_id_from_sheet(sheet_name)
+    df['player_name'] = clean_player_names(df['player_name'])
+    return df
+
+def parse_sheets(filepath, sheet_names, is_bowling=False):
+    """`parse_sheet` for several sheets of one workbook, opening it once."""
+    with pd.ExcelFile(filepath) as xls:
+        return [parse_sheet(xls, sheet_name, is_bowling) for sheet_name in sheet_names]
+
+
+class SheetCache:
+    """
+    Parsed sheets on disk, so re-running after editing one sheet of a workbook
+    only reparses that sheet.
+
+    A workbook whose mtime and size are unchanged is served entirely from the
+    cache without opening it. Otherwise each sheet is keyed on a hash of its
+    own XML inside the .xlsx plus the workbook's shared strings table, so
+    sheets whose cells did not change are still reused. Editing text (names,
+    teams) rewrites the shared strings and invalidates every sheet of that
+    workbook.
+    """
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load(self, name):
+        try:
+            with open(self._path(name), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _store(self, name, value):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self._path(f"{name}.tmp{os.getpid()}")
+        with open(temporary, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self._path(name))
+
+    def _manifest_name(self, filepath, is_bowling):
+        digest = hashlib.blake2b(f"{os.path.abspath(filepath)}:{is_bowling}".encode(), digest_size=16)
+        return f"manifest-{digest.hexdigest()}.pkl"
+
+    def sheet_keys(self, filepath, is_bowling):
+        """
+        {sheet name: cache key} for every tournament sheet of the workbook, in
+        workbook order. Uses the manifest when the file is untouched.
+        """
+        stat = os.stat(filepath)
+        manifest = self._load(self._manifest_name(filepath, is_bowling))
+        if manifest and manifest['version'] == CACHE_VERSION and manifest['stamp'] == (stat.st_mtime_ns, stat.st_size):
+            return manifest['keys']
+
+        keys = {
+            sheet_name: self._sheet_key(xml_hash, shared_hash, is_bowling)
+            for sheet_name, xml_hash, shared_hash in workbook_sheet_hashes(filepath)
+            if tournament_id_from_sheet(sheet_name) is not None
+        }
+        self._store(self._manifest_name(filepath, is_bowling), {
+            'version': CACHE_VERSION, 'stamp': (stat.st_mtime_ns, stat.st_size), 'keys': keys,
+        })
+        return keys
+
+    @staticmethod
+    def _sheet_key(xml_hash, shared_hash, is_bowling):
+        return hashlib.blake2b(
+            f"{CACHE_VERSION}:{is_bowling}:{xml_hash}:{shared_hash}".encode(), digest_size=16
+        ).hexdigest()
+
+    def get(self, key):
+        frame = self._load(f"sheet-{key}.pkl")
+        if frame is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return frame
+
+    def put(self, key, frame):
+        self._store(f"sheet-{key}.pkl", frame)
+
+
+XLSX_NS = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+}
+
+def _sheet_paths(archive):
+    """Yields (sheet name, path of its XML part) from an open .xlsx zip, in workbook order."""
+    targets = {
+        rel.get('Id'): rel.get('Target')
+        for rel in ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels')).findall('rel:Relationship', XLSX_NS)
+    }
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    for sheet in workbook.findall('main:sheets/main:sheet', XLSX_NS):
+        target = targets[sheet.get(f"{{{XLSX_NS['r']}}}id")]
+        # Targets are relative to xl/ unless absolute
+        yield sheet.get('name'), target.lstrip('/') if target.startswith('/') else str(PurePosixPath('xl') / target)
+
+def workbook_sheets(filepath):
+    """(sheet name, XML part) pairs of an .xlsx file, without loading any cells."""
+    with zipfile.ZipFile(filepath) as archive:
+        return list(_sheet_paths(archive))
+
+def workbook_sheet_hashes(filepath):
+    """Yields (sheet name, hash of its XML, hash of the shared strings) for an .xlsx file."""
+    def digest(data):
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    with zipfile.ZipFile(filepath) as archive:
+        names = set(archive.namelist())
+        shared_hash = digest(archive.read('xl/sharedStrings.xml')) if 'xl/sharedStrings.xml' in names else ''
+        for sheet_name, path in _sheet_paths(archive):
+            yield sheet_name, digest(archive.read(path)), shared_hash
+
+
+def process_workbooks(workbooks, workers=None, cache_dir=CACHE_DIR):
+    """
+    Parses every tournament sheet of `workbooks`, a list of (filepath,
+    is_bowling), and returns one concatenated frame per workbook.
+
+    Sheets of all workbooks are parsed together on a pool of `workers`
+    processes (default: one per CPU; 1 parses in this process). With a
+    `cache_dir`, sheets unchanged since the last run are loaded from there
+    instead; pass None to always reparse.
+    """
+    cache = SheetCache(cache_dir) if cache_dir else None
+    jobs = []  # (workbook index, sheet name, cache key)
+    for index, (filepath, is_bowling) in enumerate(workbooks):
+        if cache is not None:
+            keys = cache.sheet_keys(filepath, is_bowling)
+        else:
+            keys = {
+                name: None for name, _ in workbook_sheets(filepath)
+                if tournament_id_from_sheet(name) is not None
+            }
+        jobs.extend((index, sheet_name, key) for sheet_name, key in keys.items())
+
+    frames = {}
+    missing = []
+    for job in jobs:
+        frame = cache.get(job[2]) if cache is not None else None
+        if frame is None:
+            missing.append(job)
+        else:
+            frames[job] = frame
+
+    # Opening a workbook costs more than parsing a sheet of it, so each task
+    # parses a run of sheets from one workbook: about `workers` tasks per workbook
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for index, (filepath, is_bowling) in enumerate(workbooks):
+        sheet_jobs = [job for job in missing if job[0] == index]
+        size = -(-len(sheet_jobs) // workers) if sheet_jobs else 1
+        for start in range(0, len(sheet_jobs), size):
+            tasks.append((filepath, [job[1] for job in sheet_jobs[start:start + size]], is_bowling))
+
+    if workers == 1 or len(tasks) <= 1:
+        results = [parse_sheets(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_sheets, *zip(*tasks)))
+    # Tasks cover `missing` in order
+    parsed = [frame for task_frames in results for frame in task_frames]
+    for job, frame in zip(missing, parsed):
+        frames[job] = frame
+        if cache is not None:
+            cache.put(job[2], frame)
+
+    return [
+        pd.concat([frames[job] for job in jobs if job[0] == index], ignore_index=True)
+        for index in range(len(workbooks))
+    ]
+
+def process_excel_file(filepath, is_bowling=False, workers=None, cache_dir=CACHE_DIR):
+    return process_workbooks([(filepath, is_bowling)], workers=workers, cache_dir=cache_dir)[0]
+
+def build_master_frame(batting_filepath, bowling_filepath, workers=None, cache_dir=CACHE_DIR):
+    """One row per (player, tournament) with batting and bowling merged, in FINAL_COLUMNS_ORDER."""
+    batting_df, bowling_df = process_workbooks(
+        [(batting_filepath, False), (bowling_filepath, True)], workers=workers, cache_dir=cache_dir
+    )
     final_df = pd.merge(batting_df, bowling_df, on=['player_name', 'tournament_id'], how='outer', suffixes=('_bat', '_bowl'))
 
     # Combine columns that might appear in both files
@@ -76,23 +312,37 @@ def main():
             final_df[col] = final_df[col_bat]
         elif col_bowl in final_df.columns:
             final_df[col] = final_df[col_bowl]
-            
+
     if 'highest_score_bat' in final_df.columns:
         final_df.rename(columns={'highest_score_bat': 'highest_score'}, inplace=True)
+    # Batting innings are the ones the batting average is computed from
+    if 'innings_bat' in final_df.columns:
+        final_df.rename(columns={'innings_bat': 'innings'}, inplace=True)
 
-    # 👇 This list now defines everything we want to keep
-    final_columns_order = [
-        'player_name', 'tournament_id', 'team_name', 'batting_style', 'bowling_style',
-        'matches_played', 'runs_scored', 'balls_faced', 'highest_score', 'not_outs',
-        'fours', 'sixes', 'fifties', 'hundreds', 'batting_average', 'batting_strike_rate',
-        'overs_bowled', 'runs_conceded', 'wickets_taken', 'maidens', 'bowling_average',
-        'economy_rate', 'bowling_strike_rate'
-    ]
+    return final_df[[col for col in FINAL_COLUMNS_ORDER if col in final_df.columns]]
 
-    final_df_filtered = final_df[[col for col in final_columns_order if col in final_df.columns]]
+def main():
+    """Main function to run the entire process."""
+    parser = argparse.ArgumentParser(description="Merge the batting and bowling workbooks into master_stats.csv.")
+    parser.add_argument('--folder', default=EXCEL_FOLDER_PATH, help='Folder holding both workbooks.')
+    parser.add_argument('--batting', default=BATTING_FILENAME, help='Batting workbook file name.')
+    parser.add_argument('--bowling', default=BOWLING_FILENAME, help='Bowling workbook file name.')
+    parser.add_argument('--output', default=OUTPUT_CSV_PATH, help='CSV file to write.')
+    parser.add_argument('--workers', type=int, default=None, help='Parser processes (default: one per CPU).')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help=f'Parsed sheet cache (default: {CACHE_DIR}).')
+    parser.add_argument('--no-cache', action='store_true', help='Reparse every sheet and leave the cache alone.')
+    args = parser.parse_args()
+
+    batting_filepath = os.path.join(args.folder, args.batting)
+    bowling_filepath = os.path.join(args.folder, args.bowling)
+
+    print("\nMerging batting and bowling data...")
+    final_df_filtered = build_master_frame(
+        batting_filepath, bowling_filepath, workers=args.workers, cache_dir=None if args.no_cache else args.cache_dir
+    )
     final_df_filtered = final_df_filtered.replace({np.nan: None})
-    final_df_filtered.to_csv(OUTPUT_CSV_PATH, index=False)
-    print(f"\n✅ Success! All data processed and saved to '{OUTPUT_CSV_PATH}'.")
+    final_df_filtered.to_csv(args.output, index=False)
+    print(f"\n✅ Success! All data processed and saved to '{args.output}'.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()